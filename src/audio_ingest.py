@@ -0,0 +1,165 @@
+"""
+Audio Ingest Engine
+===================
+Owns the yt_dlp -> ffmpeg pipeline directly (no shell) and exposes the
+decoded 16 kHz mono s16le PCM as fixed-size frames from a preallocated ring.
+
+Frames are memoryviews into one bytearray arena, so the hot path never
+allocates: the reader thread `readinto`s a free slot, the sender gets the
+same view back from `get()` and hands it back with `release()`.
+"""
+
+import collections
+import queue
+import subprocess
+import sys
+import threading
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2                         # s16le mono
+FRAME_MS = 100
+FRAME_BYTES = SAMPLE_RATE * BYTES_PER_SAMPLE * FRAME_MS // 1000   # 3200 bytes
+RING_SLOTS = 100                             # ~10s of audio, same as the old queue(maxsize=100)
+
+
+def source_cmd(url, python=sys.executable):
+    """yt_dlp command writing the raw media stream to stdout."""
+    return [str(python), "-m", "yt_dlp", url, "-o", "-", "-q", "--no-warnings"]
+
+
+def decoder_cmd():
+    """ffmpeg command turning stdin media into 16 kHz mono s16le on stdout."""
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "panic",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+
+
+class AudioIngest:
+    """yt_dlp | ffmpeg producer that fills a ring of reusable PCM frames."""
+
+    def __init__(self, url, python=sys.executable, frame_bytes=FRAME_BYTES, slots=RING_SLOTS):
+        self.url = url
+        self.python = str(python)
+        self.frame_bytes = frame_bytes
+
+        # One arena for the whole stream; each slot is a fixed view into it
+        self._arena = bytearray(frame_bytes * slots)
+        view = memoryview(self._arena)
+        self._frames = [view[i * frame_bytes:(i + 1) * frame_bytes] for i in range(slots)]
+        self._slot_of = {id(f): i for i, f in enumerate(self._frames)}
+
+        self._free = collections.deque(range(slots))
+        self._ready = collections.deque()
+        self._cond = threading.Condition()
+
+        self._procs = []
+        self._thread = None
+        self._running = False
+        self._eof = False
+
+        self.bytes_read = 0
+
+    # --- Pipeline ---
+
+    def source_cmd(self):
+        return source_cmd(self.url, self.python)
+
+    def decoder_cmd(self):
+        return decoder_cmd()
+
+    def start(self):
+        """Spawn both processes and the reader thread."""
+        source = subprocess.Popen(
+            self.source_cmd(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        # bufsize=0 gives a raw pipe, so readinto lands straight in our arena
+        decoder = subprocess.Popen(
+            self.decoder_cmd(), stdin=source.stdout, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, bufsize=0
+        )
+        # Let yt_dlp get SIGPIPE if ffmpeg exits first
+        source.stdout.close()
+        self._procs = [source, decoder]
+
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, args=(decoder.stdout,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        for proc in self._procs:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        with self._cond:
+            self._cond.notify_all()
+
+    def _read_loop(self, pipe):
+        try:
+            while self._running:
+                with self._cond:
+                    while self._running and not self._free:
+                        self._cond.wait()
+                    if not self._running:
+                        break
+                    slot = self._free.popleft()
+
+                frame = self._frames[slot]
+                filled = 0
+                while filled < self.frame_bytes:
+                    n = pipe.readinto(frame[filled:])
+                    if not n:
+                        break
+                    filled += n
+
+                if filled == 0:
+                    with self._cond:
+                        self._free.append(slot)
+                    break
+
+                if filled < self.frame_bytes:
+                    # Last partial frame: pad with silence so every frame is full-size
+                    frame[filled:] = bytes(self.frame_bytes - filled)
+
+                self.bytes_read += filled
+                with self._cond:
+                    self._ready.append(slot)
+                    self._cond.notify_all()
+
+                if filled < self.frame_bytes:
+                    break
+        except Exception as e:
+            print(f"❌ Ingest Error: {e}")
+        finally:
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+            self.stop()
+
+    # --- Consumer API ---
+
+    def get(self, timeout=None):
+        """Return the next filled frame, None at end of stream.
+
+        Raises queue.Empty on timeout so callers can keep their keep-alive logic.
+        """
+        with self._cond:
+            if not self._ready and not self._eof:
+                self._cond.wait(timeout)
+            if self._ready:
+                return self._frames[self._ready.popleft()]
+            if self._eof or not self._running:
+                return None
+        raise queue.Empty
+
+    def release(self, frame):
+        """Return a frame from `get()` to the free ring once it has been sent."""
+        slot = self._slot_of[id(frame)]
+        with self._cond:
+            self._free.append(slot)
+            self._cond.notify_all()
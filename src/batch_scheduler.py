@@ -0,0 +1,116 @@
+"""
+Batch Scheduler
+===============
+Decides when a session's pending final segments become a batch for the LLM
+workers. Replaces the fixed "10 segments or 30 s" rule, which only ran when a
+new segment arrived (a quiet speaker could hold a batch open forever) and
+produced tiny, expensive batches for fast talkers.
+
+Rules, checked on every segment AND on a timer:
+  1. pending tokens >= BATCH_MAX_TOKENS                 -> flush (size cap)
+  2. oldest pending segment waited >= BATCH_MAX_LATENCY -> flush (latency target)
+  3. less than BATCH_MIN_INTERVAL since the last flush  -> wait  (cost target)
+  4. pending tokens >= BATCH_TARGET_TOKENS              -> flush
+  5. speaker paused (Deepgram speech_final) and
+     pending tokens >= BATCH_MIN_TOKENS                 -> flush at the natural break
+
+The clock is injectable so transcripts can be replayed faster than real time.
+"""
+
+import os
+import threading
+import time
+
+BATCH_MAX_LATENCY = float(os.getenv("BATCH_MAX_LATENCY", 30))     # seconds
+BATCH_MIN_INTERVAL = float(os.getenv("BATCH_MIN_INTERVAL", 20))   # seconds (<= 180 batches/hour)
+BATCH_MIN_TOKENS = int(os.getenv("BATCH_MIN_TOKENS", 120))        # no more LLM calls than the fixed rule
+BATCH_TARGET_TOKENS = int(os.getenv("BATCH_TARGET_TOKENS", 250))
+BATCH_MAX_TOKENS = int(os.getenv("BATCH_MAX_TOKENS", 600))
+TICK_SECONDS = 1.0
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class BatchScheduler:
+    """Flush decisions for one session."""
+
+    def __init__(self, clock=time.monotonic, max_latency=BATCH_MAX_LATENCY, min_interval=BATCH_MIN_INTERVAL,
+                 min_tokens=BATCH_MIN_TOKENS, target_tokens=BATCH_TARGET_TOKENS, max_tokens=BATCH_MAX_TOKENS):
+        self.clock = clock
+        self.max_latency = max_latency
+        self.min_interval = min_interval
+        self.min_tokens = min_tokens
+        self.target_tokens = target_tokens
+        self.max_tokens = max_tokens
+
+        self.pending_tokens = 0
+        self.pending_segments = 0
+        self.oldest = None         # arrival time of the oldest pending segment
+        self.endpoint = False      # speech_final seen since the last flush
+        self.last_flush = clock()
+
+    def add(self, text, speech_final=False):
+        if self.oldest is None:
+            self.oldest = self.clock()
+        self.pending_tokens += estimate_tokens(text)
+        self.pending_segments += 1
+        self.endpoint = self.endpoint or bool(speech_final)
+
+    def due(self):
+        """Reason to flush now ("size", "latency", "target", "endpoint") or None."""
+        if not self.pending_segments:
+            return None
+        now = self.clock()
+        if self.pending_tokens >= self.max_tokens:
+            return "size"
+        if now - self.oldest >= self.max_latency:
+            return "latency"
+        if now - self.last_flush < self.min_interval:
+            return None
+        if self.pending_tokens >= self.target_tokens:
+            return "target"
+        if self.endpoint and self.pending_tokens >= self.min_tokens:
+            return "endpoint"
+        return None
+
+    def flushed(self):
+        self.pending_tokens = 0
+        self.pending_segments = 0
+        self.oldest = None
+        self.endpoint = False
+        self.last_flush = self.clock()
+
+
+class BatchTimer:
+    """Background tick that flushes due batches even when no segment arrives."""
+
+    def __init__(self, sessions, flush_if_due, tick=TICK_SECONDS):
+        self.sessions = sessions           # callable returning the live sessions
+        self.flush_if_due = flush_if_due   # flush_if_due(session): checks due() and flushes under the session's lock
+        self.tick = tick
+        self.errors = 0
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="batch-timer", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.tick)
+            self.check()
+
+    def check(self):
+        """One tick over all sessions."""
+        for session in self.sessions():
+            try:
+                self.flush_if_due(session)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Batch timer error [{session.stream_id}]: {e}")
@@ -8,10 +8,14 @@ DEFAULT_CONFIG = {
     # System Settings
     "deepgram_ws_url": "wss://api.deepgram.com/v1/listen?encoding=linear16&sample_rate=16000&channels=1",
     "target_media_url": "", # e.g. YouTube URL
+    "stream_mode": "thread", # "thread" or "async" (one event loop for all streams)
+    "stream_id": "main", # Main backend stream (plays target_media_url)
+    "streams": {}, # Extra backend streams: stream_id -> media URL (e.g. ECB / BoJ feeds)
     
     # AI Models
     "model_translate": "google/gemini-2.5-flash-lite",
     "model_analysis": "google/gemini-3-flash-preview",
+    "model_analysis_fallback": "google/gemini-2.5-flash", # Hedge target when model_analysis is slow or failing ("" = off)
     "model_summary": "google/gemini-3-flash-preview",
     
     # Limits & Parameters
@@ -22,6 +26,10 @@ DEFAULT_CONFIG = {
     # Feature Toggles (Cost Saving)
     "enable_translation": True,
     "enable_analysis": True,
+    "enable_streaming": True, # Stream LLM answers (SSE): cards fill in field by field
+    "enable_response_cache": True, # Reuse stored answers: analysis cache + translation memory (data/*.sqlite)
+    "enable_prefilter": True, # Label chatter / no-signal batches locally instead of calling the LLM
+    "enable_vad": False, # Drop long silences before Deepgram (KeepAlive instead of zeros)
 }
 
 class ConfigManager:
@@ -6,6 +6,10 @@ import datetime
 # We assume the CWD is the project root
 LOG_DIR = "data"
 LOG_FILE = os.path.join(LOG_DIR, "cost_log_detailed.csv")
+CACHE_LOG_FILE = os.path.join(LOG_DIR, "cache_log.csv")
+HEADER = ["Timestamp", "Type", "Model", "PromptTokens", "CompletionTokens", "TotalTokens", "Cost", "BatchNum",
+          "CachedTokens"]
+_header_checked = False
 
 def init_log():
     try:
@@ -15,15 +19,38 @@ def init_log():
         if not os.path.exists(LOG_FILE):
             with open(LOG_FILE, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-                writer.writerow(["Timestamp", "Type", "Model", "PromptTokens", "CompletionTokens", "TotalTokens", "Cost", "BatchNum"])
+                writer.writerow(HEADER)
             print(f"✅ Created cost log at: {LOG_FILE}")
     except Exception as e:
         print(f"⚠️ Failed to init cost log: {e}")
 
+def upgrade_header():
+    """Logs written before CachedTokens existed get the new header (old rows just lack the column)"""
+    global _header_checked
+    _header_checked = True
+    try:
+        with open(LOG_FILE, "r", newline="", encoding="utf-8") as f:
+            lines = f.readlines()
+        if lines and lines[0].strip().split(",") != HEADER:
+            lines[0] = ",".join(HEADER) + lines[0][len(lines[0].rstrip("\r\n")):]
+            tmp = LOG_FILE + ".tmp"
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                f.writelines(lines)
+            os.replace(tmp, LOG_FILE)
+    except Exception as e:
+        print(f"⚠️ Failed to upgrade cost log header: {e}")
+
+def cached_tokens(usage):
+    """Prompt tokens served from the provider's prompt cache (OpenRouter usage.prompt_tokens_details)"""
+    details = usage.get("prompt_tokens_details") or {}
+    return details.get("cached_tokens", 0) or 0
+
 def log_api_cost(event_type, model, usage, cost, batch_num="-"):
     try:
         if not os.path.exists(LOG_FILE):
             init_log()
+        elif not _header_checked:
+            upgrade_header()
             
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         p_tok = usage.get("prompt_tokens", 0)
@@ -38,7 +65,30 @@ def log_api_cost(event_type, model, usage, cost, batch_num="-"):
 
         with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow([timestamp, event_type, model, p_tok, c_tok, t_tok, f"{cost_val:.6f}", batch_num])
+            writer.writerow([timestamp, event_type, model, p_tok, c_tok, t_tok, f"{cost_val:.6f}", batch_num,
+                             cached_tokens(usage)])
             
     except Exception as e:
         print(f"⚠️ Failed to write to cost log: {e}")
+
+def log_cache_event(event_type, model, result, saved, batch_num="-"):
+    """Response cache lookup: result is "exact", "near" or "miss"; saved is the cost not spent"""
+    try:
+        if not os.path.exists(LOG_DIR):
+            os.makedirs(LOG_DIR)
+        new_file = not os.path.exists(CACHE_LOG_FILE)
+
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            saved_val = float(saved)
+        except (TypeError, ValueError):
+            saved_val = 0.0
+
+        with open(CACHE_LOG_FILE, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["Timestamp", "Type", "Model", "Result", "SavedCost", "BatchNum"])
+            writer.writerow([timestamp, event_type, model, result, f"{saved_val:.6f}", batch_num])
+
+    except Exception as e:
+        print(f"⚠️ Failed to write to cache log: {e}")
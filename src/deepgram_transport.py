@@ -0,0 +1,261 @@
+"""
+Deepgram Transport
+==================
+Reconnecting WebSocket transport for the Deepgram live API.
+
+The last N seconds of sent PCM are kept in a ring buffer. When the
+connection drops we reconnect with exponential backoff, replay that audio
+into the new connection and shift Deepgram's connection-relative `start`
+timestamps back onto the stream timeline, trimming words that were already
+finalized before the drop so session segments stay monotonic. When a VAD gate
+drops silence, `to_stream` maps the shorter sent timeline back onto the
+stream's real timeline.
+"""
+
+import json
+import os
+import threading
+import time
+
+import websocket # pip install websocket-client
+
+from audio_ingest import BYTES_PER_SAMPLE, FRAME_BYTES, SAMPLE_RATE
+
+BYTES_PER_SECOND = SAMPLE_RATE * BYTES_PER_SAMPLE
+REPLAY_SECONDS = float(os.getenv("DG_REPLAY_SECONDS", 10))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+OVERLAP_TOLERANCE = 0.02   # seconds; words starting before last final end - tolerance are duplicates
+KEEPALIVE_MESSAGE = '{"type": "KeepAlive"}'
+
+
+def backoff_delays(base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """0.5s, 1s, 2s, 4s ... capped at `cap`."""
+    delay = base
+    while True:
+        yield delay
+        delay = min(delay * 2, cap)
+
+
+class PcmBackBuffer:
+    """Bounded ring of the most recent PCM bytes sent to Deepgram."""
+
+    def __init__(self, seconds=REPLAY_SECONDS, bytes_per_second=BYTES_PER_SECOND):
+        capacity = int(seconds * bytes_per_second)
+        capacity -= capacity % BYTES_PER_SAMPLE
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._pos = 0        # next write position
+        self._size = 0       # valid bytes in the ring
+        self.total = 0       # bytes ever appended (stream position)
+        self._lock = threading.Lock()
+
+    def append(self, data):
+        view = memoryview(data)
+        with self._lock:
+            self.total += len(view)
+            if self.capacity == 0:
+                return
+            if len(view) >= self.capacity:
+                view = view[-self.capacity:]
+                self._buf[:] = view
+                self._pos = 0
+                self._size = self.capacity
+                return
+            first = min(len(view), self.capacity - self._pos)
+            self._buf[self._pos:self._pos + first] = view[:first]
+            rest = len(view) - first
+            if rest:
+                self._buf[:rest] = view[first:]
+            self._pos = (self._pos + len(view)) % self.capacity
+            self._size = min(self._size + len(view), self.capacity)
+
+    def snapshot(self):
+        """(stream offset in bytes, buffered bytes oldest -> newest)."""
+        with self._lock:
+            start = (self._pos - self._size) % self.capacity if self.capacity else 0
+            if start + self._size <= self.capacity:
+                data = bytes(self._buf[start:start + self._size])
+            else:
+                data = bytes(self._buf[start:]) + bytes(self._buf[:self._pos])
+            return self.total - self._size, data
+
+    def __len__(self):
+        return self._size
+
+
+class TimelineAligner:
+    """Maps Deepgram results from any connection onto one monotonic stream timeline."""
+
+    def __init__(self, to_stream=None):
+        self.last_final_end = 0.0
+        self.to_stream = to_stream or (lambda t: t)
+
+    def align(self, data, origin):
+        """Shift `data` by the connection origin (seconds); None if it is a pure duplicate."""
+        if "channel" not in data:
+            return data
+
+        to_stream = self.to_stream
+        sent_start = data.get("start", 0.0) + origin
+        data["start"] = to_stream(sent_start)
+        if "duration" in data:
+            data["duration"] = to_stream(sent_start + data["duration"]) - data["start"]
+        alternatives = data["channel"].get("alternatives") or []
+        for alt in alternatives:
+            for w in alt.get("words", []):
+                w["start"] = to_stream(w.get("start", 0.0) + origin)
+                w["end"] = to_stream(w.get("end", 0.0) + origin)
+
+        if not data.get("is_final") or not alternatives:
+            return data
+
+        end = data["start"] + data.get("duration", 0.0)
+        cutoff = self.last_final_end - OVERLAP_TOLERANCE
+        if data["start"] < cutoff:
+            # Replayed audio: keep only the words we have not finalized yet
+            alt = alternatives[0]
+            words = alt.get("words", [])
+            fresh = [w for w in words if w["start"] >= cutoff]
+            if not fresh or end <= cutoff:
+                return None
+            if len(fresh) < len(words):
+                alt["words"] = fresh
+                alt["transcript"] = " ".join(w.get("punctuated_word", w.get("word", "")) for w in fresh)
+                data["duration"] = end - fresh[0]["start"]
+                data["start"] = fresh[0]["start"]
+
+        self.last_final_end = max(self.last_final_end, end)
+        return data
+
+
+class ReconnectingTransport:
+    """Blocking Deepgram connection that survives drops (thread mode)."""
+
+    def __init__(self, url, header, on_result, replay_seconds=REPLAY_SECONDS, max_backoff=BACKOFF_MAX,
+                 connect=websocket.create_connection, to_stream=None, stats=None):
+        self.url = url
+        self.header = header
+        self.on_result = on_result
+        self.max_backoff = max_backoff
+        self._connect = connect
+        self.stats = stats    # optional AudioStats; bytes_sent includes replays
+
+        self.backbuffer = PcmBackBuffer(replay_seconds)
+        self.aligner = TimelineAligner(to_stream)
+        self.reconnects = 0
+
+        self._ws = None
+        self._broken = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open a connection (retrying with backoff) and replay the back-buffer."""
+        for delay in backoff_delays(cap=self.max_backoff):
+            if self._closed:
+                return False
+            try:
+                ws = self._connect(self.url, header=self.header)
+                break
+            except Exception as e:
+                print(f"⚠️ Deepgram connect failed: {e}. Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+        offset, replay = self.backbuffer.snapshot()
+        origin = offset / BYTES_PER_SECOND
+        with self._lock:
+            self._ws = ws
+            self._broken = False
+        threading.Thread(target=self._receive_loop, args=(ws, origin), daemon=True).start()
+
+        print("🟢 Deepgram Connected")
+        if replay:
+            print(f"🔁 Replaying {len(replay) / BYTES_PER_SECOND:.1f}s of audio from {origin:.1f}s")
+            view = memoryview(replay)
+            try:
+                for i in range(0, len(view), FRAME_BYTES):
+                    chunk = view[i:i + FRAME_BYTES]
+                    ws.send(chunk, opcode=websocket.ABNF.OPCODE_BINARY)
+                    self._count(len(chunk))
+            except Exception as e:
+                print(f"⚠️ Replay interrupted: {e}")
+                self._broken = True
+        return True
+
+    def _receive_loop(self, ws, origin):
+        try:
+            while True:
+                message = ws.recv()
+                if not message:
+                    break
+                data = self.aligner.align(json.loads(message), origin)
+                if data is not None:
+                    self.on_result(data)
+        except Exception as e:
+            if not self._closed:
+                print(f"\nWebSocket Error: {e}")
+        finally:
+            with self._lock:
+                if ws is self._ws:
+                    self._broken = True
+
+    def _count(self, n):
+        if self.stats is not None:
+            self.stats.bytes_sent += n
+
+    def _reconnect(self):
+        if self._closed:
+            return False
+        self.reconnects += 1
+        if self.stats is not None:
+            self.stats.reconnects += 1
+        print(f"\n🔌 Deepgram connection lost, reconnecting (#{self.reconnects})...")
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+        return self.connect()
+
+    def send(self, frame):
+        """Send one PCM frame; transparently reconnects (and replays) on failure."""
+        if self._closed:
+            return
+        self.backbuffer.append(frame)
+        if self._broken:
+            # The replay after reconnecting already includes this frame
+            self._reconnect()
+            return
+        try:
+            self._ws.send(frame, opcode=websocket.ABNF.OPCODE_BINARY)
+            self._count(len(frame))
+        except Exception:
+            # The frame is already in the back-buffer, so the reconnect replays it
+            self._reconnect()
+
+    def keepalive(self):
+        """Deepgram KeepAlive text message: holds the socket open without sending audio."""
+        if self._closed:
+            return
+        if self._broken:
+            self._reconnect()
+            return
+        try:
+            self._ws.send(KEEPALIVE_MESSAGE)
+        except Exception:
+            self._reconnect()
+
+    def finish(self):
+        """Ask Deepgram to flush final results."""
+        try:
+            self._ws.send('{"type": "CloseStream"}')
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
@@ -0,0 +1,158 @@
+"""
+GUI Job Pool
+============
+Fixed-size QThreadPool for the LLM workers (TranslateWorker, AnalysisWorker,
+SessionSummaryWorker, FinalReportWorker) instead of a new QThread per job.
+
+- Priority lanes: analysis runs before translation, translation before
+  summaries; FIFO within a lane
+- `key`: a newer queued job replaces an older one with the same key
+  (only the latest big-picture summary is worth computing)
+- `group`: the stream a job belongs to; `cancel_all(group)` stops one
+  stream's jobs and leaves the other streams' alone
+- `cancel_all()` (on STOP) drops queued jobs, silences running ones and
+  fires their `cancel` token: in-flight LLM requests (hedged copies
+  included) are cancelled, so paid work stops and `wait()` returns quickly
+- `metrics()`: queue depth per lane, running, wait time percentiles
+
+Workers stay QObjects with a `finished` signal and a blocking `run()`; the
+pool calls `run()` on one of its threads and the signal is delivered to the
+GUI thread as before. Workers that call the LLM gateway expose `cancel` (a
+CancelToken passed to every request). All bookkeeping happens on the GUI
+thread.
+"""
+
+import collections
+import heapq
+import itertools
+import os
+import time
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+LANES = {"analysis": 0, "translation": 1, "summary": 2}
+POOL_THREADS = int(os.getenv("GUI_WORKER_THREADS", 3))
+WAIT_WINDOW = 200   # recent queue waits kept for the percentiles
+
+
+class _Job:
+    __slots__ = ("seq", "lane", "name", "worker", "key", "group", "queued_at", "cancelled")
+
+    def __init__(self, seq, lane, name, worker, key, group):
+        self.seq = seq
+        self.lane = lane
+        self.name = name
+        self.worker = worker
+        self.key = key
+        self.group = group
+        self.queued_at = time.perf_counter()
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (LANES[self.lane], self.seq) < (LANES[other.lane], other.seq)
+
+
+class JobPool(QObject):
+    job_done = Signal(int)           # internal: pool thread -> GUI thread (job seq)
+    changed = Signal(dict)           # metrics() after every submit / start / finish
+
+    def __init__(self, threads=POOL_THREADS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self.threads = threads
+        self._heap = []
+        self._keyed = {}              # key -> queued job
+        self._running = {}            # seq -> running job
+        self._seq = itertools.count()
+        self._waits = collections.deque(maxlen=WAIT_WINDOW)
+        self.completed = 0
+        self.cancelled = 0
+        self.replaced = 0
+        self.job_done.connect(self._on_done)
+
+    def submit(self, worker, lane="analysis", name=None, key=None, group=None):
+        """Queue `worker.run()`; returns the job handle."""
+        job = _Job(next(self._seq), lane, name or type(worker).__name__, worker, key, group)
+        if key is not None:
+            old = self._keyed.get(key)
+            if old is not None:
+                old.cancelled = True   # Lazily skipped when popped
+                self.replaced += 1
+            self._keyed[key] = job
+        heapq.heappush(self._heap, job)
+        self._dispatch()
+        return job
+
+    def cancel_all(self, group=None):
+        """Drop queued jobs; running jobs are cancelled and their results discarded.
+        With `group`, only that group's jobs (cancelled queued ones are skipped lazily)."""
+        for job in self._heap:
+            if not job.cancelled and (group is None or job.group == group):
+                job.cancelled = True
+                self.cancelled += 1
+        if group is None:
+            self._heap.clear()
+        for key, job in list(self._keyed.items()):
+            if job.cancelled:
+                del self._keyed[key]
+        for job in self._running.values():
+            if job.cancelled or (group is not None and job.group != group):
+                continue
+            job.cancelled = True
+            self.cancelled += 1
+            job.worker.blockSignals(True)   # Its `finished` never reaches the GUI
+            cancel = getattr(job.worker, "cancel", None)
+            if cancel is not None:
+                cancel.cancel()   # Aborts its in-flight LLM requests
+        self.changed.emit(self.metrics())
+
+    def wait(self, msecs=2000):
+        self.cancel_all()
+        return self.pool.waitForDone(msecs)
+
+    def _dispatch(self):
+        while self._heap and len(self._running) < self.threads:
+            job = heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            if job.key is not None and self._keyed.get(job.key) is job:
+                del self._keyed[job.key]
+            self._waits.append(time.perf_counter() - job.queued_at)
+            self._running[job.seq] = job
+            self.pool.start(lambda job=job: self._run(job))
+        self.changed.emit(self.metrics())
+
+    def _run(self, job):
+        # Pool thread
+        try:
+            job.worker.run()
+        except Exception as e:
+            print(f"❌ Job {job.name} crashed: {e}")
+        finally:
+            self.job_done.emit(job.seq)
+
+    def _on_done(self, seq):
+        job = self._running.pop(seq, None)
+        if job is not None and not job.cancelled:
+            self.completed += 1
+        self._dispatch()
+
+    def metrics(self):
+        queued = {lane: 0 for lane in LANES}
+        for job in self._heap:
+            if not job.cancelled:
+                queued[job.lane] += 1
+        waits = sorted(self._waits)
+        p50 = waits[len(waits) // 2] if waits else 0.0
+        p95 = waits[int(len(waits) * 0.95)] if waits else 0.0
+        return {
+            "queued": queued,
+            "queue_depth": sum(queued.values()),
+            "running": len(self._running),
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "replaced": self.replaced,
+            "wait_ms_p50": round(p50 * 1000, 1),
+            "wait_ms_p95": round(p95 * 1000, 1)
+        }
@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                QLineEdit, QComboBox, QSpinBox, QCheckBox, 
-                               QPushButton, QGroupBox, QMessageBox)
+                               QPushButton, QGroupBox, QMessageBox, QPlainTextEdit)
 from PySide6.QtCore import Qt
 from config_manager import config
 
@@ -16,7 +16,7 @@ class SettingsDialog(QDialog):
             QLabel { color: #e0e0e0; font-size: 12px; }
             QGroupBox { border: 1px solid #333; margin-top: 6px; padding-top: 10px; color: #a0a0b0; font-weight: bold; }
             QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px; }
-            QLineEdit, QSpinBox, QComboBox { 
+            QLineEdit, QSpinBox, QComboBox, QPlainTextEdit { 
                 background-color: #2a2a3a; 
                 color: #ffffff; 
                 border: 1px solid #3a3a4a; 
@@ -46,9 +46,21 @@ class SettingsDialog(QDialog):
         
         self.cb_enable_analysis = QCheckBox("Enable Market Analysis")
         self.cb_enable_analysis.setToolTip("Uncheck to DISABLE sentiment analysis")
+
+        self.cb_enable_streaming = QCheckBox("Stream AI Results")
+        self.cb_enable_streaming.setToolTip("Show analysis cards field by field while the model is still writing")
+
+        self.cb_enable_cache = QCheckBox("Reuse Cached AI Results")
+        self.cb_enable_cache.setToolTip("Replays and repeated passages reuse earlier answers instead of paying again")
+
+        self.cb_enable_prefilter = QCheckBox("Skip Low-Signal Batches")
+        self.cb_enable_prefilter.setToolTip("Moderator chatter and boilerplate are labeled locally (no analysis API call)")
         
         cost_layout.addWidget(self.cb_enable_translation)
         cost_layout.addWidget(self.cb_enable_analysis)
+        cost_layout.addWidget(self.cb_enable_streaming)
+        cost_layout.addWidget(self.cb_enable_cache)
+        cost_layout.addWidget(self.cb_enable_prefilter)
         cost_group.setLayout(cost_layout)
         layout.addWidget(cost_group)
         
@@ -78,6 +90,14 @@ class SettingsDialog(QDialog):
         self.combo_analysis.addItems(self.available_models)
         self.combo_analysis.setEditable(True)
         model_layout.addWidget(self.combo_analysis)
+
+        # Fallback Model (hedged requests)
+        model_layout.addWidget(QLabel("Analysis Fallback Model:"))
+        self.combo_fallback = QComboBox()
+        self.combo_fallback.addItems([""] + self.available_models)
+        self.combo_fallback.setEditable(True)
+        self.combo_fallback.setToolTip("Asked in parallel when the analysis model is slower than usual or fails (empty = off)")
+        model_layout.addWidget(self.combo_fallback)
         
         model_group.setLayout(model_layout)
         layout.addWidget(model_group)
@@ -92,6 +112,13 @@ class SettingsDialog(QDialog):
         self.line_media_url.setPlaceholderText("https://www.youtube.com/watch?v=...")
         src_layout.addWidget(self.line_media_url)
 
+        # Extra streams, started / stopped from the toolbar's stream selector
+        src_layout.addWidget(QLabel("Extra Streams (one per line: stream_id URL):"))
+        self.text_streams = QPlainTextEdit()
+        self.text_streams.setPlaceholderText("ecb https://www.youtube.com/watch?v=...\nboj https://www.youtube.com/watch?v=...")
+        self.text_streams.setFixedHeight(60)
+        src_layout.addWidget(self.text_streams)
+
         # Deepgram URL
         src_layout.addWidget(QLabel("Deepgram API Endpoint:"))
         self.line_url = QLineEdit()
@@ -138,11 +165,16 @@ class SettingsDialog(QDialog):
         """Populate UI from config"""
         self.cb_enable_translation.setChecked(config.get("enable_translation", True))
         self.cb_enable_analysis.setChecked(config.get("enable_analysis", True))
+        self.cb_enable_streaming.setChecked(config.get("enable_streaming", True))
+        self.cb_enable_cache.setChecked(config.get("enable_response_cache", True))
+        self.cb_enable_prefilter.setChecked(config.get("enable_prefilter", True))
         
         self.combo_translate.setCurrentText(config.get("model_translate"))
         self.combo_analysis.setCurrentText(config.get("model_analysis"))
+        self.combo_fallback.setCurrentText(config.get("model_analysis_fallback", ""))
         
         self.line_media_url.setText(config.get("target_media_url", ""))
+        self.text_streams.setPlainText("\n".join(f"{sid} {url}" for sid, url in config.get("streams", {}).items()))
         self.line_url.setText(config.get("deepgram_ws_url", ""))
         self.spin_token_summary.setValue(config.get("max_tokens_summary", 4096))
 
@@ -150,11 +182,21 @@ class SettingsDialog(QDialog):
         """Save UI to config"""
         config.set("enable_translation", self.cb_enable_translation.isChecked())
         config.set("enable_analysis", self.cb_enable_analysis.isChecked())
+        config.set("enable_streaming", self.cb_enable_streaming.isChecked())
+        config.set("enable_response_cache", self.cb_enable_cache.isChecked())
+        config.set("enable_prefilter", self.cb_enable_prefilter.isChecked())
         
         config.set("model_translate", self.combo_translate.currentText())
         config.set("model_analysis", self.combo_analysis.currentText())
+        config.set("model_analysis_fallback", self.combo_fallback.currentText().strip())
         
         config.set("target_media_url", self.line_media_url.text().strip())
+        streams = {}
+        for line in self.text_streams.toPlainText().splitlines():
+            parts = line.split(None, 1)
+            if parts:
+                streams[parts[0]] = parts[1].strip() if len(parts) > 1 else ""
+        config.set("streams", streams)
         config.set("deepgram_ws_url", self.line_url.text().strip())
         config.set("max_tokens_summary", self.spin_token_summary.value())
         
@@ -0,0 +1,356 @@
+"""
+Transcript View
+===============
+Model/view replacement for the QTextEdit transcript and translation panes,
+which grew one rich-text document for the whole session and re-laid it out
+on every `insertHtml`.
+
+- `TranscriptModel`: rows (segments, batch headers, status markers, HTML
+  cards); appending is O(1). With a cap (TRANSCRIPT_MAX_ROWS) the oldest
+  rows are dropped in chunks, so this runs rarely
+- `TranscriptDelegate`: paints one row (speaker column, colored bar, wrapped
+  text) and caches its height per view width; only visible rows are painted
+- `TranscriptView`: scroll area over the model that keeps row positions as
+  a running sum of heights (an append measures only the new rows), follows
+  the end while the user is at the bottom, and copies selected rows
+"""
+
+import bisect
+import os
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import (QAbstractTextDocumentLayout, QColor, QFont, QFontMetrics, QKeySequence, QPainter,
+                           QPalette, QTextDocument)
+from PySide6.QtWidgets import (QAbstractScrollArea, QApplication, QStyle, QStyledItemDelegate,
+                               QStyleOptionViewItem)
+
+TRANSCRIPT_MAX_ROWS = int(os.getenv("TRANSCRIPT_MAX_ROWS", 5000))   # 0 = keep the whole session
+ROW_ROLE = Qt.UserRole + 1
+
+TEXT_COLOR = "#e0e0e0"
+MUTED_COLOR = "#606070"
+SELECTED_COLOR = "#2a2a3a"
+ROW_GAP = 8   # space below each row (the old tables' margin-bottom)
+
+
+class Row:
+    """One transcript line. kind: segment | header | marker | html"""
+
+    __slots__ = ("kind", "text", "speaker", "time", "color", "size", "doc")
+
+    def __init__(self, kind, text, speaker="", time="", color=TEXT_COLOR):
+        self.kind = kind
+        self.text = text
+        self.speaker = speaker
+        self.time = time
+        self.color = color
+        self.size = None   # (width, height), cached by the delegate
+        self.doc = None    # QTextDocument of an html row, built when first shown
+
+    def plain_text(self):
+        if self.kind == "segment":
+            return f"[{self.time}] {self.speaker}: {self.text}" if self.time else f"{self.speaker}: {self.text}"
+        if self.kind == "html":
+            doc = QTextDocument()
+            doc.setHtml(self.text)
+            return doc.toPlainText().strip()
+        return self.text
+
+
+class TranscriptModel(QAbstractListModel):
+    """Append-only list of `Row`s with an optional cap."""
+
+    def __init__(self, max_rows=TRANSCRIPT_MAX_ROWS, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.max_rows = max_rows
+        self.dropped = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == ROW_ROLE:
+            return self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.rows[index.row()].plain_text()
+        return None
+
+    def append(self, rows):
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+        if self.max_rows and len(self.rows) > self.max_rows:
+            # Drop 10% more than needed, so the (O(n)) removal runs rarely
+            n = min(len(self.rows), len(self.rows) - self.max_rows + max(self.max_rows // 10, 1))
+            self.beginRemoveRows(QModelIndex(), 0, n - 1)
+            del self.rows[:n]
+            self.endRemoveRows()
+            self.dropped += n
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.endResetModel()
+
+
+class TranscriptDelegate(QStyledItemDelegate):
+    """Paints rows the way the old HTML tables looked; heights cached per width."""
+
+    def __init__(self, speaker_width=100, parent=None):
+        super().__init__(parent)
+        self.speaker_width = speaker_width
+        self.width = 400   # viewport width, set by the view on resize
+        self._fonts = {}
+
+    def font(self, px, bold=False):
+        """(QFont, QFontMetrics) for a pixel size."""
+        cached = self._fonts.get((px, bold))
+        if cached is None:
+            font = QFont(QApplication.font())
+            font.setPixelSize(px)
+            font.setBold(bold)
+            cached = self._fonts[(px, bold)] = (font, QFontMetrics(font))
+        return cached
+
+    def _document(self, row, width):
+        if row.doc is None:
+            row.doc = QTextDocument()
+            row.doc.setDefaultFont(self.font(13)[0])
+            row.doc.setHtml(row.text)
+        row.doc.setTextWidth(width)
+        return row.doc
+
+    def _text_rect(self, rect):
+        left = rect.x() + self.speaker_width + 12
+        return QRect(left, rect.y(), max(rect.right() - left - 4, 40), rect.height())
+
+    def row_height(self, row, width):
+        if row.size is not None and row.size[0] == width:
+            return row.size[1]
+        if row.kind == "segment":
+            fm = self.font(13)[1]
+            text = fm.boundingRect(self._text_rect(QRect(0, 0, width, 0)).adjusted(0, 0, 0, 100000),
+                                   Qt.TextWordWrap, row.text).height()
+            label = self.font(10, True)[1].height() + (self.font(9)[1].height() if row.time else 0)
+            height = max(text, label) + ROW_GAP
+        elif row.kind == "header":
+            height = self.font(10)[1].height() + 8 + 6
+        elif row.kind == "marker":
+            height = self.font(12)[1].height() + 4
+        else:
+            height = int(self._document(row, width).size().height()) + ROW_GAP
+        row.size = (width, height)
+        return height
+
+    def sizeHint(self, option, index):
+        return QSize(self.width, self.row_height(index.data(ROW_ROLE), self.width))
+
+    def paint(self, painter, option, index):
+        row = index.data(ROW_ROLE)
+        rect = option.rect
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor(SELECTED_COLOR))
+
+        if row.kind == "segment":
+            color = QColor(row.color)
+            speaker_font, speaker_fm = self.font(10, True)
+            painter.setFont(speaker_font)
+            painter.setPen(color)
+            painter.drawText(QRect(rect.x() + 4, rect.y(), self.speaker_width - 12, speaker_fm.height()),
+                             Qt.AlignLeft | Qt.AlignTop,
+                             speaker_fm.elidedText(row.speaker, Qt.ElideRight, self.speaker_width - 12))
+            if row.time:
+                time_font, time_fm = self.font(9)
+                painter.setFont(time_font)
+                painter.setPen(QColor(MUTED_COLOR))
+                painter.drawText(QRect(rect.x() + 4, rect.y() + speaker_fm.height(), self.speaker_width - 12,
+                                       time_fm.height()), Qt.AlignLeft | Qt.AlignTop, row.time)
+            painter.fillRect(rect.x() + self.speaker_width, rect.y(), 2, rect.height() - ROW_GAP, color)
+            painter.setFont(self.font(13)[0])
+            painter.setPen(QColor(TEXT_COLOR))
+            painter.drawText(self._text_rect(rect), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, row.text)
+        elif row.kind == "header":
+            font, fm = self.font(10)
+            painter.setFont(font)
+            painter.setPen(QColor(MUTED_COLOR))
+            top = rect.y() + 8
+            painter.drawText(QRect(rect.x() + 4, top, rect.width() - 8, fm.height()), Qt.AlignLeft, row.text)
+            painter.fillRect(rect.x(), top + fm.height() + 1, rect.width(), 1, QColor(SELECTED_COLOR))
+        elif row.kind == "marker":
+            font, fm = self.font(12)
+            painter.setFont(font)
+            painter.setPen(QColor(row.color))
+            painter.drawText(rect.adjusted(4, 2, -4, 0), Qt.AlignLeft | Qt.AlignTop, row.text)
+        else:
+            doc = self._document(row, rect.width())
+            context = QAbstractTextDocumentLayout.PaintContext()
+            context.palette.setColor(QPalette.Text, QColor(TEXT_COLOR))
+            painter.translate(rect.topLeft())
+            doc.documentLayout().draw(painter, context)
+        painter.restore()
+
+
+class TranscriptView(QAbstractScrollArea):
+    """
+    Virtualized transcript pane over a `TranscriptModel`, painted by a
+    `TranscriptDelegate`: `add_segment()`, `add_marker()`, `add_html()`,
+    `append_rows()`.
+
+    Row positions are a running sum of row heights, so an append measures
+    only the new rows and painting only touches the visible ones. (QListView
+    re-measures every row on each insert, which is what made long sessions
+    slow in the first place.)
+    """
+
+    def __init__(self, speaker_width=100, max_rows=TRANSCRIPT_MAX_ROWS, parent=None):
+        super().__init__(parent)
+        self.model = TranscriptModel(max_rows, self)
+        self.delegate = TranscriptDelegate(speaker_width, self)
+        self.offsets = [0]   # offsets[i] = top of row i; offsets[-1] = content height
+        self.anchor = None   # selection: rows anchor..current
+        self.current = None
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(20)
+        self.model.rowsInserted.connect(self._rows_inserted)
+        self.model.rowsRemoved.connect(self._rows_removed)
+        self.model.modelReset.connect(self._relayout)
+
+    # --- Appending ---
+
+    def append_rows(self, rows):
+        self.model.append(rows)
+
+    def add_segment(self, speaker, text, time="", color=TEXT_COLOR):
+        self.append_rows([Row("segment", text, speaker, time, color)])
+
+    def add_marker(self, text, color):
+        self.append_rows([Row("marker", text, color=color)])
+
+    def add_html(self, html):
+        """A rich card (Big Picture update, final verdict)."""
+        self.append_rows([Row("html", html)])
+
+    def clear(self):
+        self.model.clear()
+
+    def to_plain_text(self):
+        return "\n".join(row.plain_text() for row in self.model.rows)
+
+    # --- Layout ---
+
+    def _at_bottom(self):
+        bar = self.verticalScrollBar()
+        return bar.value() >= bar.maximum() - 4
+
+    def _update_scrollbar(self, follow=False):
+        bar = self.verticalScrollBar()
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(0, self.offsets[-1] - self.viewport().height()))
+        if follow:
+            bar.setValue(bar.maximum())
+
+    def _rows_inserted(self, parent, first, last):
+        follow = self._at_bottom()
+        width = self.delegate.width
+        rows = self.model.rows
+        for i in range(first, last + 1):
+            self.offsets.append(self.offsets[-1] + self.delegate.row_height(rows[i], width))
+        self._update_scrollbar(follow)
+        if self.offsets[first] < self.verticalScrollBar().value() + self.viewport().height():
+            self.viewport().update()
+
+    def _rows_removed(self, parent, first, last):
+        # The model only drops rows from the top
+        shift = self.offsets[last + 1]
+        self.offsets = [offset - shift for offset in self.offsets[last + 1:]]
+        count = last - first + 1
+        if self.anchor is not None:
+            self.anchor = max(self.anchor - count, 0)
+            self.current = max(self.current - count, 0)
+        bar = self.verticalScrollBar()
+        value = bar.value()
+        self._update_scrollbar()
+        bar.setValue(max(0, value - shift))   # keep the rows on screen where they were
+        self.viewport().update()
+
+    def _relayout(self):
+        width = self.delegate.width
+        offsets = [0]
+        for row in self.model.rows:
+            offsets.append(offsets[-1] + self.delegate.row_height(row, width))
+        self.offsets = offsets
+        if self.anchor is not None and self.anchor >= len(self.model.rows):
+            self.anchor = self.current = None
+        self._update_scrollbar()
+        self.viewport().update()
+
+    def row_at(self, y):
+        """Row under viewport coordinate `y` (None below the last row)."""
+        i = bisect.bisect_right(self.offsets, y + self.verticalScrollBar().value()) - 1
+        return i if 0 <= i < len(self.model.rows) else None
+
+    # --- Qt overrides ---
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        width = self.viewport().width()
+        if width != self.delegate.width:
+            # Wrapped heights change with the width (cached per width, so resizing back is cheap)
+            follow = self._at_bottom()
+            self.delegate.width = width
+            self._relayout()
+            self._update_scrollbar(follow)
+        else:
+            self._update_scrollbar()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        top = self.verticalScrollBar().value()
+        bottom = top + self.viewport().height()
+        width = self.delegate.width
+        selected = (min(self.anchor, self.current), max(self.anchor, self.current)) if self.anchor is not None else None
+        option = QStyleOptionViewItem()
+        i = max(bisect.bisect_right(self.offsets, top) - 1, 0)
+        while i < len(self.model.rows) and self.offsets[i] < bottom:
+            option.rect = QRect(0, self.offsets[i] - top, width, self.offsets[i + 1] - self.offsets[i])
+            option.state = QStyle.State_Selected if selected and selected[0] <= i <= selected[1] else QStyle.State_None
+            self.delegate.paint(painter, option, self.model.index(i))
+            i += 1
+        painter.end()
+
+    def mousePressEvent(self, event):
+        row = self.row_at(event.position().y())
+        if row is None:
+            self.anchor = self.current = None
+        elif event.modifiers() & Qt.ShiftModifier and self.anchor is not None:
+            self.current = row
+        else:
+            self.anchor = self.current = row
+        self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        row = self.row_at(event.position().y())
+        if event.buttons() & Qt.LeftButton and row is not None and self.anchor is not None:
+            self.current = row
+            self.viewport().update()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy) and self.anchor is not None:
+            first, last = sorted((self.anchor, self.current))
+            QApplication.clipboard().setText("\n".join(row.plain_text() for row in self.model.rows[first:last + 1]))
+        elif event.matches(QKeySequence.SelectAll) and self.model.rows:
+            self.anchor, self.current = 0, len(self.model.rows) - 1
+            self.viewport().update()
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,130 @@
+"""
+GUI Update Coalescer
+====================
+Buffers high-rate GUI updates (transcript segments, streamed analysis
+fields) and applies them at most once every UI_FLUSH_MS, so a burst of
+finals during rapid-fire Q&A becomes one model insert instead of one
+relayout per message.
+
+- Append channels: every posted item is kept, the handler gets them as a
+  list in arrival order
+- Keyed channels: only the latest item per key is kept (a streamed card is
+  redrawn once per flush, not once per field); `discard()` drops a pending
+  item whose final version was applied directly, `discard_where()` the
+  pending items of one stream
+- The first update after a quiet period goes out on the next event-loop
+  turn; later ones wait for the interval
+- `metrics()`: flushes, items, coalesced updates, main-thread ms per flush
+  (p50 / p95 / max); flushes over UI_FLUSH_BUDGET_MS are logged
+
+All methods run on the GUI thread.
+"""
+
+import collections
+import os
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+UI_FLUSH_MS = int(os.getenv("UI_FLUSH_MS", 50))                 # at most ~20 flushes per second
+UI_FLUSH_BUDGET_MS = float(os.getenv("UI_FLUSH_BUDGET_MS", 30))
+FLUSH_WINDOW = 200   # recent flush durations kept for the percentiles
+
+
+class _Channel:
+    __slots__ = ("handler", "keyed", "pending", "items", "coalesced")
+
+    def __init__(self, handler, keyed):
+        self.handler = handler
+        self.keyed = keyed
+        self.pending = {} if keyed else []
+        self.items = 0       # items handed to the handler
+        self.coalesced = 0   # keyed items replaced before they were shown
+
+
+class UpdateCoalescer(QObject):
+    """Frame-rate-limited delivery of GUI updates to their handlers."""
+
+    def __init__(self, interval_ms=UI_FLUSH_MS, budget_ms=UI_FLUSH_BUDGET_MS, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self.channels = {}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.last_flush = 0.0
+        self.flushes = 0
+        self.durations = collections.deque(maxlen=FLUSH_WINDOW)   # ms per flush
+
+    def add_channel(self, name, handler, keyed=False):
+        """`handler(items)`: a list for append channels, a {key: item} dict for keyed ones."""
+        self.channels[name] = _Channel(handler, keyed)
+
+    def post(self, name, item, key=None):
+        channel = self.channels[name]
+        if channel.keyed:
+            if key in channel.pending:
+                channel.coalesced += 1
+            channel.pending[key] = item
+        else:
+            channel.pending.append(item)
+        if not self.timer.isActive():
+            since = (time.perf_counter() - self.last_flush) * 1000
+            self.timer.start(int(max(0, self.interval_ms - since)))
+
+    def discard(self, name, key=None):
+        """Drop pending items of a keyed channel (all of them without `key`)."""
+        channel = self.channels[name]
+        if key is None:
+            channel.pending.clear()
+        else:
+            channel.pending.pop(key, None)
+
+    def discard_where(self, name, predicate):
+        """Drop pending items of a keyed channel whose key matches `predicate`."""
+        channel = self.channels[name]
+        for key in [key for key in channel.pending if predicate(key)]:
+            del channel.pending[key]
+
+    def flush(self):
+        """Apply everything pending now (also called before direct edits that must stay in order)."""
+        self.timer.stop()
+        started = time.perf_counter()
+        items = 0
+        for name, channel in self.channels.items():
+            if not channel.pending:
+                continue
+            pending = channel.pending
+            channel.pending = {} if channel.keyed else []
+            channel.items += len(pending)
+            items += len(pending)
+            try:
+                channel.handler(pending)
+            except Exception as e:
+                print(f"❌ UI update '{name}' failed: {e}")
+        self.last_flush = time.perf_counter()
+        if not items:
+            return
+        elapsed = (self.last_flush - started) * 1000
+        self.flushes += 1
+        self.durations.append(elapsed)
+        if elapsed > self.budget_ms:
+            print(f"🐢 UI flush took {elapsed:.0f} ms ({items} updates)")
+
+    def metrics(self):
+        durations = sorted(self.durations)
+
+        def pct(p):
+            if not durations:
+                return 0.0
+            return round(durations[min(len(durations) - 1, int(p * len(durations)))], 2)
+
+        return {
+            "flushes": self.flushes,
+            "items": {name: channel.items for name, channel in self.channels.items()},
+            "coalesced": sum(channel.coalesced for channel in self.channels.values()),
+            "flush_ms_p50": pct(0.5),
+            "flush_ms_p95": pct(0.95),
+            "flush_ms_max": round(durations[-1], 2) if durations else 0.0
+        }
@@ -0,0 +1,249 @@
+"""
+GUI Outbox
+==========
+Bounded outbound queue between pake_live and the GUI, drained by its own
+writer thread, so a slow or frozen GUI never blocks Deepgram result handling.
+
+- Coalescing: interim transcripts (COALESCE_TYPES) replace the pending one
+  for the same stream instead of queueing up; they are the only thing that
+  is ever dropped.
+- Finals (segments, batches, ...) are never dropped while their session is
+  alive: when the queue is full or the GUI is gone they are spooled to a
+  JSONL file (one per backend, see `spool_path_for`) and replayed in order
+  once the GUI is back. Each spooled line carries the session that produced
+  it; lines whose session is gone (stopped, or from an earlier run) are
+  discarded instead of replayed.
+- `metrics()` reports queue depth, spool depth and send latency.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+OUTBOX_MAX = int(os.getenv("GUI_OUTBOX_MAX", 1000))
+SPOOL_DIR = os.getenv("GUI_OUTBOX_SPOOL_DIR", "").strip() or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "transcripts", "outbox")
+COALESCE_TYPES = {"interim"}
+METRICS_INTERVAL = 60.0   # seconds between metric log lines while busy
+LATENCY_WINDOW = 500      # recent sends kept for the latency percentiles
+
+
+def spool_path_for(address):
+    """Spool file of the backend serving the GUI at `address` (IPC port or socket path)"""
+    name = "".join(c if c.isalnum() or c in "-." else "_" for c in str(address)).strip("_")
+    return os.path.join(SPOOL_DIR, f"gui_outbox_{name or 'default'}.jsonl")
+
+
+def coalesce_key(payload):
+    if payload.get("type") in COALESCE_TYPES:
+        return payload.get("type"), payload.get("stream_id")
+    return None
+
+
+class GuiOutbox:
+    """Outbound GUI queue; `send(payload)` must raise when the GUI is unreachable.
+
+    `is_live(owner)` tells whether the session a spooled message was put for
+    still exists (messages put without an owner are always replayed).
+    """
+
+    def __init__(self, send, maxsize=OUTBOX_MAX, spool_path=None, is_live=None):
+        self._send = send
+        self.maxsize = maxsize
+        self.spool_path = spool_path or spool_path_for("default")
+        self.is_live = is_live
+        self._queue = collections.deque()   # [payload, enqueued_at, key, owner]
+        self._pending = {}                   # coalesce key -> queued entry
+        self._cond = threading.Condition()
+        self._connected = False
+        self._spooled = self._count_spool()  # lines waiting on disk
+        self._thread = None
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.stale = 0   # spooled messages of sessions that were gone at replay
+        self.spooled_total = 0
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._last_metrics = time.time()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="gui-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    # --- Producer side (any thread, never blocks on the GUI) ---
+
+    def put(self, payload, owner=None):
+        key = coalesce_key(payload)
+        with self._cond:
+            if key is not None:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[0] = payload  # Keep the queue position, send the newest
+                    self.coalesced += 1
+                    return
+                if not self._connected or len(self._queue) >= self.maxsize:
+                    self.dropped += 1   # Stale by the time the GUI could show it
+                    return
+            elif self._spooled or not self._connected or len(self._queue) >= self.maxsize:
+                # Keep order: once spooling, finals go to disk until replayed
+                self._spool([(payload, owner)])
+                self._cond.notify()
+                return
+
+            entry = [payload, time.perf_counter(), key, owner]
+            self._queue.append(entry)
+            if key is not None:
+                self._pending[key] = entry
+            self._cond.notify()
+
+    # --- Connection state (called by the GUI link) ---
+
+    def connected(self):
+        with self._cond:
+            self._connected = True
+            self._cond.notify()
+
+    def disconnected(self):
+        with self._cond:
+            self._go_offline()
+
+    def _go_offline(self, unsent=()):
+        # Caller holds the lock: move `unsent` + queued finals to disk, drop interims
+        self._connected = False
+        queued = [(entry[0], entry[3]) for entry in self._queue if entry[2] is None]
+        self.dropped += len(self._queue) - len(queued)
+        finals = list(unsent) + queued
+        self._queue.clear()
+        self._pending.clear()
+        if finals:
+            self._spool(finals, front=True)
+
+    # --- Spool ---
+
+    def _count_spool(self):
+        try:
+            with open(self.spool_path, "r", encoding="utf-8") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+
+    def _spool(self, messages, front=False):
+        # messages: (payload, owner) pairs
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        lines = "".join(json.dumps({"owner": owner, "payload": payload}, ensure_ascii=False) + "\n"
+                        for payload, owner in messages)
+        if front and self._spooled:
+            # Queued finals are older than anything already on disk
+            with open(self.spool_path, "r", encoding="utf-8") as f:
+                lines += f.read()
+            with open(self.spool_path, "w", encoding="utf-8") as f:
+                f.write(lines)
+        else:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        self._spooled += len(messages)
+        self.spooled_total += len(messages)
+
+    def _take_spool(self):
+        # Caller holds the lock: hand the whole spool to the writer
+        try:
+            with open(self.spool_path, "r", encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+            os.remove(self.spool_path)
+        except FileNotFoundError:
+            lines = []
+        self._spooled = 0
+        backlog, stale = [], 0
+        for line in lines:
+            record = json.loads(line)
+            owner = record.get("owner")
+            if owner is not None and not (self.is_live and self.is_live(owner)):
+                stale += 1   # Its session ended (or belongs to an earlier run)
+                continue
+            backlog.append((record["payload"], owner))
+        if stale:
+            self.stale += stale
+            print(f"🗑️ Discarded {stale} spooled GUI message(s) of ended sessions")
+        return backlog
+
+    # --- Writer thread ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._connected or not (self._queue or self._spooled):
+                    self._cond.wait(timeout=1.0)
+                if self._spooled:
+                    backlog, entry = self._take_spool(), None
+                else:
+                    backlog, entry = None, self._queue.popleft()
+                    if entry[2] is not None:
+                        self._pending.pop(entry[2], None)
+
+            if backlog is not None:
+                self._replay(backlog)
+            else:
+                self._deliver(entry)
+            self._maybe_log_metrics()
+
+    def _deliver(self, entry):
+        try:
+            self._send(entry[0])
+        except Exception as e:
+            print(f"⚠️ GUI send error: {e} (spooling until the GUI is back)")
+            with self._cond:
+                if entry[2] is None:
+                    self._queue.appendleft(entry)
+                self._go_offline()
+            return
+        self.sent += 1
+        self._latencies.append(time.perf_counter() - entry[1])
+
+    def _replay(self, backlog):
+        if not backlog:
+            return
+        print(f"📦 Replaying {len(backlog)} spooled GUI message(s)")
+        for i, (payload, _) in enumerate(backlog):
+            try:
+                self._send(payload)
+                self.sent += 1
+            except Exception as e:
+                print(f"⚠️ GUI send error during replay: {e}")
+                with self._cond:
+                    # Unsent backlog goes back to the front of the spool
+                    self._go_offline(backlog[i:])
+                return
+
+    # --- Metrics ---
+
+    def metrics(self):
+        with self._cond:
+            depth, spooled = len(self._queue), self._spooled
+            latencies = sorted(self._latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return {
+            "connected": self._connected,
+            "queue_depth": depth,
+            "spooled": spooled,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped_interims": self.dropped,
+            "stale_discarded": self.stale,
+            "spooled_total": self.spooled_total,
+            "send_latency_ms_p50": round(p50 * 1000, 2),
+            "send_latency_ms_p95": round(p95 * 1000, 2)
+        }
+
+    def _maybe_log_metrics(self):
+        if time.time() - self._last_metrics < METRICS_INTERVAL:
+            return
+        self._last_metrics = time.time()
+        m = self.metrics()
+        print(f"\n📊 GUI outbox: depth {m['queue_depth']}, spooled {m['spooled']}, sent {m['sent']}, "
+              f"latency p50 {m['send_latency_ms_p50']}ms / p95 {m['send_latency_ms_p95']}ms")
@@ -0,0 +1,180 @@
+"""
+IPC Protocol
+============
+Wire format of the pake_live <-> pake_gui link.
+
+Legacy: newline-delimited JSON. A new backend opens with a HELLO line listing
+the codecs it can speak; a new GUI answers HELLO_ACK with its pick and from
+then on both sides send length-prefixed frames:
+
+    [4-byte big-endian body length][body: msgpack or compact UTF-8 JSON]
+
+An old GUI ignores HELLO and never answers, so the backend falls back to
+NDJSON after HANDSHAKE_TIMEOUT. Framed peers also send batches with segment
+ids instead of re-sending every segment body (the GUI caches segments by id).
+"""
+
+import json
+import struct
+
+try:
+    import msgpack # pip install msgpack
+except ImportError:  # Compact JSON frames only
+    msgpack = None
+
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("!I")
+MAX_FRAME = 64 * 1024 * 1024
+HANDSHAKE_TIMEOUT = 2.0
+
+
+class JsonCodec:
+    name = "json"
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    @staticmethod
+    def dumps(obj):
+        return msgpack.packb(obj, use_bin_type=True)
+
+    @staticmethod
+    def loads(data):
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {"json": JsonCodec}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec
+PREFERENCE = ["msgpack", "json"]
+
+
+def available_codecs():
+    return [name for name in PREFERENCE if name in CODECS]
+
+
+def hello(**offer):
+    """Backend greeting; `offer` adds transport extras (e.g. a shared-memory ring)."""
+    return {"type": "HELLO", "protocol": "pake-ipc", "version": PROTOCOL_VERSION,
+            "codecs": available_codecs(), **offer}
+
+
+def choose_codec(offered):
+    """First codec (in our preference order) that the peer also offered."""
+    for name in PREFERENCE:
+        if name in CODECS and name in (offered or []):
+            return CODECS[name]
+    return None
+
+
+def hello_ack(codec, **accepted):
+    return {"type": "HELLO_ACK", "version": PROTOCOL_VERSION, "codec": codec.name, **accepted}
+
+
+def encode_message(obj, codec=None):
+    """One message as bytes: an NDJSON line (codec None) or a length-prefixed frame."""
+    if codec is None:
+        return (json.dumps(obj) + "\n").encode("utf-8")
+    body = codec.dumps(obj)
+    return HEADER.pack(len(body)) + body
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class IpcReader:
+    """Incremental decoder for one direction of the link.
+
+    Starts in NDJSON mode; `switch(codec)` moves to framed mode after the
+    handshake. Bytes are kept in one bytearray and consumed by offset, so large
+    messages arriving in many chunks are parsed in linear time.
+    """
+
+    def __init__(self, codec=None):
+        self.codec = codec
+        self._buf = bytearray()
+        self._pos = 0      # start of the first unconsumed message
+        self._scan = 0     # NDJSON: where to resume looking for the newline
+
+    def switch(self, codec):
+        self.codec = codec
+        self._scan = self._pos
+
+    def feed(self, data):
+        """Yield every complete message; call `switch` between messages if needed."""
+        self._buf += data
+        try:
+            while True:
+                msg = self._next()
+                if msg is None:
+                    return
+                yield msg
+        finally:
+            if self._pos:
+                del self._buf[:self._pos]
+                self._scan -= self._pos
+                self._pos = 0
+
+    def _next(self):
+        buf = self._buf
+        while self.codec is None:
+            end = buf.find(b"\n", self._scan)
+            if end < 0:
+                self._scan = len(buf)
+                return None
+            line = bytes(buf[self._pos:end])
+            self._pos = self._scan = end + 1
+            if line.strip():
+                return json.loads(line)
+
+        if len(buf) - self._pos < HEADER.size:
+            return None
+        (size,) = HEADER.unpack_from(buf, self._pos)
+        if size > MAX_FRAME:
+            raise ProtocolError(f"frame of {size} bytes exceeds {MAX_FRAME}")
+        start = self._pos + HEADER.size
+        if len(buf) - start < size:
+            return None
+        self._pos = self._scan = start + size
+        return self.codec.loads(bytes(buf[start:start + size]))
+
+
+def client_handshake(sock, timeout=HANDSHAKE_TIMEOUT, **offer):
+    """Backend side: offer codecs, wait for HELLO_ACK.
+
+    Returns (codec or None for legacy NDJSON, IpcReader to keep reading
+    with, messages that already arrived after the ack, the ack itself or None).
+    """
+    reader = IpcReader()
+    sock.sendall(encode_message(hello(**offer)))
+    previous = sock.gettimeout()
+    sock.settimeout(timeout)
+    try:
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                raise ConnectionError("peer closed during handshake")
+            messages = reader.feed(data)
+            for msg in messages:
+                if msg.get("type") == "HELLO_ACK":
+                    codec = CODECS.get(msg.get("codec"))
+                    reader.switch(codec)
+                    # Anything after the ack is already in the new format
+                    pending = list(messages)
+                    return codec, reader, pending, msg
+                # Pre-handshake command from a GUI that raced us: keep it
+                return None, reader, [msg] + list(messages), None
+    except TimeoutError:
+        return None, reader, [], None  # Old GUI: stays silent, keep NDJSON
+    finally:
+        sock.settimeout(previous)
@@ -0,0 +1,148 @@
+"""
+IPC Transport
+=============
+Where the pake_live <-> pake_gui byte stream travels (the framing itself is
+ipc_protocol's job). Chosen by PAKE_IPC_TRANSPORT in .env, read by both sides:
+
+    tcp   loopback TCP, PAKE_IPC_ADDRESS=host:port (default localhost:8765)
+    unix  Unix domain socket, PAKE_IPC_ADDRESS=/path/to.sock (QLocalServer in the GUI)
+    shm   commands over the unix socket (TCP where AF_UNIX is missing) and
+          backend -> GUI messages through a shared-memory ring buffer
+
+Distinct socket paths let several backend/GUI pairs share one host without
+port clashes. The ring is offered in HELLO; a GUI that cannot attach it just
+keeps reading the socket.
+"""
+
+import os
+import socket
+import struct
+import tempfile
+import time
+from multiprocessing import shared_memory
+
+TRANSPORTS = ("tcp", "unix", "shm")
+HAS_UNIX = hasattr(socket, "AF_UNIX")
+DEFAULT_TCP_ADDRESS = "localhost:8765"
+DEFAULT_UNIX_ADDRESS = os.path.join(tempfile.gettempdir(), "pake-ipc.sock")
+SHM_RING_SIZE = int(os.getenv("PAKE_IPC_SHM_SIZE", 4 * 1024 * 1024))
+SHM_WRITE_TIMEOUT = 2.0   # seconds to wait for ring space before giving up on a message
+
+
+def settings():
+    """(transport, control channel "tcp"/"unix", control address) from the environment."""
+    kind = os.getenv("PAKE_IPC_TRANSPORT", "tcp").strip().lower()
+    if kind not in TRANSPORTS:
+        print(f"⚠️ Unknown PAKE_IPC_TRANSPORT={kind!r}, using tcp")
+        kind = "tcp"
+    if kind == "unix" and not HAS_UNIX:
+        print("⚠️ Unix domain sockets are not available here, using tcp")
+        kind = "tcp"
+    control = "unix" if kind == "unix" or (kind == "shm" and HAS_UNIX) else "tcp"
+    default = DEFAULT_UNIX_ADDRESS if control == "unix" else DEFAULT_TCP_ADDRESS
+    address = os.getenv("PAKE_IPC_ADDRESS", "").strip() or default
+    return kind, control, address
+
+
+def parse_tcp_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "localhost", int(port)
+
+
+def connect(control, address):
+    """Backend side: open the control socket."""
+    if control == "unix":
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.connect(address)
+        return s
+    return socket.create_connection(parse_tcp_address(address))
+
+
+class ShmRing:
+    """Single-producer / single-consumer byte ring in shared memory.
+
+    Layout: [write_pos u64][read_pos u64][data ...]. Both positions only grow;
+    the writer owns write_pos and the reader owns read_pos, and each side
+    publishes its counter only after the bytes are copied.
+    """
+
+    COUNTERS = struct.Struct("<QQ")
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.capacity = shm.size - self.COUNTERS.size
+        self._data = shm.buf[self.COUNTERS.size:self.COUNTERS.size + self.capacity]
+
+    @classmethod
+    def create(cls, size=SHM_RING_SIZE):
+        shm = shared_memory.SharedMemory(create=True, size=size + cls.COUNTERS.size)
+        cls.COUNTERS.pack_into(shm.buf, 0, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name, untrack=True):
+        """Open the backend's ring. Pass untrack=False from a child of the
+        creating process (it shares the creator's resource tracker)."""
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack and os.name == "posix":
+            # Python < 3.13 registers attached segments with the resource tracker,
+            # which would unlink the backend's ring when the GUI exits
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls(shm, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _positions(self):
+        return self.COUNTERS.unpack_from(self.shm.buf, 0)
+
+    def write(self, data, timeout=SHM_WRITE_TIMEOUT):
+        """Copy `data` into the ring, waiting for the reader to make room."""
+        size = len(data)
+        if size > self.capacity:
+            raise ValueError(f"message of {size} bytes exceeds ring capacity {self.capacity}")
+        deadline = time.monotonic() + timeout
+        while True:
+            write_pos, read_pos = self._positions()
+            if self.capacity - (write_pos - read_pos) >= size:
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError("shared-memory ring full (GUI not reading)")
+            time.sleep(0.001)
+
+        start = write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        view = memoryview(data)
+        self._data[start:start + first] = view[:first]
+        if first < size:
+            self._data[:size - first] = view[first:]
+        struct.pack_into("<Q", self.shm.buf, 0, write_pos + size)
+
+    def read(self):
+        """All bytes written since the last read (b"" if none)."""
+        write_pos, read_pos = self._positions()
+        size = write_pos - read_pos
+        if not size:
+            return b""
+        start = read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        data = bytes(self._data[start:start + first])
+        if first < size:
+            data += bytes(self._data[:size - first])
+        struct.pack_into("<Q", self.shm.buf, 8, write_pos)
+        return data
+
+    def close(self):
+        self._data.release()
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
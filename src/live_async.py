@@ -0,0 +1,256 @@
+"""
+Async Deepgram Client
+=====================
+asyncio streaming mode for pake_live. Audio read and WebSocket send/receive
+are coroutines on ONE shared event loop thread, so a backend can drive many
+streams without a producer/consumer/run_forever trio each. GUI messages go
+through the shared GuiOutbox, which never blocks the loop. Parsed results
+are handed to one worker thread (ResultHandoff), so batching, which takes
+thread locks, never runs on the loop either.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+import websockets # pip install websockets
+
+from audio_ingest import FRAME_BYTES, decoder_cmd, source_cmd
+from deepgram_transport import (BACKOFF_MAX, BYTES_PER_SECOND, KEEPALIVE_MESSAGE, REPLAY_SECONDS,
+                                PcmBackBuffer, TimelineAligner, backoff_delays)
+from vad import AudioStats, VadGate
+
+KEEPALIVE_AFTER = 1.0     # seconds without audio before a silence frame is sent
+KEEPALIVE_INTERVAL = 3.0  # seconds between KeepAlive messages while the VAD drops silence
+
+
+class AsyncAudioSource:
+    """yt_dlp -> ffmpeg pipeline read through asyncio subprocess streams."""
+
+    def __init__(self, url, python=sys.executable, frame_bytes=FRAME_BYTES):
+        self.url = url
+        self.python = python
+        self.frame_bytes = frame_bytes
+        self._procs = []
+        self._stdout = None
+        self.bytes_read = 0
+
+    async def start(self):
+        # Join the two processes with a plain OS pipe (no shell)
+        read_fd, write_fd = os.pipe()
+        try:
+            source = await asyncio.create_subprocess_exec(
+                *source_cmd(self.url, self.python),
+                stdout=write_fd, stderr=subprocess.DEVNULL
+            )
+            decoder = await asyncio.create_subprocess_exec(
+                *decoder_cmd(),
+                stdin=read_fd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+        self._procs = [source, decoder]
+        self._stdout = decoder.stdout
+        return self
+
+    async def read(self):
+        """Next full PCM frame, or None at end of stream."""
+        try:
+            frame = await self._stdout.readexactly(self.frame_bytes)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            # Last partial frame: pad with silence
+            frame = e.partial + bytes(self.frame_bytes - len(e.partial))
+        self.bytes_read += len(frame)
+        return frame
+
+    async def stop(self):
+        for proc in self._procs:
+            if proc.returncode is None:
+                try:
+                    proc.terminate()
+                except ProcessLookupError:
+                    pass
+
+
+async def _connect(ws_url, headers):
+    # websockets >= 14 renamed extra_headers -> additional_headers
+    try:
+        return await websockets.connect(ws_url, additional_headers=headers, max_size=None)
+    except TypeError:
+        return await websockets.connect(ws_url, extra_headers=headers, max_size=None)
+
+
+async def _send_audio(ws, source, is_running, backbuffer, gate, stats):
+    """Pump frames until end of stream (returns True) or a send fails (raises)."""
+    loop = asyncio.get_running_loop()
+    silence_chunk = bytes(source.frame_bytes)
+    keepalive_after = KEEPALIVE_INTERVAL if gate.enabled else KEEPALIVE_AFTER
+    last_sent = loop.time()
+    while is_running():
+        try:
+            frame = await asyncio.wait_for(source.read(), timeout=KEEPALIVE_AFTER)
+        except asyncio.TimeoutError:
+            frame = b""
+        if frame is None:
+            break
+        if frame:
+            stats.bytes_read += len(frame)
+            chunks = gate.feed(frame)
+        elif not gate.enabled:
+            # No audio for a while: keep Deepgram's connection alive
+            chunks = (silence_chunk,)
+        else:
+            chunks = ()
+        for chunk in chunks:
+            # Buffer first so a failed send is replayed after reconnecting
+            backbuffer.append(chunk)
+            await ws.send(chunk)
+            stats.bytes_sent += len(chunk)
+            last_sent = loop.time()
+        if gate.enabled and loop.time() - last_sent > keepalive_after:
+            # Silence is being dropped: hold the socket open without audio
+            await ws.send(KEEPALIVE_MESSAGE)
+            last_sent = loop.time()
+    await ws.send('{"type": "CloseStream"}')
+    return True
+
+
+async def run_stream(source, on_result, is_running, ws_url, headers=None,
+                     replay_seconds=REPLAY_SECONDS, max_backoff=BACKOFF_MAX, gate=None, stats=None):
+    """Stream `source` to Deepgram and feed every parsed result to `on_result`.
+
+    Reconnects with exponential backoff when the socket drops, replaying the
+    back-buffer and shifting timestamps onto the stream timeline. An enabled
+    `gate` (VadGate) drops long silences. Returns when the stream ends,
+    `is_running()` goes False or the task is cancelled.
+    """
+    gate = gate or VadGate(enabled=False)
+    stats = stats if stats is not None else AudioStats()
+    backbuffer = PcmBackBuffer(replay_seconds)
+    aligner = TimelineAligner(gate.to_stream_time)
+    delays = backoff_delays(cap=max_backoff)
+    reconnects = 0
+
+    await source.start()
+    try:
+        while is_running():
+            try:
+                ws = await _connect(ws_url, headers or {})
+            except Exception as e:
+                delay = next(delays)
+                print(f"⚠️ Deepgram connect failed: {e}. Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                continue
+            delays = backoff_delays(cap=max_backoff)
+            print("🟢 Deepgram Connected (async)")
+
+            offset, replay = backbuffer.snapshot()
+            origin = offset / BYTES_PER_SECOND
+            sender = None
+            try:
+                if replay:
+                    print(f"🔁 Replaying {len(replay) / BYTES_PER_SECOND:.1f}s of audio from {origin:.1f}s")
+                    view = memoryview(replay)
+                    for i in range(0, len(view), source.frame_bytes):
+                        chunk = view[i:i + source.frame_bytes]
+                        await ws.send(chunk)
+                        stats.bytes_sent += len(chunk)
+
+                sender = asyncio.ensure_future(_send_audio(ws, source, is_running, backbuffer, gate, stats))
+                async for message in ws:
+                    if not is_running():
+                        break
+                    try:
+                        data = aligner.align(json.loads(message), origin)
+                        if data is not None:
+                            on_result(data)
+                    except Exception as e:
+                        print(f"⚠️ Result handler error: {e}")
+            except websockets.ConnectionClosed:
+                pass
+            finally:
+                finished = sender is not None and sender.done() and not sender.cancelled() \
+                    and sender.exception() is None
+                if sender is not None and not sender.done():
+                    sender.cancel()
+                await ws.close()
+
+            if finished or not is_running():
+                break
+            reconnects += 1
+            stats.reconnects += 1
+            print(f"\n🔌 Deepgram connection lost, reconnecting (#{reconnects})...")
+    finally:
+        await source.stop()
+        print("\nDeepgram Connection closed (async)")
+
+
+class AsyncStreamRunner:
+    """One background event loop shared by every async stream in the process."""
+
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+            self._thread.start()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the shared loop; returns a concurrent Future."""
+        self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+class ResultHandoff:
+    """One worker thread that runs result handlers in arrival order.
+
+    `put()` never blocks, so the event loop can hand over every Deepgram
+    result and go straight back to audio and socket I/O.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="result-handoff", daemon=True)
+                self._thread.start()
+
+    def put(self, handler, *args):
+        self._ensure_thread()
+        self._queue.put((handler, args))
+
+    def drain(self, timeout=5.0):
+        """Wait until everything put so far has been handled."""
+        done = threading.Event()
+        self.put(done.set)
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            handler, args = self._queue.get()
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"⚠️ Result handler error: {e}")
+
+
+# Global instances
+async_runner = AsyncStreamRunner()
+result_handoff = ResultHandoff()
@@ -0,0 +1,117 @@
+"""
+Live Sessions
+=============
+One `Session` per transcribed stream (its own transcript, batch state and
+Deepgram connection) and a thread-safe registry keyed by stream id, so a
+single pake_live backend can follow the Fed, ECB and BoJ feeds at once.
+"""
+
+import datetime
+import threading
+import time
+import uuid
+
+from batch_scheduler import BatchScheduler
+from segment_store import SegmentStore
+from vad import VAD_ENABLED, AudioStats, VadGate
+
+DEFAULT_STREAM_ID = "main"
+
+
+class Session:
+    """State of one live stream."""
+
+    def __init__(self, stream_id, url, title="Waiting...", mode="thread", vad=VAD_ENABLED):
+        self.stream_id = stream_id
+        self.session_id = uuid.uuid4().hex   # tells this run of the stream from earlier ones
+        self.mode = mode
+        self.meta = {
+            "stream_id": stream_id,
+            "url": url,
+            "title": title,
+            "started_at": datetime.datetime.now().isoformat()
+        }
+        self.segments = SegmentStore()
+        self.batch = {
+            "first_index": 0,     # first segment not yet sent in a batch
+            "batch_count": 0,
+            "sent_context": ""
+        }
+        # When to cut the next batch; the lock serialises segment arrival and the batch timer
+        self.scheduler = BatchScheduler()
+        self.batch_lock = threading.RLock()
+
+        # Audio: optional silence gate + read/sent byte counters
+        self.gate = VadGate(enabled=vad)
+        self.audio = AudioStats()
+
+        # Control State
+        self.is_running = False
+        self.journal = None   # TranscriptJournal (crash-safe JSONL of finals)
+        self.ws = None        # ReconnectingTransport (thread mode)
+        self.stream = None    # concurrent Future of the coroutine (async mode)
+
+    @property
+    def data(self):
+        """Transcript in the saved `[FINAL] ...json` shape."""
+        return {"meta": self.meta, "segments": self.segments.to_list()}
+
+    def pending(self):
+        """Number of final segments waiting for the next batch."""
+        return len(self.segments) - self.batch["first_index"]
+
+    def clip_id(self):
+        """Unique clip id, created once per session."""
+        if "clip_id" not in self.meta:
+            self.meta["clip_id"] = f"dg_{self.stream_id}_{int(time.time())}"
+        return self.meta["clip_id"]
+
+    def close_connection(self):
+        if self.ws:
+            self.ws.close()
+            self.ws = None
+        if self.stream:
+            self.stream.cancel()
+            self.stream = None
+
+
+class SessionRegistry:
+    """Running sessions keyed by stream id."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def add(self, session):
+        with self._lock:
+            self._sessions[session.stream_id] = session
+        return session
+
+    def get(self, stream_id):
+        with self._lock:
+            return self._sessions.get(stream_id)
+
+    def pop(self, stream_id):
+        with self._lock:
+            return self._sessions.pop(stream_id, None)
+
+    def all(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def ids(self):
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def is_live(self, session_id):
+        """True while the session with this `session_id` is registered."""
+        with self._lock:
+            return any(s.session_id == session_id for s in self._sessions.values())
+
+    def __contains__(self, stream_id):
+        with self._lock:
+            return stream_id in self._sessions
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
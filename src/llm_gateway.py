@@ -0,0 +1,288 @@
+"""
+LLM Gateway
+===========
+One pooled `httpx.AsyncClient` for every OpenRouter call the GUI makes,
+running on a shared background event loop. Qt workers submit chat requests
+and block their own thread on the result, instead of opening a new client
+(and TLS handshake) per attempt and `time.sleep`-ing through retries.
+
+- Keep-alive connection pool, HTTP/2 when the `h2` package is installed
+- Per-model concurrency limit (LLM_MODEL_CONCURRENCY)
+- Retries with full-jitter exponential backoff on timeouts, connection
+  errors, 429 and 5xx (honours Retry-After)
+- Optional SSE streaming (`on_delta`) so callers can render partial output
+- `system_message()`: stable prompt prefix with a prompt-caching breakpoint
+  for providers that need one
+- `CancelToken`: cancels every request a job has in flight (STOP), which
+  closes its HTTP stream instead of waiting for the answer
+- OPENROUTER_BASE_URL points the gateway at a local mock server for tests
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import threading
+import time
+
+import httpx
+
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1").rstrip("/")
+LLM_MODEL_CONCURRENCY = int(os.getenv("LLM_MODEL_CONCURRENCY", 2))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+LLM_BACKOFF_BASE = 1.0    # seconds, doubled per attempt
+LLM_BACKOFF_MAX = 8.0
+LLM_MAX_CONNECTIONS = 10
+RETRY_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+# Providers that only cache a prompt prefix marked with `cache_control`; OpenAI,
+# DeepSeek, Grok etc. cache long prefixes automatically
+PROMPT_CACHE_BREAKPOINT_MODELS = ("anthropic/", "google/gemini")
+
+
+class LlmError(Exception):
+    """The request failed for good (after retries, or with a non-retryable error)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def system_message(text, model):
+    """System message for a prompt prefix that is identical on every call."""
+    if model and model.startswith(PROMPT_CACHE_BREAKPOINT_MODELS):
+        return {"role": "system", "content": [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]}
+    return {"role": "system", "content": text}
+
+
+def backoff_delay(attempt, base=LLM_BACKOFF_BASE, cap=LLM_BACKOFF_MAX):
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CancelToken:
+    """Cancellation for one job's requests. Futures scheduled with the token
+    are cancelled by `cancel()`; after that, new ones are cancelled at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures = set()
+        self.cancelled = False
+
+    def track(self, future):
+        with self._lock:
+            if not self.cancelled:
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+                return future
+        future.cancel()
+        return future
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            futures, self._futures = list(self._futures), set()
+        for future in futures:
+            future.cancel()   # Cancels the task on the loop (and its HTTP stream)
+
+
+class _Retry(Exception):
+    """Transient failure; `delay` overrides the backoff (Retry-After)."""
+
+    def __init__(self, error, delay=None):
+        super().__init__(str(error))
+        self.error = error
+        self.delay = delay
+
+
+def _retry_after(response):
+    try:
+        return min(float(response.headers.get("retry-after", "")), LLM_BACKOFF_MAX)
+    except ValueError:
+        return None
+
+
+def _check_status(resp):
+    if resp.status_code in RETRY_STATUS:
+        raise _Retry(LlmError(f"HTTP {resp.status_code}", resp.status_code), _retry_after(resp))
+    if resp.status_code >= 400:
+        raise LlmError(f"HTTP {resp.status_code}: {resp.text[:200]}", resp.status_code)
+
+
+def _check_body(result):
+    # OpenRouter reports upstream failures inside a 200 body (or SSE event)
+    err = result.get("error")
+    if not err:
+        return result
+    code = err.get("code") if isinstance(err, dict) else None
+    error = LlmError(f"API Error: {err}", code)
+    if code in RETRY_STATUS:
+        raise _Retry(error)
+    raise error
+
+
+class LlmGateway:
+    """Shared OpenRouter client. `complete()` blocks the calling (worker) thread,
+    `submit()` returns a concurrent Future, `chat()` is the coroutine."""
+
+    def __init__(self, api_key=None, base_url=OPENROUTER_BASE_URL, concurrency=LLM_MODEL_CONCURRENCY,
+                 max_retries=LLM_MAX_RETRIES, backoff_base=LLM_BACKOFF_BASE, http2=HAS_HTTP2, verify=True):
+        self.api_key = api_key if api_key is not None else os.getenv("OPENROUTER_KEY", "")
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.http2 = http2
+        self.verify = verify
+
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._client = None
+        self._semaphores = {}   # model -> asyncio.Semaphore (loop thread only)
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    # --- Loop / client (created lazily on first use) ---
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, name="llm-gateway", daemon=True)
+            self._thread.start()
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                verify=self.verify,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, keepalive_expiry=60),
+            )
+        return self._client
+
+    def _semaphore(self, model):
+        sem = self._semaphores.get(model)
+        if sem is None:
+            sem = self._semaphores[model] = asyncio.Semaphore(self.concurrency)
+        return sem
+
+    # --- Requests ---
+
+    async def chat(self, body, timeout=60, label="LLM", on_delta=None):
+        """POST a chat completion; returns the parsed JSON response.
+
+        With `on_delta` the response is streamed (SSE) and each content delta
+        is passed to `on_delta(text)` on the gateway thread as it arrives; the
+        return value has the same shape as a non-streamed response.
+        """
+        client = self._get_client()
+        async with self._semaphore(body.get("model")):
+            for attempt in range(self.max_retries + 1):
+                self.requests += 1
+                delivered = []   # deltas already handed to on_delta
+                try:
+                    if on_delta is None:
+                        return await self._post(client, body, timeout)
+                    return await self._stream(client, body, timeout, label, on_delta, delivered)
+                except _Retry as e:
+                    error, delay = e.error, e.delay
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    error, delay = LlmError(f"{type(e).__name__}: {e}"), None
+                except LlmError:
+                    self.failures += 1
+                    raise
+
+                if attempt == self.max_retries or delivered:
+                    # (A retry after partial output would replay it to on_delta)
+                    self.failures += 1
+                    raise error
+                if delay is None:
+                    delay = backoff_delay(attempt, self.backoff_base)
+                self.retries += 1
+                print(f"⚠️ [{label}] {error} (attempt {attempt + 1}) - retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _post(self, client, body, timeout):
+        resp = await client.post(self.url, json=body, timeout=timeout)
+        _check_status(resp)
+        return _check_body(resp.json())
+
+    async def _stream(self, client, body, timeout, label, on_delta, delivered):
+        started = time.perf_counter()
+        first = None
+        parts, usage, model = [], {}, None
+        body = {**body, "stream": True, "usage": {"include": True}}
+        async with client.stream("POST", self.url, json=body, timeout=timeout) as resp:
+            if resp.status_code >= 400:
+                await resp.aread()
+                _check_status(resp)
+            async for line in resp.aiter_lines():
+                # SSE: "data: {...}" events, blank separators, ": ..." keep-alive comments
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    continue   # Read on to the end so the connection goes back to the pool
+                chunk = _check_body(json.loads(data))
+                usage = chunk.get("usage") or usage
+                model = chunk.get("model") or model
+                for choice in chunk.get("choices") or ():
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        if first is None:
+                            first = time.perf_counter()
+                        parts.append(text)
+                        delivered.append(len(text))
+                        on_delta(text)
+
+        total = time.perf_counter() - started
+        ttft = (first or time.perf_counter()) - started
+        print(f"⏱️ [{label}] streamed: first token {ttft * 1000:.0f} ms, complete {total * 1000:.0f} ms")
+        return {
+            "model": model,
+            "choices": [{"message": {"role": "assistant", "content": "".join(parts)}}],
+            "usage": usage,
+            "cost": usage.get("cost", 0),
+            "timing": {"ttft_ms": round(ttft * 1000), "total_ms": round(total * 1000)}
+        }
+
+    def submit(self, body, timeout=60, label="LLM", on_delta=None, cancel=None):
+        """Schedule `chat()` on the shared loop; returns a concurrent Future."""
+        return self.schedule(self.chat(body, timeout, label, on_delta), cancel)
+
+    def schedule(self, coro, cancel=None):
+        """Schedule any coroutine on the shared loop (e.g. a router race)."""
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return cancel.track(future) if cancel is not None else future
+
+    def run(self, coro, cancel=None):
+        """Blocking `schedule()`; raises concurrent.futures.CancelledError if `cancel` fires."""
+        return self.schedule(coro, cancel).result()
+
+    def complete(self, body, timeout=60, label="LLM", on_delta=None, cancel=None):
+        """Blocking `chat()` for QThread / QRunnable workers."""
+        return self.submit(body, timeout, label, on_delta, cancel).result()
+
+    def stats(self):
+        return {"requests": self.requests, "retries": self.retries, "failures": self.failures}
+
+    def close(self, timeout=5.0):
+        if self.loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self.loop).result(timeout)
+            self._client = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self.loop = None
+
+
+# Global instance
+llm_gateway = LlmGateway()
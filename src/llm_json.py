@@ -0,0 +1,226 @@
+"""
+LLM JSON
+========
+Tolerant parsing of JSON answers from chat models, so a malformed answer is
+repaired locally instead of paying for another call.
+
+    parsed = parse_completion(result, ANALYSIS_SCHEMA, label="Analysis")
+
+- Extraction: ```json fences, a preamble or trailing chatter around the
+  object are ignored; a list holding the object is unwrapped
+- Repair: trailing commas, and answers cut off by `max_tokens` (the object
+  is closed after its last complete field)
+- Schema: `Field`s per key; enums are matched case-insensitively inside
+  longer text ("Hawkish (because...)" -> "HAWKISH", "risk off" ->
+  "RISK-OFF"), strings/lists are coerced, missing optional fields get
+  their default. A missing required field or an unknown enum value on a
+  required field raises `LlmJsonError`.
+"""
+
+import json
+import re
+import threading
+
+_WHITESPACE = " \t\r\n"
+_SCALAR = re.compile(r"[^,:\]}\s]+")
+_FENCE = re.compile(r"^```[\w-]*\s*$", re.MULTILINE)
+
+_lock = threading.Lock()
+_stats = {"clean": 0, "repaired": 0, "failed": 0}
+
+
+class LlmJsonError(ValueError):
+    """The answer holds no usable JSON object (or misses required fields)."""
+
+
+class Field:
+    """Expected type of one answer field."""
+
+    __slots__ = ("kind", "required", "choices", "default")
+
+    def __init__(self, kind=str, required=False, choices=None, default=None):
+        self.kind = kind
+        self.required = required
+        self.choices = choices   # enum values (upper case)
+        self.default = default
+
+
+def _string_end(text, i):
+    """Index just past the string starting at text[i] (None if it never closes)."""
+    escape = False
+    for j in range(i + 1, len(text)):
+        c = text[j]
+        if escape:
+            escape = False
+        elif c == "\\":
+            escape = True
+        elif c == '"':
+            return j + 1
+    return None
+
+
+def repair_json(text):
+    """
+    The first JSON object/array in `text`, with trailing commas dropped and a
+    truncated tail cut back to the last complete member and closed.
+    Returns (json_text, notes) or (None, notes) when nothing is salvageable.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None, ["no object"]
+    notes = ["extracted"] if text[:min(starts)].strip() else []
+    out = []
+    stack = []    # open containers: [closer, state]; state: key|colon|value|after
+    safe = None   # (pieces in `out`, closers) after the last complete member
+
+    def completed():
+        nonlocal safe
+        if stack:
+            stack[-1][1] = "after"
+        safe = (len(out), "".join(s[0] for s in reversed(stack)))
+
+    i, n = min(starts), len(text)
+    while i < n:
+        c = text[i]
+        if c in _WHITESPACE:
+            out.append(c)
+            i += 1
+        elif c == '"':
+            end = _string_end(text, i)
+            if end is None:
+                break
+            out.append(text[i:end])
+            i = end
+            if stack and stack[-1][0] == "}" and stack[-1][1] == "key":
+                stack[-1][1] = "colon"
+            else:
+                completed()
+        elif c in "{[":
+            stack.append(["}", "key"] if c == "{" else ["]", "value"])
+            out.append(c)
+            i += 1
+            safe = (len(out), "".join(s[0] for s in reversed(stack)))
+        elif c in "}]":
+            while out and out[-1] in _WHITESPACE:
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+                if "trailing comma" not in notes:
+                    notes.append("trailing comma")
+            if not stack:
+                break
+            stack.pop()
+            out.append(c)
+            i += 1
+            if not stack:
+                if text[i:].strip() and "extracted" not in notes:
+                    notes.append("extracted")
+                return "".join(out), notes
+            completed()
+        elif c in ",:":
+            if stack and c == "," and stack[-1][1] == "after":
+                stack[-1][1] = "key" if stack[-1][0] == "}" else "value"
+            elif stack and c == ":" and stack[-1][1] == "colon":
+                stack[-1][1] = "value"
+            out.append(c)
+            i += 1
+        else:
+            m = _SCALAR.match(text, i)
+            if m.end() == n:
+                break   # a number/literal may be cut off ("tru", "0.")
+            out.append(m.group(0))
+            i = m.end()
+            completed()
+
+    notes.append("truncated")
+    if safe is None:
+        return None, notes
+    pieces, closers = safe
+    return "".join(out[:pieces]) + closers, notes
+
+
+def loads(text):
+    """Parse a model answer: (value, repair notes). Raises LlmJsonError."""
+    text = (text or "").strip()
+    if not text:
+        raise LlmJsonError("Empty content")
+    try:
+        return json.loads(text, strict=False), []
+    except ValueError:
+        pass
+    fenced = _FENCE.sub("", text).strip()
+    repaired, notes = repair_json(fenced)
+    if fenced != text and "extracted" not in notes:
+        notes.insert(0, "fence")
+    if repaired is None:
+        raise LlmJsonError(f"No JSON object in answer ({', '.join(notes)}): {text[:80]!r}")
+    try:
+        return json.loads(repaired, strict=False), notes
+    except ValueError as e:
+        raise LlmJsonError(f"Unrepairable JSON ({e}): {text[:80]!r}") from None
+
+
+def _coerce_enum(value, choices):
+    if not isinstance(value, str):
+        return None
+    text = re.sub(r"[\s_]+", "-", value.strip().upper())
+    found = [(m.start(), choice) for choice in choices
+             if (m := re.search(rf"(?<![A-Z]){re.escape(choice)}(?![A-Z])", text))]
+    return min(found)[1] if found else None
+
+
+def validate(obj, schema):
+    """Coerce `obj` to `schema` in place; raises LlmJsonError on a missing required field."""
+    for key, field in schema.items():
+        value = obj.get(key)
+        if field.choices:
+            value = _coerce_enum(value, field.choices)
+        elif value is not None and field.kind is str and not isinstance(value, str):
+            value = ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+        elif value is not None and field.kind is list and not isinstance(value, list):
+            value = [value]
+        if value in (None, "", []):
+            if field.required:
+                raise LlmJsonError(f"Missing or invalid '{key}': {obj.get(key)!r}")
+            if field.default is None:
+                obj.pop(key, None)
+                continue
+            value = field.default
+        obj[key] = value
+    return obj
+
+
+def parse_completion(result, schema=None, label="LLM"):
+    """`parse_object()` on the answer text of a chat completion response."""
+    choices = result.get("choices")
+    if not choices:
+        raise LlmJsonError(f"No 'choices' in response: {str(result)[:200]}")
+    return parse_object((choices[0].get("message") or {}).get("content"), schema, label)
+
+
+def parse_object(text, schema=None, label="LLM"):
+    """JSON object from a model answer, repaired and validated against `schema`."""
+    try:
+        value, notes = loads(text)
+        if isinstance(value, list):
+            # Some models wrap the object in a list
+            value = next((item for item in value if isinstance(item, dict)), None)
+            notes.append("unwrapped list")
+        if not isinstance(value, dict):
+            raise LlmJsonError(f"Answer is not a JSON object: {type(value).__name__}")
+        if schema:
+            validate(value, schema)
+    except LlmJsonError:
+        with _lock:
+            _stats["failed"] += 1
+        raise
+    with _lock:
+        _stats["repaired" if notes else "clean"] += 1
+    if notes:
+        print(f"🩹 [{label}] Repaired JSON locally ({', '.join(notes)}) - no retry needed")
+    return value
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,229 @@
+"""
+LLM Router
+==========
+Latency-aware routing on top of the LLM gateway. Each route (model +
+pinned provider) keeps a rolling window of latencies and errors; a request
+goes to the first healthy route and, if it has not answered by that
+route's p90 latency, a hedged copy goes to the next route. The first
+answer that passes `validate` wins and the loser is cancelled.
+
+- Routes with an error rate above ROUTER_MAX_ERROR_RATE are tried last
+- A route that fails (HTTP error, invalid JSON) falls through to the next
+  one immediately instead of waiting for the hedge timer
+- Until a route has ROUTER_MIN_SAMPLES answers the hedge waits
+  ROUTER_HEDGE_DEFAULT seconds; the p90 is clamped to
+  [ROUTER_HEDGE_MIN, ROUTER_HEDGE_MAX]
+- A cancelled loser is recorded with its elapsed time (a lower bound), so
+  a slow route's p90 does not drift down just because it keeps losing
+- A failure only counts toward the error rate: its elapsed time stays out
+  of the p90 window (a fast 400 would pull the hedge earlier, a timeout
+  would push it later)
+- Cancelling the race (a gateway CancelToken) cancels every route still
+  running, hedged copies included
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+from llm_gateway import LlmError, llm_gateway
+
+ROUTER_WINDOW = int(os.getenv("ROUTER_WINDOW", 50))
+ROUTER_MIN_SAMPLES = int(os.getenv("ROUTER_MIN_SAMPLES", 5))
+ROUTER_HEDGE_DEFAULT = float(os.getenv("ROUTER_HEDGE_DEFAULT", 12.0))   # seconds
+ROUTER_HEDGE_MIN = float(os.getenv("ROUTER_HEDGE_MIN", 1.0))
+ROUTER_HEDGE_MAX = float(os.getenv("ROUTER_HEDGE_MAX", 30.0))
+ROUTER_MAX_ERROR_RATE = float(os.getenv("ROUTER_MAX_ERROR_RATE", 0.5))
+
+
+class Route(namedtuple("Route", "model provider")):
+    """A model, optionally pinned to one OpenRouter provider."""
+
+    def __new__(cls, model, provider=None):
+        return super().__new__(cls, model, provider)
+
+    @property
+    def key(self):
+        return f"{self.model}@{self.provider}" if self.provider else self.model
+
+
+Routed = namedtuple("Routed", "route result parsed")
+
+
+class RouteStats:
+    """Rolling latencies (seconds) and outcomes for one route."""
+
+    def __init__(self, window=ROUTER_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)   # True = answered, False = failed
+
+    def record(self, latency, ok=True):
+        if ok is not False:
+            self.latencies.append(latency)   # how long an answer takes; failures say nothing about it
+        if ok is not None:
+            self.outcomes.append(ok)
+
+    def percentile(self, q):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+
+class LlmRouter:
+    """Hedged requests across routes. `race()` runs on the gateway loop,
+    `complete()` blocks the calling (worker) thread."""
+
+    def __init__(self, gateway=llm_gateway, window=ROUTER_WINDOW, min_samples=ROUTER_MIN_SAMPLES,
+                 hedge_default=ROUTER_HEDGE_DEFAULT, hedge_min=ROUTER_HEDGE_MIN, hedge_max=ROUTER_HEDGE_MAX,
+                 max_error_rate=ROUTER_MAX_ERROR_RATE, clock=time.perf_counter):
+        self.gateway = gateway
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge_default = hedge_default
+        self.hedge_min = hedge_min
+        self.hedge_max = hedge_max
+        self.max_error_rate = max_error_rate
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.routes = {}   # route key -> RouteStats
+
+        self.hedges = 0      # backup requests fired by the timer
+        self.hedge_wins = 0  # answers that came from a later route
+        self.fallbacks = 0   # later routes started because an earlier one failed
+        self.cancelled = 0   # losers cancelled
+
+    # --- Stats ---
+
+    def _stats(self, route):
+        stats = self.routes.get(route.key)
+        if stats is None:
+            stats = self.routes[route.key] = RouteStats(self.window)
+        return stats
+
+    def record(self, route, latency, ok=True):
+        """Record one request (`ok=False`: failed, counted as an error only;
+        `ok=None`: cancelled, latency is a lower bound)."""
+        with self.lock:
+            self._stats(route).record(latency, ok)
+
+    def hedge_delay(self, route):
+        """Seconds to wait on `route` before firing the next one."""
+        with self.lock:
+            stats = self._stats(route)
+            if len(stats.latencies) < self.min_samples:
+                return self.hedge_default
+            return min(self.hedge_max, max(self.hedge_min, stats.percentile(0.9)))
+
+    def order(self, routes):
+        """Routes in preference order: unhealthy ones (error rate too high) last."""
+        with self.lock:
+            return sorted(routes, key=lambda r: self._stats(r).error_rate() > self.max_error_rate)
+
+    # --- Requests ---
+
+    async def race(self, routes, make_body, validate=None, timeout=60, label="LLM", on_delta=None):
+        """
+        Send `make_body(route)` to the first route, hedging to the next ones.
+        Returns `Routed(route, result, parsed)` for the first result that
+        `validate(result)` accepts (its return value is `parsed`). Raises the
+        last error when every route failed.
+
+        With `on_delta`, only the route that streams first is forwarded, so
+        two racing answers never interleave in the UI.
+        """
+        routes = self.order(routes)
+        pending = {}   # task -> (route, started)
+        streaming = []
+        errors = []
+        launched = 0
+
+        def forward(index):
+            def on_text(text):
+                if not streaming:
+                    streaming.append(index)
+                if streaming[0] == index:
+                    on_delta(text)
+            return on_text
+
+        def launch():
+            nonlocal launched
+            route = routes[launched]
+            body = make_body(route)
+            if route.provider:
+                body = {**body, "provider": {"order": [route.provider]}}
+            task = asyncio.ensure_future(self.gateway.chat(
+                {**body, "model": route.model}, timeout, f"{label} {route.key}",
+                forward(launched) if on_delta else None))
+            pending[task] = (route, self.clock())
+            launched += 1
+
+        launch()
+        try:
+            while pending:
+                wait = None
+                if launched < len(routes):
+                    route, started = pending[list(pending)[-1]]
+                    wait = max(0.0, started + self.hedge_delay(route) - self.clock())
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    print(f"🔀 [{label}] {route.key} slower than {self.hedge_delay(route):.1f}s - "
+                          f"hedging to {routes[launched].key}")
+                    launch()
+                    continue
+
+                for task in done:
+                    route, started = pending.pop(task)
+                    elapsed = self.clock() - started
+                    try:
+                        result = task.result()
+                        parsed = validate(result) if validate else result
+                    except Exception as e:   # LlmError or an answer `validate` rejected
+                        self.record(route, elapsed, False)
+                        errors.append(e)
+                        print(f"⚠️ [{label}] {route.key} failed after {elapsed:.1f}s: {e}")
+                        continue
+                    self.record(route, elapsed, True)
+                    if route != routes[0]:
+                        self.hedge_wins += 1
+                    return Routed(route, result, parsed)
+
+                if not pending and launched < len(routes):
+                    self.fallbacks += 1
+                    launch()
+            raise errors[-1] if errors else LlmError("No route available")
+        finally:
+            for task, (route, started) in pending.items():
+                task.cancel()
+                self.record(route, self.clock() - started, None)
+                self.cancelled += 1
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def complete(self, routes, make_body, validate=None, timeout=60, label="LLM", on_delta=None, cancel=None):
+        """Blocking `race()` for QThread / QRunnable workers."""
+        return self.gateway.run(self.race(routes, make_body, validate, timeout, label, on_delta), cancel)
+
+    def stats(self):
+        with self.lock:
+            routes = {
+                key: {
+                    "samples": len(s.latencies),
+                    "p50_ms": round(s.percentile(0.5) * 1000) if s.latencies else None,
+                    "p90_ms": round(s.percentile(0.9) * 1000) if s.latencies else None,
+                    "error_rate": round(s.error_rate(), 3)
+                }
+                for key, s in self.routes.items()
+            }
+        return {"hedges": self.hedges, "hedge_wins": self.hedge_wins, "fallbacks": self.fallbacks,
+                "cancelled": self.cancelled, "routes": routes}
+
+
+# Global instance
+llm_router = LlmRouter()
@@ -0,0 +1,119 @@
+"""
+LLM Stream Parsing
+==================
+Incremental parser for a JSON object that arrives in streamed chunks: each
+top-level field is reported as soon as its value is complete, so the GUI can
+show `sentiment` and `summary` long before the closing brace.
+
+    fields = JsonFieldStream()
+    for delta in stream:
+        for key, value in fields.feed(delta).items():
+            ...
+
+Text before the first "{" (a ```json fence, a preamble) is skipped. The scan
+is a single pass over each new chunk; nested objects/arrays are reported as
+one field when they close.
+"""
+
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonFieldStream:
+    """Top-level fields of a streamed JSON object, in completion order."""
+
+    def __init__(self):
+        self.fields = {}
+        self.done = False
+        self._text = []       # chunks from the object's "{" on
+        self._offset = 0      # absolute index of the next character to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "start"   # start | key | colon | value | scalar | after
+        self._key = None
+        self._start = None      # absolute index where the current key/value began
+
+    def feed(self, chunk):
+        """Consume `chunk`; returns the fields completed by it ({} if none)."""
+        completed = {}
+        if self.done or not chunk:
+            return completed
+        if self._state == "start":
+            brace = chunk.find("{")
+            if brace < 0:
+                return completed
+            chunk = chunk[brace:]
+        self._text.append(chunk)
+        base = self._offset
+        self._offset += len(chunk)
+
+        for i, c in enumerate(chunk, base):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._state == "key":
+                            self._key = self._decode(self._start, i + 1)
+                            self._state = "colon"
+                        elif self._state == "value":
+                            self._emit(completed, i + 1)
+                continue
+
+            if self._state == "start":
+                if c == "{":
+                    self._depth = 1
+                    self._state = "key"
+                continue
+
+            if self._state == "scalar" and (c in ",}" or c in _WHITESPACE):
+                self._emit(completed, i)   # number / true / false / null ended
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state in ("key", "value"):
+                    self._start = i
+            elif c in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._emit(completed, i + 1)
+                elif self._depth == 0:
+                    self.done = True
+                    break
+            elif self._depth == 1:
+                if c == ":" and self._state == "colon":
+                    self._state = "value"
+                elif c == "," and self._state == "after":
+                    self._state = "key"
+                elif self._state == "value" and c not in _WHITESPACE:
+                    self._start = i
+                    self._state = "scalar"
+        return completed
+
+    def _slice(self, start, end):
+        if len(self._text) > 1:
+            self._text = ["".join(self._text)]
+        return self._text[0][start:end]
+
+    def _decode(self, start, end):
+        try:
+            return json.loads(self._slice(start, end))
+        except ValueError:
+            return None
+
+    def _emit(self, completed, end):
+        value = self._decode(self._start, end)
+        if self._key is not None and (value is not None or self._slice(self._start, end).strip() == "null"):
+            self.fields[self._key] = value
+            completed[self._key] = value
+        self._key = None
+        self._state = "after"
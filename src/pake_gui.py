@@ -11,25 +11,38 @@ import datetime
 import socket
 import threading
 import time
-import httpx
+from collections import Counter, namedtuple
 from dotenv import load_dotenv
+load_dotenv()  # Before the local imports: they read their settings at import time
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QLabel, QTextEdit, QSplitter, 
                                QDockWidget, QProgressBar, QFrame, QToolBar, 
                                QStatusBar, QPushButton, QCheckBox, QScrollArea, 
-                               QButtonGroup)
+                               QButtonGroup, QComboBox)
 from PySide6.QtCore import Qt, QThread, Signal, QObject, QTimer, QSize
-from PySide6.QtGui import QTextCursor, QFont, QColor, QAction, QIcon
-from PySide6.QtNetwork import QTcpServer, QHostAddress
+from PySide6.QtGui import QTextCursor, QTextFrameFormat, QFont, QColor, QAction, QIcon
+from PySide6.QtNetwork import QTcpServer, QHostAddress, QLocalServer
 
-from economic_detector import ForexFactoryScraper
-from cost_logger import log_api_cost
+from economic_detector import ff_scraper
+from cost_logger import cached_tokens, log_api_cost, log_cache_event
 from config_manager import config
+import ipc_transport
+from ipc_protocol import IpcReader, choose_codec, encode_message, hello_ack
+from ipc_transport import ShmRing
+from gui.job_pool import JobPool
 from gui.settings_dialog import SettingsDialog
 from gui.telegram_dashboard import TelegramDashboard
+from gui.transcript_view import Row, TranscriptView
+from gui.update_coalescer import UpdateCoalescer
 from telegram_manager import tg_manager
+from llm_gateway import CancelToken, LlmError, llm_gateway, system_message
+from llm_json import Field, parse_completion
+from llm_router import Route, llm_router
+from llm_stream import JsonFieldStream
+from response_cache import normalize, response_cache
+from sentiment_prefilter import prefilter
+from translation_memory import parse_numbered, translation_memory
 
-load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_KEY", "")
 
 # AI Configuration (Saved in .env)
@@ -42,6 +55,11 @@ TOKEN_LIMIT_TRANSLATE = int(os.getenv("TOKEN_LIMIT_TRANSLATE", 1000))
 TOKEN_LIMIT_ANALYSIS = int(os.getenv("TOKEN_LIMIT_ANALYSIS", 2000))
 TOKEN_LIMIT_SUMMARY = int(os.getenv("TOKEN_LIMIT_SUMMARY", 4096))
 
+# Response cache keys include these: bump when a prompt changes so old answers are not reused
+PROMPT_VERSION_TRANSLATE = "1"
+PROMPT_VERSION_ANALYSIS = "2"
+ANALYSIS_PROVIDER = "google-vertex/global"   # OpenRouter provider pinned for model_analysis
+
 DECISION_RULES = """
 ### 🚨 กฎการตัดสินใจ (ต้องปฏิบัติตาม 100%)
 
@@ -72,6 +90,56 @@ DECISION_RULES = """
 - ถ้าเนื้อหาเป็นเรื่องทรัมป์/รัฐบาล ให้มองเรื่อง Trade Policy & Fiscal Policy
 """
 
+# Stable prefix of every analysis prompt (rules + answer format), sent as the
+# system message so providers can serve it from their prompt cache. Anything
+# that changes per batch belongs in the user message.
+ANALYSIS_SYSTEM_PROMPT = f"""คุณคือนักวิเคราะห์การเงินมืออาชีพ วิเคราะห์แบบเรียลไทม์โดยใช้กฎต่อไปนี้:
+
+{DECISION_RULES}
+
+ตอบเป็น JSON เท่านั้น (ภาษาไทย):
+{{
+    "speaker_identified": "ประธานเฟด/นักข่าว",
+    "summary": "สรุป 1 ประโยค + ระบุบทบาทผู้พูด",
+    "prediction": "คาดการณ์ 1 ประโยค",
+    "sentiment": "HAWKISH|DOVISH|NEUTRAL|RISK-OFF|RISK-ON (เลือกตามบริบท)",
+    "signal_strength": "HIGH|MEDIUM|LOW",
+    "consistency_note": "ระบุบริบท (Fed/Geopolitics) และเหตุผล",
+    "gold": "ทิศทาง + เหตุผล",
+    "forex": "ทิศทาง + เหตุผล",
+    "stock": "ทิศทาง + เหตุผล"
+}}"""
+
+# Expected answer fields (llm_json): enums are normalized ("Hawkish (...)" -> HAWKISH),
+# a missing required field means the answer is unusable and is asked again
+SENTIMENTS = ("HAWKISH", "DOVISH", "NEUTRAL", "RISK-OFF", "RISK-ON")
+ANALYSIS_SCHEMA = {
+    "summary": Field(required=True),
+    "sentiment": Field(choices=SENTIMENTS, required=True),
+    "signal_strength": Field(choices=("HIGH", "MEDIUM", "LOW"), default="MEDIUM"),
+    "speaker_identified": Field(),
+    "prediction": Field(),
+    "consistency_note": Field(),
+    "gold": Field(),
+    "forex": Field(),
+    "stock": Field()
+}
+SUMMARY_SCHEMA = {
+    "main_topic": Field(required=True),
+    "key_points": Field(list),
+    "overall_sentiment": Field(choices=SENTIMENTS, default="NEUTRAL"),
+    "market_implication": Field(),
+    "confidence_score": Field()
+}
+FINAL_REPORT_SCHEMA = {
+    "topic": Field(required=True),
+    "sentiment": Field(choices=SENTIMENTS, default="NEUTRAL"),
+    "key_points": Field(list),
+    "prediction": Field(),
+    "gold": Field(),
+    "forex": Field()
+}
+
 # ============================================================================
 # STYLES
 # ============================================================================
@@ -88,6 +156,10 @@ QTextEdit {
     font-size: 13px;
     line-height: 1.6;
 }
+TranscriptView {
+    background-color: #1a1a1f; 
+    border: 1px solid #2a2a3a;
+}
 QLineEdit {
     background-color: #1a1a1f; 
     color: #ffffff;
@@ -192,16 +264,52 @@ class GUISignals(QObject):
     new_message = Signal(dict)
 
 
+def cached_response(kind, model, version, text, batch_num, near=False):
+    """Response cache lookup in front of an OpenRouter call (None on a miss or when disabled)"""
+    if not config.get("enable_response_cache", True):
+        return None
+    result, tier = response_cache.get(kind, model, version, text, near=near)
+    saved = result.get("cost", 0) if result else 0
+    log_cache_event(kind, model, tier or "miss", saved, batch_num)
+    if result is not None:
+        print(f"♻️ [{kind}] Cache hit ({tier}) - saved ${saved:.6f} | {response_cache.stats()}")
+    return result
+
+
+def cache_response(kind, model, version, text, result):
+    if config.get("enable_response_cache", True) and "cache" not in result:
+        try:
+            response_cache.put(kind, model, version, text, result)
+        except Exception as e:
+            print(f"⚠️ Response cache write failed: {e}")
+
+
+def analysis_routes(model):
+    """Analysis model pinned to its provider, then the hedge / fallback model (if configured)"""
+    routes = [Route(model, ANALYSIS_PROVIDER)]
+    fallback = config.get("model_analysis_fallback", "")
+    if fallback:
+        routes.append(Route(fallback))
+    return routes
+
+
+def parse_analysis(result):
+    """Analysis JSON (dict) from a chat completion, repaired locally; raises LlmJsonError if unusable"""
+    return parse_completion(result, ANALYSIS_SCHEMA, label="Analysis")
+
+
 # ============================================================================
 # TRANSLATION WORKER (Separate API)
 # ============================================================================
 class TranslateWorker(QObject):
     finished = Signal(int, list)  # batch_num, list of translated segments
+    segment_cost = 0.0            # running cost of one freshly translated segment (for "saved" estimates)
     
     def __init__(self, segments: list, batch_num: int):
         super().__init__()
         self.segments = segments  # List of {"speaker": ..., "text": ..., "start": ...}
         self.batch_num = batch_num
+        self.cancel = CancelToken()  # fired by JobPool.cancel_all() on STOP
         
     def run(self):
         print(f"🚀 TranslateWorker.run() started for Batch #{self.batch_num}")
@@ -210,16 +318,31 @@ class TranslateWorker(QObject):
             self.finished.emit(self.batch_num, [])
             return
         
-        # Format segments for translation with speaker labels
-        lines = []
-        for i, seg in enumerate(self.segments):
-            speaker = seg.get("speaker", "?")
-            text = seg.get("text", "")
-            lines.append(f"{i+1}. [{speaker}]: {text}")
-        
-        formatted_text = "\n".join(lines)
-        
-        prompt = f"""แปลบทสนทนาต่อไปนี้เป็นภาษาไทย เก็บรูปแบบเดิม (หมายเลข และ [Speaker X]) ไว้ทุกบรรทัด:
+        # 🧠 Translation memory: only segments never translated before go to the model
+        model = config.get("model_translate")
+        texts = [seg.get("text", "") for seg in self.segments]
+        use_memory = config.get("enable_response_cache", True)
+        translations = (translation_memory.lookup(model, PROMPT_VERSION_TRANSLATE, texts) if use_memory
+                        else [None] * len(texts))
+
+        # Unseen texts, each sent once even if repeated within the batch
+        pending = {}  # normalized text -> indexes of the segments that need it
+        for i, text in enumerate(texts):
+            if translations[i] is None and text.strip():
+                pending.setdefault(normalize(text), []).append(i)
+        reused = sum(t is not None for t in translations)
+        raw_reply = None
+
+        if pending:
+            # Format segments for translation with speaker labels
+            lines = []
+            for n, indexes in enumerate(pending.values()):
+                seg = self.segments[indexes[0]]
+                lines.append(f"{n+1}. [{seg.get('speaker', '?')}]: {seg.get('text', '')}")
+            
+            formatted_text = "\n".join(lines)
+            
+            prompt = f"""แปลบทสนทนาต่อไปนี้เป็นภาษาไทย เก็บรูปแบบเดิม (หมายเลข และ [Speaker X]) ไว้ทุกบรรทัด:
 
 {formatted_text}
 
@@ -228,79 +351,84 @@ class TranslateWorker(QObject):
 2. [Speaker Y]: คำแปล
 ..."""
 
-        max_retries = 2
-        for attempt in range(max_retries + 1):
             try:
-                print(f"📡 Calling Translation API (Attempt {attempt+1})...")
-                with httpx.Client(timeout=60) as client:
-                    resp = client.post(
-                        "https://openrouter.ai/api/v1/chat/completions",
-                        headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
-                        json={
-                            "model": config.get("model_translate"),
-                            "messages": [{"role": "user", "content": prompt}],
-                            "max_tokens": TOKEN_LIMIT_TRANSLATE
-                        }
-                    )
-                    result = resp.json()
-                    
-                    # 📊 Log Token Usage
-                    usage = result.get("usage", {})
-                    p_tok = usage.get("prompt_tokens", 0)
-                    c_tok = usage.get("completion_tokens", 0)
-                    t_tok = usage.get("total_tokens", 0)
-                    cost = result.get("cost", 0)
-                    print(f"💰 [Translate] Usage: P={p_tok}, C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
-                    log_api_cost("Translate", config.get("model_translate"), usage, cost, self.batch_num)
+                print(f"📡 Calling Translation API ({len(pending)} new, {reused} from memory)...")
+                result = llm_gateway.complete({
+                    "model": model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": TOKEN_LIMIT_TRANSLATE
+                }, timeout=60, label="Translate", cancel=self.cancel)
+                
+                # 📊 Log Token Usage
+                usage = result.get("usage", {})
+                p_tok = usage.get("prompt_tokens", 0)
+                c_tok = usage.get("completion_tokens", 0)
+                t_tok = usage.get("total_tokens", 0)
+                cost = result.get("cost", 0)
+                print(f"💰 [Translate] Usage: P={p_tok}, C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
+                log_api_cost("Translate", model, usage, cost, self.batch_num)
 
-                    translated_text = result["choices"][0]["message"]["content"]
-                    
-                    # Parse translated lines back into segments
-                    translated_segments = []
-                    for line in translated_text.strip().split("\n"):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        # Try to parse "1. [Speaker X]: translated text"
-                        if "]:" in line:
-                            parts = line.split("]:", 1)
-                            if len(parts) == 2:
-                                speaker_part = parts[0]
-                                text_part = parts[1].strip()
-                                # Extract speaker name
-                                if "[" in speaker_part:
-                                    speaker = speaker_part.split("[", 1)[1]
-                                else:
-                                    speaker = "?"
-                                translated_segments.append({
-                                    "speaker": speaker,
-                                    "text": text_part
-                                })
-
-                    # If parsing failed, fall back to original segments with translated text
-                    if len(translated_segments) == 0:
-                        translated_segments.append({
-                            "speaker": "Translation",
-                            "text": translated_text
-                        })
-                    
-                    print(f"✅ Translation #{self.batch_num} OK ({len(translated_segments)} segments)")
-                    self.finished.emit(self.batch_num, translated_segments)
-                    return # Success
-                    
+                translated_text = result["choices"][0]["message"]["content"]
+                TranslateWorker.segment_cost = 0.8 * TranslateWorker.segment_cost + 0.2 * float(cost or 0) / len(pending)
             except Exception as e:
-                if attempt == max_retries:
-                    print(f"Translate Error (Final): {e}")
+                print(f"Translate Error: {e}")
+                if not reused:
                     self.finished.emit(self.batch_num, [])
-                else:
-                    print(f"⚠️ Translate Error (Attempt {attempt+1}): {e} - Retrying...")
-                    time.sleep(2 ** attempt)
+                    return
+                translated_text = ""
+
+            # Map the numbered reply back onto the segments (tolerates dropped/merged lines)
+            fresh = parse_numbered(translated_text, len(pending))
+            memorize = []
+            for n, (indexes, text) in enumerate(zip(pending.values(), fresh)):
+                if text is None:
+                    continue
+                for i in indexes:
+                    translations[i] = text
+                # A line followed by a dropped one may hold both: show it, don't memorize it
+                if n + 1 == len(fresh) or fresh[n + 1] is not None:
+                    memorize.append((texts[indexes[0]], text))
+            if use_memory and memorize:
+                try:
+                    translation_memory.store(model, PROMPT_VERSION_TRANSLATE, memorize)
+                except Exception as e:
+                    print(f"⚠️ Translation memory write failed: {e}")
+
+            missing = sum(t is None for t in fresh)
+            if missing == len(fresh) and translated_text.strip():
+                raw_reply = translated_text.strip()   # Unparseable: show the reply as one block, as before
+            elif missing:
+                print(f"⚠️ Translation #{self.batch_num}: {missing} line(s) missing from the reply - showing source text")
+        elif reused:
+            print(f"♻️ [Translate] All {reused} segment(s) from translation memory | {translation_memory.stats()}")
+        if use_memory and (pending or reused):
+            log_cache_event("Translate", model, "miss" if not reused else "partial" if pending else "exact",
+                            TranslateWorker.segment_cost * reused, self.batch_num)
+
+        # Merge cached and fresh translations back in the original order
+        translated_segments = []
+        for seg, text in zip(self.segments, translations):
+            if not seg.get("text", "").strip():
+                continue
+            if text is None and raw_reply is not None:
+                if raw_reply:
+                    translated_segments.append({"speaker": "Translation", "text": raw_reply})
+                    raw_reply = ""
+                continue
+            translated_segments.append({
+                "speaker": seg.get("speaker", "?"),
+                "text": text if text is not None else seg.get("text", "")
+            })
+
+        print(f"✅ Translation #{self.batch_num} OK ({len(translated_segments)} segments, {reused} from memory)")
+        self.finished.emit(self.batch_num, translated_segments)
 
 # ============================================================================
 # AI ANALYSIS WORKER (Separate API)
 # ============================================================================
 class AnalysisWorker(QObject):
     finished = Signal(dict)
+    partial = Signal(dict)  # streaming: fields completed so far (+ batch_num)
     
     def __init__(self, text: str, batch_num: int, previous_context: str = "", memory: dict = None):
         super().__init__()
@@ -308,6 +436,7 @@ class AnalysisWorker(QObject):
         self.batch_num = batch_num
         self.previous_context = previous_context
         self.memory = memory or {"summaries": [], "markets": [], "trend": {"hawkish": 0, "dovish": 0, "neutral": 0}}
+        self.cancel = CancelToken()  # fired by JobPool.cancel_all() on STOP
         
     def run(self):
         print(f"🚀 AnalysisWorker.run() started for Batch #{self.batch_num}")
@@ -315,6 +444,19 @@ class AnalysisWorker(QObject):
             print("❌ No OPENROUTER_API_KEY!")
             self.finished.emit({"error": "No API Key", "batch_num": self.batch_num})
             return
+
+        # ⏭️ Local pre-filter: chatter / boilerplate without policy signal skips the LLM
+        if config.get("enable_prefilter", True):
+            verdict = prefilter.classify(self.text)
+            if verdict.skip:
+                print(f"⏭️ Analysis #{self.batch_num} labeled locally: {verdict.as_dict()} | {prefilter.stats()}")
+                self.finished.emit({
+                    "batch_num": self.batch_num,
+                    "sentiment": "NEUTRAL",
+                    "signal_strength": "LOW",
+                    "prefiltered": verdict.as_dict()
+                })
+                return
         
         # Build comprehensive memory context
         context_section = ""
@@ -345,100 +487,64 @@ class AnalysisWorker(QObject):
         if self.previous_context:
             context_section += f"\n⚡ ข้อความก่อนหน้า:\n{self.previous_context[:400]}\n"
             
-        prompt = f"""คุณคือนักวิเคราะห์การเงินมืออาชีพ วิเคราะห์แบบเรียลไทม์โดยใช้กฎต่อไปนี้:
-
-{DECISION_RULES}
-
-🧠 บริบทย้อนหลัง (สำคัญ):
+        # Variable suffix only: the rules and format live in ANALYSIS_SYSTEM_PROMPT
+        prompt = f"""🧠 บริบทย้อนหลัง (สำคัญ):
 {context_section}
 
 🎯 บทสนทนาปัจจุบัน (Batch #{self.batch_num}):
 {self.text}
 
-ตอบเป็น JSON เท่านั้น (ภาษาไทย):
-{{
-    "speaker_identified": "ประธานเฟด/นักข่าว",
-    "summary": "สรุป 1 ประโยค + ระบุบทบาทผู้พูด",
-    "prediction": "คาดการณ์ 1 ประโยค",
-    "sentiment": "HAWKISH|DOVISH|NEUTRAL|RISK-OFF|RISK-ON (เลือกตามบริบท)",
-    "signal_strength": "HIGH|MEDIUM|LOW",
-    "consistency_note": "ระบุบริบท (Fed/Geopolitics) และเหตุผล",
-    "gold": "ทิศทาง + เหตุผล",
-    "forex": "ทิศทาง + เหตุผล",
-    "stock": "ทิศทาง + เหตุผล"
-}}"""
+ตอบเป็น JSON ตามรูปแบบที่กำหนด"""
+
+        # Cached by the batch text alone (not the rolling memory context), so a
+        # replayed or rebroadcast passage is recognised whatever preceded it
+        model = config.get("model_analysis")
+        cached = cached_response("Analysis", model, PROMPT_VERSION_ANALYSIS, self.text, self.batch_num, near=True)
 
+        # Routing, hedging and HTTP retries are handled by the router / gateway;
+        # the loop only re-asks when every route returned unrepairable content
         max_retries = 2
         for attempt in range(max_retries + 1):
             try:
-                print(f"📡 Calling Analysis API (Attempt {attempt+1})...")
-                with httpx.Client(timeout=45) as client:
-                    resp = client.post(
-                        "https://openrouter.ai/api/v1/chat/completions",
-                        headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
-                        json={
-                            "model": config.get("model_analysis"),
-                            "messages": [{"role": "user", "content": prompt}],
-                            "response_format": {"type": "json_object"},
-                            "provider": {"order": ["google-vertex/global"]},
-                            "max_tokens": TOKEN_LIMIT_ANALYSIS
-                        }
-                    )
-                    result = resp.json()
+                if cached is not None:
+                    result, cached = {**cached, "cache": True}, None
+                    parsed = parse_analysis(result)
+                else:
+                    print(f"📡 Calling Analysis API (Attempt {attempt+1})...")
+                    routed = llm_router.complete(analysis_routes(model), lambda route: {
+                        "messages": [system_message(ANALYSIS_SYSTEM_PROMPT, route.model),
+                                     {"role": "user", "content": prompt}],
+                        "response_format": {"type": "json_object"},
+                        "max_tokens": TOKEN_LIMIT_ANALYSIS
+                    }, validate=parse_analysis, timeout=45, label="Analysis", on_delta=self._stream_fields(),
+                       cancel=self.cancel)
+                    result, parsed = routed.result, routed.parsed
                     
-                    # 📊 Log Token Usage
+                    # 📊 Log Token Usage (against the model that actually answered)
                     usage = result.get("usage", {})
                     p_tok = usage.get("prompt_tokens", 0)
                     c_tok = usage.get("completion_tokens", 0)
                     t_tok = usage.get("total_tokens", 0)
                     cost = result.get("cost", 0)
-                    print(f"💰 [Analysis] Usage: P={p_tok}, C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
-                    log_api_cost("Analysis", config.get("model_analysis"), usage, cost, self.batch_num)
-
-                    # Debug: print raw response keys
-                    # print(f"🔍 API Response keys: {list(result.keys())}")
-                    
-                    # Check for API error
-                    if "error" in result:
-                        raise Exception(f"API Error: {result['error']}")
-                    
-                    # Safely extract content
-                    choices = result.get("choices")
-                    if choices is None:
-                        raise Exception(f"No 'choices' in response: {result}")
-                    
-                    first_choice = choices[0]
-                    message = first_choice.get("message", {})
-                    content = message.get("content", "")
-                    
-                    if not content:
-                        raise Exception("Empty content")
-                    
-                    # Try to parse JSON, handling markdown code blocks
-                    content = content.strip()
-                    if content.startswith("```"):
-                        lines = content.split("\n")
-                        content = "\n".join(lines[1:-1])
-                    
-                    parsed = json.loads(content)
-                    
-                    # Handle case where AI returns a list instead of dict
-                    if isinstance(parsed, list):
-                        print(f"⚠️ AI returned list, taking first item")
-                        if len(parsed) > 0 and isinstance(parsed[0], dict):
-                            parsed = parsed[0]
-                        else:
-                            parsed = {}
-                    
-                    if not isinstance(parsed, dict):
-                        raise Exception(f"Parsed content is not dict: {type(parsed)}")
-                    
-                    parsed["batch_num"] = self.batch_num
-                    print(f"✅ Analysis #{self.batch_num} OK")
-                    self.finished.emit(parsed)
-                    return # Success
+                    print(f"💰 [Analysis] {routed.route.key} Usage: P={p_tok} (cached {cached_tokens(usage)}), C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
+                    log_api_cost("Analysis", routed.route.model, usage, cost, self.batch_num)
+                
+                cache_response("Analysis", model, PROMPT_VERSION_ANALYSIS, self.text, result)
+                if "cache" not in result:
+                    prefilter.record(self.text, parsed.get("sentiment"), parsed.get("signal_strength", ""))
+                parsed["batch_num"] = self.batch_num
+                print(f"✅ Analysis #{self.batch_num} OK")
+                self.finished.emit(parsed)
+                return # Success
                     
+            except LlmError as e:
+                print(f"Analysis Error (Final): {e}")
+                self.finished.emit({"error": str(e), "batch_num": self.batch_num})
+                return
             except Exception as e:
+                if self.cancel.cancelled:
+                    print(f"🛑 Analysis #{self.batch_num} cancelled")
+                    return
                 if attempt == max_retries:
                     import traceback
                     print(f"Analysis Error (Final): {e}")
@@ -446,7 +552,16 @@ class AnalysisWorker(QObject):
                     self.finished.emit({"error": str(e), "batch_num": self.batch_num})
                 else:
                     print(f"⚠️ Analysis Error (Attempt {attempt+1}): {e} - Retrying...")
-                    time.sleep(2 ** attempt)
+
+    def _stream_fields(self):
+        """on_delta for the gateway: emit `partial` whenever a JSON field completes"""
+        if not config.get("enable_streaming", True):
+            return None
+        fields = JsonFieldStream()
+        def on_delta(text):
+            if fields.feed(text):
+                self.partial.emit({**fields.fields, "batch_num": self.batch_num})
+        return on_delta
 
 
 # ============================================================================
@@ -454,11 +569,13 @@ class AnalysisWorker(QObject):
 # ============================================================================
 class SessionSummaryWorker(QObject):
     finished = Signal(dict)
+    partial = Signal(dict)  # streaming: fields completed so far
 
     def __init__(self, summaries_history: list):
         super().__init__()
         # ✅ Copy list to prevent thread race conditions
         self.history = list(summaries_history) 
+        self.cancel = CancelToken()  # fired by JobPool.cancel_all() on STOP
 
     def run(self):
         if not OPENROUTER_API_KEY or not self.history:
@@ -493,48 +610,30 @@ class SessionSummaryWorker(QObject):
 }}"""
 
         try:
-            with httpx.Client(timeout=60) as client:
-                # Use token limit from config or fallback
-                max_tokens = config.get("max_tokens_summary", TOKEN_LIMIT_SUMMARY)
-                
-                resp = client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
-                    json={
-                        "model": MODEL_SUMMARY,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "response_format": {"type": "json_object"},
-                        "max_tokens": max_tokens
-                    }
-                )
-                result = resp.json()
-                
-                # 📊 Log Token Usage
-                usage = result.get("usage", {})
-                p_tok = usage.get("prompt_tokens", 0)
-                c_tok = usage.get("completion_tokens", 0)
-                t_tok = usage.get("total_tokens", 0)
-                cost = result.get("cost", 0)
-                print(f"💰 [Summary] Usage: P={p_tok}, C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
-                log_api_cost("Summary", MODEL_SUMMARY, usage, cost)
-
-                content = result["choices"][0]["message"]["content"]
-                if content.startswith("```"):
-                    content = "\n".join(content.split("\n")[1:-1])
-                
-                parsed = json.loads(content)
-                
-                # ✅ Defensive Handling: Check if list
-                if isinstance(parsed, list):
-                    print("⚠️ AI returned list instead of dict, taking first item.")
-                    parsed = parsed[0] if len(parsed) > 0 else {}
-                    
-                if not isinstance(parsed, dict):
-                     print(f"❌ Invalid format: {type(parsed)}")
-                     parsed = {}
-                
-                print("🌍 Big Picture Analysis Completed.")
-                self.finished.emit(parsed)
+            # Use token limit from config or fallback
+            max_tokens = config.get("max_tokens_summary", TOKEN_LIMIT_SUMMARY)
+            
+            result = llm_gateway.complete({
+                "model": MODEL_SUMMARY,
+                "messages": [{"role": "user", "content": prompt}],
+                "response_format": {"type": "json_object"},
+                "max_tokens": max_tokens
+            }, timeout=60, label="Summary", on_delta=self._stream_fields(), cancel=self.cancel)
+            
+            # 📊 Log Token Usage
+            usage = result.get("usage", {})
+            p_tok = usage.get("prompt_tokens", 0)
+            c_tok = usage.get("completion_tokens", 0)
+            t_tok = usage.get("total_tokens", 0)
+            cost = result.get("cost", 0)
+            print(f"💰 [Summary] Usage: P={p_tok}, C={c_tok}, Total={t_tok}, Cost=${cost:.6f}")
+            log_api_cost("Summary", MODEL_SUMMARY, usage, cost)
+
+            # Fences, trailing commas and max_tokens cutoffs are repaired locally
+            parsed = parse_completion(result, SUMMARY_SCHEMA, label="Summary")
+            
+            print("🌍 Big Picture Analysis Completed.")
+            self.finished.emit(parsed)
 
         except Exception as e:
             print(f"❌ Session Summary Error: {e}")
@@ -542,6 +641,73 @@ class SessionSummaryWorker(QObject):
                 print(f"🔍 Validating logic... Raw API Response: {result}")
             self.finished.emit({})
 
+    def _stream_fields(self):
+        """on_delta for the gateway: emit `partial` whenever a JSON field completes"""
+        if not config.get("enable_streaming", True):
+            return None
+        fields = JsonFieldStream()
+        def on_delta(text):
+            if fields.feed(text):
+                self.partial.emit(dict(fields.fields))
+        return on_delta
+
+# ============================================================================
+# FINAL REPORT WORKER (คำตัดสินท้ายเซสชัน)
+# ============================================================================
+class FinalReportWorker(QObject):
+    finished = Signal(dict)
+
+    def __init__(self, summaries_history: list, trend: dict):
+        super().__init__()
+        self.history = list(summaries_history)
+        self.trend = dict(trend)
+        self.cancel = CancelToken()  # fired by JobPool.cancel_all() on STOP
+
+    def run(self):
+        if not OPENROUTER_API_KEY or not self.history:
+            self.finished.emit({})
+            return
+
+        print(f"⚖️ FinalReportWorker running with {len(self.history)} summaries...")
+        context_text = "\n".join([f"- Batch {h['batch']}: {h['summary']} ({h['sentiment']})" for h in self.history])
+        trend_text = ", ".join(f"{k.upper()} {v}" for k, v in self.trend.items())
+
+        prompt = f"""คุณคือหัวหน้านักวิเคราะห์ สรุป "คำตัดสินสุดท้าย" ของทั้งเซสชันจากสรุปรายช่วงต่อไปนี้
+
+สรุปรายช่วง:
+{context_text}
+
+สถิติแนวโน้ม: {trend_text}
+
+ตอบเป็น JSON ภาษาไทย เท่านั้น:
+{{
+    "topic": "ประเด็นหลักของทั้งเซสชัน",
+    "sentiment": "HAWKISH / DOVISH / NEUTRAL / RISK-ON / RISK-OFF",
+    "key_points": ["ประเด็นสำคัญ 1", "ประเด็นสำคัญ 2", "ประเด็นสำคัญ 3"],
+    "prediction": "คาดการณ์หลังจบเซสชัน 1-2 ประโยค",
+    "gold": "ทิศทางทองคำ",
+    "forex": "ทิศทาง USD"
+}}"""
+
+        try:
+            result = llm_gateway.complete({
+                "model": MODEL_SUMMARY,
+                "messages": [{"role": "user", "content": prompt}],
+                "response_format": {"type": "json_object"},
+                "max_tokens": config.get("max_tokens_summary", TOKEN_LIMIT_SUMMARY)
+            }, timeout=90, label="FinalReport", cancel=self.cancel)
+
+            usage = result.get("usage", {})
+            cost = result.get("cost", 0)
+            print(f"💰 [FinalReport] Usage: Total={usage.get('total_tokens', 0)}, Cost=${cost:.6f}")
+            log_api_cost("FinalReport", MODEL_SUMMARY, usage, cost)
+
+            self.finished.emit(parse_completion(result, FINAL_REPORT_SCHEMA, label="FinalReport"))
+
+        except Exception as e:
+            print(f"❌ Final Report Error: {e}")
+            self.finished.emit({})
+
 # ============================================================================
 # ECONOMIC NEWS WIDGET
 # ============================================================================
@@ -562,18 +728,37 @@ class FetchNewsWorker(QObject):
                 data = fetcher.fetch_news(timeframe=self.timeframe)
             else:
                 print("🌎 Fetching from ForexFactory...")
-                scraper = ForexFactoryScraper()
-                data = scraper.fetch_news(timeframe=self.timeframe)
+                # Shared scraper: reused connection, conditional GET, row diff
+                update = ff_scraper.fetch_changes(timeframe=self.timeframe)
+                data = update.events
+                if update.status == "parsed":
+                    print(f"📰 Calendar: {len(update.changed)} new/changed, {len(update.removed)} removed events")
+                    for item in update.changed:
+                        if item.get("actual") and item.get("impact") in ("High", "Medium"):
+                            print(f"   🔔 {item['currency']} {item['title']}: {item['actual']} (fcst {item.get('forecast') or '-'})")
+                elif update.status != "failed":
+                    print(f"📰 Calendar {update.status.replace('_', ' ')}")
                 
             self.finished.emit(data)
         except Exception as e:
             print(f"Fetch Error: {e}")
             self.finished.emit([])
 
+# One calendar event as render_list sees it: a stable key, the fields shown
+# on its card (a change rebuilds the card) and its time parsed once per fetch
+NewsEntry = namedtuple("NewsEntry", "key signature item when")
+NEWS_CARD_FIELDS = ("time", "currency", "impact", "title", "actual", "forecast")
+
+
 class EconomicNewsWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.data = []
+        self.entries = []          # NewsEntry per item of self.data (see news_entries)
+        self.entries_source = None # the self.data list the entries were built from
+        self.entries_date = None   # parse_news_time anchors times to this date
+        self.cards = {}            # entry key -> card QFrame in the list
+        self.pinned = None         # (key, signature, card) of the NEXT EVENT card
         self.timeframe = "today"
         self.source = "forexfactory" # Default
         self.setup_ui()
@@ -702,6 +887,22 @@ class EconomicNewsWidget(QWidget):
         self.list_layout = QVBoxLayout(self.list_container)
         self.list_layout.setContentsMargins(10, 10, 10, 10)
         self.list_layout.setSpacing(8)
+        
+        # Fixed slots: [No Data] [pinned card] [separator] cards... [stretch]
+        self.no_data_lbl = QLabel("No Data")
+        self.no_data_lbl.setStyleSheet("color: #606070; font-style: italic; margin-top: 20px;")
+        self.no_data_lbl.setAlignment(Qt.AlignCenter)
+        self.no_data_lbl.hide()
+        self.pinned_box = QWidget()
+        self.pinned_layout = QVBoxLayout(self.pinned_box)
+        self.pinned_layout.setContentsMargins(0, 0, 0, 0)
+        self.pinned_box.hide()
+        self.sep_lbl = QLabel("👇 UPCOMING / PAST")
+        self.sep_lbl.setStyleSheet("color: #606070; font-size: 10px; font-weight: bold; margin-top: 8px; margin-bottom: 4px; border-bottom: 1px solid #2a2a3a;")
+        self.sep_lbl.setAlignment(Qt.AlignCenter)
+        self.sep_lbl.hide()
+        for widget in (self.no_data_lbl, self.pinned_box, self.sep_lbl):
+            self.list_layout.addWidget(widget)
         self.list_layout.addStretch() # Push items to top
         
         self.scroll.setWidget(self.list_container)
@@ -758,13 +959,13 @@ class EconomicNewsWidget(QWidget):
         targets = []
         
         # Collect all triggers
-        for item in self.data:
+        for entry in self.news_entries():
             # Only snipe High/Medium impact events
-            impact = item.get("impact", "")
+            impact = entry.item.get("impact", "")
             if impact not in ["High", "Medium"]:
                 continue
                 
-            news_dt = self.parse_news_time(item.get("time", ""))
+            news_dt = entry.when
             if not news_dt:
                 continue
             
@@ -909,71 +1110,91 @@ class EconomicNewsWidget(QWidget):
         if not self.chk_auto.isChecked():
              self.lbl_updated.setText(f"Last update: {datetime.datetime.now().strftime('%H:%M:%S')}")
 
-    def render_list(self):
-        # Clear existing items
-        while self.list_layout.count() > 1: # Keep the stretch item at end
-            item = self.list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        if not self.data:
-            lbl = QLabel("No Data")
-            lbl.setStyleSheet("color: #606070; font-style: italic; margin-top: 20px;")
-            lbl.setAlignment(Qt.AlignCenter)
-            self.list_layout.insertWidget(0, lbl)
-            return
-
-        # 1. Filter items first
-        filtered_items = []
+    def news_entries(self):
+        """Key each event and parse its time once per fetch (again only if the day rolls over)"""
+        today = datetime.date.today()
+        if self.entries_source is self.data and self.entries_date == today:
+            return self.entries
+        seen = Counter()
+        entries = []
         for item in self.data:
-            impact = item.get("impact", "Unknown")
-            # Filtering
-            if impact == "High" and not self.chk_high.isChecked(): continue
-            if impact == "Medium" and not self.chk_med.isChecked(): continue
-            if impact == "Low" and not self.chk_low.isChecked(): continue
-            if (impact == "Non-Econ" or impact == "Unknown") and not self.chk_none.isChecked(): continue
-            filtered_items.append(item)
-
-        # 2. Find Next Event (Closest future event)
+            key = (item.get("time", ""), item.get("currency", ""), item.get("title", ""))
+            seen[key] += 1  # same event twice in a week view
+            signature = tuple(item.get(field, "") for field in NEWS_CARD_FIELDS)
+            entries.append(NewsEntry(key + (seen[key],), signature, item, self.parse_news_time(item.get("time"))))
+        self.entries, self.entries_source, self.entries_date = entries, self.data, today
+        return entries
+
+    def render_list(self):
+        """Keyed diff against the cards already shown: unchanged events keep their card,
+        filter changes only toggle visibility"""
+        entries = self.news_entries()
+        self.no_data_lbl.setVisible(not entries)
+        shown = {"High": self.chk_high.isChecked(), "Medium": self.chk_med.isChecked(),
+                 "Low": self.chk_low.isChecked(), "Non-Econ": self.chk_none.isChecked(),
+                 "Unknown": self.chk_none.isChecked()}
+        filtered = [entry for entry in entries if shown.get(entry.item.get("impact", "Unknown"), True)]
+
+        # Next Event (closest future event) is pinned on top
         now = datetime.datetime.now()
-        pinned_item = None
-        candidates = []
-        
-        for item in filtered_items:
-            dt = self.parse_news_time(item.get("time"))
-            if dt and dt > now:
-                candidates.append((dt, item))
-        
-        if candidates:
-            # Sort by time
-            candidates.sort(key=lambda x: x[0])
-            pinned_item = candidates[0][1]
-            
-        # 3. Render Items
-        insert_idx = 0
-        
-        # If we have a pinned item, render it FIRST
-        if pinned_item:
-            # Pinned Card
-            card = self.create_pinned_card(pinned_item)
-            self.list_layout.insertWidget(insert_idx, card)
-            insert_idx += 1
-            
-            # Separator/Label
-            sep_lbl = QLabel("👇 UPCOMING / PAST")
-            sep_lbl.setStyleSheet("color: #606070; font-size: 10px; font-weight: bold; margin-top: 8px; margin-bottom: 4px; border-bottom: 1px solid #2a2a3a;")
-            sep_lbl.setAlignment(Qt.AlignCenter)
-            self.list_layout.insertWidget(insert_idx, sep_lbl)
-            insert_idx += 1
-
-        # Render the rest
-        for item in filtered_items:
-            if item == pinned_item: 
-                continue # Skip because we already showed it at top
-                
-            card = self.create_news_card(item)
-            self.list_layout.insertWidget(insert_idx, card)
-            insert_idx += 1
+        upcoming = [entry for entry in filtered if entry.when and entry.when > now]
+        pinned = min(upcoming, key=lambda entry: entry.when) if upcoming else None
+
+        visible = {entry.key for entry in filtered}
+        if pinned:
+            visible.discard(pinned.key)  # Skip because we already showed it at top
+        self.list_container.setUpdatesEnabled(False)
+        try:
+            self._set_pinned(pinned)
+            self._sync_cards(entries, visible)
+        finally:
+            self.list_container.setUpdatesEnabled(True)
+
+    def _sync_cards(self, entries, visible):
+        """Insert / rebuild / remove cards so the list follows entries in order; a card is
+        built the first time its event is visible and then kept (hidden) across filters"""
+        keys = {entry.key for entry in entries}
+        for key in [key for key in self.cards if key not in keys]:
+            self._drop_card(self.cards.pop(key))
+        pos = self.list_layout.indexOf(self.sep_lbl) + 1
+        for entry in entries:
+            card = self.cards.get(entry.key)
+            if card is not None and card.signature != entry.signature:
+                self._drop_card(self.cards.pop(entry.key))  # actual / forecast came in: rebuild that card only
+                card = None
+            if card is None:
+                if entry.key not in visible:
+                    continue
+                card = self.create_news_card(entry.item)
+                card.signature = entry.signature
+                self.cards[entry.key] = card
+                self.list_layout.insertWidget(pos, card)  # shown along with the list
+            else:
+                if self.list_layout.itemAt(pos).widget() is not card:
+                    self.list_layout.removeWidget(card)
+                    self.list_layout.insertWidget(pos, card)
+                if card.isHidden() == (entry.key in visible):
+                    card.setVisible(entry.key in visible)
+            pos += 1
+
+    def _drop_card(self, card):
+        self.list_layout.removeWidget(card)
+        card.deleteLater()
+
+    def _set_pinned(self, entry):
+        current = self.pinned[:2] if self.pinned else None
+        wanted = (entry.key, entry.signature) if entry else None
+        if current != wanted:
+            if self.pinned:
+                self.pinned_layout.removeWidget(self.pinned[2])
+                self.pinned[2].deleteLater()
+            self.pinned = None
+            if entry:
+                card = self.create_pinned_card(entry.item)
+                self.pinned_layout.addWidget(card)
+                self.pinned = (entry.key, entry.signature, card)
+        self.pinned_box.setVisible(entry is not None)
+        self.sep_lbl.setVisible(entry is not None)
 
     def create_pinned_card(self, item):
         frame = self.create_news_card(item)
@@ -1066,45 +1287,75 @@ class EconomicNewsWidget(QWidget):
         return frame
 
 # ============================================================================
-class PakeAnalyzerWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("📺 Pake Live Analyzer")
-        self.resize(1600, 900)
-        self.setStyleSheet(DARK_STYLE)
-        
-        self.show_thai = True
-        
-        # Keep references to prevent garbage collection (use lists for multiple concurrent threads)
-        self.active_threads = []  # List to hold all active threads
-        self.active_workers = []  # List to hold all active workers (CRITICAL!)
-        
+# PER-STREAM STATE (Fed / ECB / BoJ feeds analysed side by side)
+# ============================================================================
+class StreamState:
+    """Analysis state of one backend stream, keyed by the payloads' stream_id"""
+    __slots__ = ("stream_id", "running", "memory", "trend_tracker", "last_context", "big_picture_points")
+
+    def __init__(self, stream_id):
+        self.stream_id = stream_id
+        self.running = False
         # Enhanced Memory System
         self.memory = {
             "summaries": [],      # [{batch, summary, sentiment}, ...]
             "markets": [],        # [{batch, gold, forex, stock}, ...]
             "trend": {"hawkish": 0, "dovish": 0, "neutral": 0}
         }
-        
-        # System State
-        self.is_running = False  # Start in PAUSED state
-        
-        # New: Tracking numeric trends
+        # Tracking numeric trends
         self.trend_tracker = {
             "inflation": [],      # เก็บค่า % เงินเฟ้อ เช่น [3.5, 3.3, 3.2]
             "unemployment": [],   # เก็บค่า % การว่างงาน
             "last_direction": None  # "up" หรือ "down"
         }
-        self.last_big_picture_time = 0  # Cooldown tracker
         self.last_context = ""
+        self.big_picture_points = ""  # last big-picture key points (similarity check)
+
+# ============================================================================
+class PakeAnalyzerWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("📺 Pake Live Analyzer")
+        self.resize(1600, 900)
+        self.setStyleSheet(DARK_STYLE)
+        
+        self.show_thai = True
+        
+        # Fixed worker pool for all LLM jobs (analysis > translation > summary)
+        self.jobs = JobPool(parent=self)
+        self.jobs.changed.connect(self._on_jobs_changed)
+        self.analysis_cards = {}  # (stream_id, batch_num) -> QTextFrame of its AI feed card (updated while streaming)
+        
+        # High-rate updates (segments, streamed fields) are applied at most every UI_FLUSH_MS
+        self.ui_updates = UpdateCoalescer(parent=self)
+        self.ui_updates.add_channel("transcript", lambda rows: self.transcript.append_rows(rows))
+        self.ui_updates.add_channel("analysis_partial", self._flush_analysis_partials, keyed=True)
+        self.ui_updates.add_channel("big_picture_partial", self._flush_big_picture_partial, keyed=True)
+        self.ui_updates.add_channel("interim", self._flush_interims, keyed=True)
+        self.interims = {}  # stream_id -> latest interim segment (replaced by the final)
+        
+        # Per-stream memory / trends / running state (every stream starts PAUSED)
+        self.streams = {}  # stream_id -> StreamState
+        self.last_big_picture_time = 0  # Cooldown tracker
+
+        # IPC State (reset per backend connection)
+        self.ipc_reader = IpcReader()
+        self.ipc_codec = None    # None = legacy NDJSON
+        self.segment_cache = {}  # (stream_id, segment id) -> segment, until its batch arrives
+        self.shm_ring = None     # Backend -> GUI shared-memory ring (shm transport)
+        self.shm_reader = None
+        self.shm_timer = QTimer(self)
+        self.shm_timer.setTimerType(Qt.PreciseTimer)
+        self.shm_timer.setInterval(2)
+        self.shm_timer.timeout.connect(self._read_ring)
 
         # GUI Signals for Socket Communication
         self.signals = GUISignals()
         self.signals.new_message.connect(self._on_message)
         
         self._build_ui()
-        # Start TCP Server for Backend Communication
-        self.start_tcp_server()
+        # Start IPC Server for Backend Communication
+        self.start_ipc_server()
         
     def _build_ui(self):
         central = QWidget()
@@ -1123,6 +1374,14 @@ class PakeAnalyzerWindow(QMainWindow):
         title_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #6366f1; letter-spacing: 2px; margin-left: 8px;")
         toolbar.addWidget(title_label)
         
+        # --- STREAM SELECTOR (START/STOP act on the selected stream) ---
+        self.stream_combo = QComboBox()
+        self.stream_combo.setToolTip("Backend stream to start / stop (extra streams are set in Settings)")
+        self.stream_combo.setStyleSheet("background: #1a1a24; border: 1px solid #2a2a3a; color: #a0a0b0; border-radius: 4px; padding: 4px 10px; font-size: 11px; margin-left: 20px;")
+        self.stream_combo.addItems(list(self._stream_urls()))
+        self.stream_combo.currentTextChanged.connect(self._sync_stream_controls)
+        toolbar.addWidget(self.stream_combo)
+
         # --- START/STOP BUTTON ---
         self.btn_start = QPushButton("▶ START")
         self.btn_start.setCheckable(True)
@@ -1229,10 +1488,16 @@ class PakeAnalyzerWindow(QMainWindow):
         lbl1.setStyleSheet("font-size: 10px; font-weight: bold; margin-bottom: 6px;")
         col1_layout.addWidget(lbl1)
         
-        self.transcript = QTextEdit()
-        self.transcript.setReadOnly(True)
+        self.transcript = TranscriptView(speaker_width=100)
         col1_layout.addWidget(self.transcript)
         
+        # Live interim line (what Deepgram hears right now, before the final)
+        self.interim_label = QLabel("")
+        self.interim_label.setWordWrap(True)
+        self.interim_label.setStyleSheet("font-size: 11px; color: #606070; font-style: italic; padding: 4px 2px;")
+        self.interim_label.hide()
+        col1_layout.addWidget(self.interim_label)
+        
         # Column 2: Thai Translation
         self.col2 = QWidget()
         col2_layout = QVBoxLayout(self.col2)
@@ -1242,8 +1507,7 @@ class PakeAnalyzerWindow(QMainWindow):
         lbl2.setStyleSheet("font-size: 10px; font-weight: bold; margin-bottom: 6px;")
         col2_layout.addWidget(lbl2)
         
-        self.thai_view = QTextEdit()
-        self.thai_view.setReadOnly(True)
+        self.thai_view = TranscriptView(speaker_width=90)
         col2_layout.addWidget(self.thai_view)
         
         # Column 3: AI Intelligence (ปรับแก้ตรงนี้)
@@ -1290,26 +1554,65 @@ class PakeAnalyzerWindow(QMainWindow):
         self.setStatusBar(QStatusBar(self))
         self._set_status("● PAUSED", "#606070")
 
+    # --- Streams ---
+    def _stream_urls(self) -> dict:
+        """stream_id -> media URL: the main stream, then the extra ones from Settings"""
+        return {config.get("stream_id", "main"): config.get("target_media_url", ""), **config.get("streams", {})}
+
+    def _stream(self, stream_id: str = None) -> StreamState:
+        """State of a stream (payloads without stream_id belong to the main stream)"""
+        stream_id = stream_id or config.get("stream_id", "main")
+        state = self.streams.get(stream_id)
+        if state is None:
+            state = self.streams[stream_id] = StreamState(stream_id)
+        return state
+
+    def _selected_stream(self) -> str:
+        return self.stream_combo.currentText() or config.get("stream_id", "main")
+
+    def _stream_tag(self, stream_id: str = None) -> str:
+        """' • ecb' for secondary streams, '' for the main one"""
+        if stream_id and stream_id != config.get("stream_id", "main"):
+            return f" • {stream_id}"
+        return ""
+
+    def _sync_stream_controls(self, *_):
+        """START/STOP button and trend label follow the selected stream"""
+        known = [self.stream_combo.itemText(i) for i in range(self.stream_combo.count())]
+        for stream_id in self._stream_urls():
+            if stream_id not in known:
+                self.stream_combo.addItem(stream_id)
+        running = self._stream(self._selected_stream()).running
+        self.btn_start.setChecked(running)
+        self.btn_start.setText("⏹ STOP" if running else "▶ START")
+        self._update_trend_indicator()
+
     def toggle_processing(self):
-        """Toggle Start/Stop state"""
+        """Toggle Start/Stop state of the selected stream"""
+        stream_id = self._selected_stream()
         if self.btn_start.isChecked():
             # === START ===
-            self.is_running = True
+            self._stream(stream_id).running = True
             self.btn_start.setText("⏹ STOP")
             self._set_status("● LISTENING", "#22c55e")
-            self.transcript.append("<span style='color: #22c55e;'>--- SYSTEM STARTED ---</span>")
+            self.ui_updates.post("transcript", Row("marker", f"--- SYSTEM STARTED{self._stream_tag(stream_id)} ---", color="#22c55e"))
             
             # Send START Command
-            url = config.get("target_media_url", "")
+            url = self._stream_urls().get(stream_id, "")
             if not url:
                  print("⚠️ No target URL in config, sending empty URL")
             
             model_id = config.get("model_analysis", "google/gemini-3-flash-preview")
-            self.send_command("START", {"url": url, "model": model_id})
+            mode = config.get("stream_mode", "thread")
+            self.send_command("START", {
+                "url": url, "model": model_id, "mode": mode,
+                "stream_id": stream_id,
+                "vad": config.get("enable_vad", False)
+            })
 
         else:
             # === STOP ===
-            self.stop_process()
+            self.stop_process(stream_id)
         
     def _toggle_thai(self):
         self.show_thai = self.toggle_btn.isChecked()
@@ -1321,8 +1624,8 @@ class PakeAnalyzerWindow(QMainWindow):
             self.toggle_btn.setText("🇹🇭 Thai OFF")
             self.col2.hide()
             
-    def _track_numeric_trends(self, text: str):
-        """ติดตามแนวโน้มตัวเลขจากข้อความ"""
+    def _track_numeric_trends(self, text: str, tracker: dict):
+        """ติดตามแนวโน้มตัวเลขจากข้อความ (tracker: trend_tracker ของ stream นั้น)"""
         import re
         
         # ดึง % เงินเฟ้อ (เช่น "3.5%", "3.2%")
@@ -1336,35 +1639,46 @@ class PakeAnalyzerWindow(QMainWindow):
         for match in inflation_matches[:3]:  # เก็บแค่ 3 ค่าแรก
             try:
                 value = float(match)
-                self.trend_tracker["inflation"].append(value)
+                tracker["inflation"].append(value)
                 # จำกัดขนาดให้เหลือแค่ 5 ค่าล่าสุด
-                if len(self.trend_tracker["inflation"]) > 5:
-                    self.trend_tracker["inflation"].pop(0)
+                if len(tracker["inflation"]) > 5:
+                    tracker["inflation"].pop(0)
             except:
                 pass
         
         # วิเคราะห์ทิศทางแนวโน้ม
-        if len(self.trend_tracker["inflation"]) >= 2:
-            last = self.trend_tracker["inflation"][-1]
-            prev = self.trend_tracker["inflation"][-2]
+        if len(tracker["inflation"]) >= 2:
+            last = tracker["inflation"][-1]
+            prev = tracker["inflation"][-2]
             if last < prev:
-                self.trend_tracker["last_direction"] = "down"  # แนวโน้มลดลง = DOVISH
+                tracker["last_direction"] = "down"  # แนวโน้มลดลง = DOVISH
             elif last > prev:
-                self.trend_tracker["last_direction"] = "up"    # แนวโน้มเพิ่มขึ้น = HAWKISH
-    # --- TCP Server Logic (Bi-directional) ---
-    def start_tcp_server(self):
-        """Start TCP Server for Backend Communication"""
-        self.tcp_server = QTcpServer(self)
-        if not self.tcp_server.listen(QHostAddress.LocalHost, 8765):
-            print(f"❌ Could not start TCP server: {self.tcp_server.errorString()}")
+                tracker["last_direction"] = "up"    # แนวโน้มเพิ่มขึ้น = HAWKISH
+    # --- IPC Server Logic (Bi-directional) ---
+    def start_ipc_server(self):
+        """Start the IPC server (TCP or Unix socket, per PAKE_IPC_TRANSPORT)"""
+        kind, control, address = ipc_transport.settings()
+        self.ipc_kind = kind
+        if control == "unix":
+            QLocalServer.removeServer(address)  # Stale socket file from a crash
+            self.ipc_server = QLocalServer(self)
+            ok = self.ipc_server.listen(address)
+        else:
+            host, port = ipc_transport.parse_tcp_address(address)
+            self.ipc_server = QTcpServer(self)
+            ok = self.ipc_server.listen(QHostAddress.LocalHost if host == "localhost" else QHostAddress(host), port)
+        if not ok:
+            print(f"❌ Could not start IPC server ({control}: {address}): {self.ipc_server.errorString()}")
             return
 
-        self.tcp_server.newConnection.connect(self._handle_new_connection)
-        print("✅ TCP Server listening on port 8765")
+        self.ipc_server.newConnection.connect(self._handle_new_connection)
+        print(f"✅ IPC Server listening ({kind}, {control}: {address})")
 
     def _handle_new_connection(self):
         """Handle incoming backend connection"""
-        self.client_socket = self.tcp_server.nextPendingConnection()
+        self.client_socket = self.ipc_server.nextPendingConnection()
+        self.ipc_reader = IpcReader()
+        self.ipc_codec = None
         self.client_socket.readyRead.connect(self._read_socket)
         self.client_socket.disconnected.connect(self._handle_disconnected)
         
@@ -1379,6 +1693,7 @@ class PakeAnalyzerWindow(QMainWindow):
     def _handle_disconnected(self):
         self.is_connected = False
         self.client_socket = None
+        self._close_ring()
         self._set_status("🔴 Backend Disconnected", "#ef4444")
         self.btn_start.setEnabled(False)
         print("❌ Backend Disconnected")
@@ -1387,15 +1702,54 @@ class PakeAnalyzerWindow(QMainWindow):
         """Process incoming data from backend"""
         if not self.client_socket: return
         
-        while self.client_socket.bytesAvailable() > 0:
-            line_bytes = self.client_socket.readLine()
-            try:
-                line = str(line_bytes, 'utf-8').strip()
-                if not line: continue
-                payload = json.loads(line)
+        data = bytes(self.client_socket.readAll())
+        try:
+            for payload in self.ipc_reader.feed(data):
+                if payload.get("type") == "HELLO" and self.ipc_codec is None:
+                    self._accept_hello(payload)
+                    continue
                 self.signals.new_message.emit(payload)
+        except Exception as e:
+            print(f"Socket Parse Error: {e}")
+
+    def _accept_hello(self, hello: dict):
+        """Answer the backend's HELLO and switch both directions to framed IPC"""
+        codec = choose_codec(hello.get("codecs"))
+        if codec is None:
+            return  # Nothing in common: stay on NDJSON
+        accepted = {}
+        offer = hello.get("shm")
+        if offer and self.ipc_kind == "shm":
+            try:
+                self.shm_ring = ShmRing.attach(offer["name"])
+                self.shm_reader = IpcReader(codec)
+                self.shm_timer.start()
+                accepted["shm"] = True
             except Exception as e:
-                print(f"Socket Parse Error: {e}")
+                print(f"⚠️ Could not attach shared-memory ring: {e}")
+        self.client_socket.write(encode_message(hello_ack(codec, **accepted)))
+        self.client_socket.flush()
+        self.ipc_codec = codec
+        self.ipc_reader.switch(codec)
+        print(f"🤝 IPC negotiated: framed/{codec.name}{' + shm ring' if accepted else ''}")
+
+    def _read_ring(self):
+        """Poll the shared-memory ring for backend messages"""
+        if not self.shm_ring: return
+        try:
+            data = self.shm_ring.read()
+            if data:
+                for payload in self.shm_reader.feed(data):
+                    self.signals.new_message.emit(payload)
+        except Exception as e:
+            print(f"Ring Parse Error: {e}")
+
+    def _close_ring(self):
+        self.shm_timer.stop()
+        if self.shm_ring:
+            self._read_ring()  # Drain what the backend wrote before leaving
+            self.shm_ring.close()
+            self.shm_ring = None
 
     def send_command(self, cmd_type: str, payload: dict = {}):
         """Send JSON command to backend"""
@@ -1405,61 +1759,69 @@ class PakeAnalyzerWindow(QMainWindow):
             
         try:
             msg = {"type": cmd_type, **payload}
-            json_str = json.dumps(msg) + "\n"
-            self.client_socket.write(json_str.encode('utf-8'))
+            self.client_socket.write(encode_message(msg, self.ipc_codec))
             self.client_socket.flush()
             print(f"📤 Sent Command: {cmd_type}")
         except Exception as e:
             print(f"❌ Send Error: {e}")
 
-    def stop_process(self):
-        """Handle Stop Logic"""
-        if not self.is_running: return
+    def stop_process(self, stream_id: str = None):
+        """Handle Stop Logic for one stream (default: the selected one); other streams keep running"""
+        state = self._stream(stream_id or self._selected_stream())
+        if not state.running: return
+        stream_id = state.stream_id
         
-        # 1. Send STOP Command
-        self.send_command("STOP")
+        # 1. Send STOP Command (only for this stream)
+        self.send_command("STOP", {"stream_id": stream_id})
         
         # 2. Update UI
-        self.is_running = False
-        self.btn_start.setText("▶ START")
-        self.btn_start.setChecked(False) 
-        self._set_status("🟡 PAUSED", "#eab308")
-        self.transcript.append("<span style='color: #ef4444;'>--- SYSTEM PAUSED ---</span>")
-        
-        # 3. Trigger Session Wrap-up (Phase 4 Logic)
-        if hasattr(self, 'session_summary_timer'):
+        state.running = False
+        if stream_id == self._selected_stream():
+            self.btn_start.setText("▶ START")
+            self.btn_start.setChecked(False) 
+        if not any(s.running for s in self.streams.values()):
+            self._set_status("🟡 PAUSED", "#eab308")
+        self.ui_updates.post("transcript", Row("marker", f"--- SYSTEM PAUSED{self._stream_tag(stream_id)} ---", color="#ef4444"))
+        
+        # 3. Drop this stream's queued LLM jobs; its running ones are cancelled
+        self.jobs.cancel_all(group=stream_id)
+        self.ui_updates.discard_where("analysis_partial", lambda key: key[0] == stream_id)
+        self.ui_updates.discard("big_picture_partial", stream_id)
+        self._clear_interim(stream_id)
+        if not self.jobs.metrics()["running"]:
+            self.progress.hide()
+        for key in [key for key in self.analysis_cards if key[0] == stream_id]:
+            self._render_analysis_card(key, f"<div style='font-size:10px; color:#606070;'>BATCH #{key[1]}{self._stream_tag(stream_id)} • cancelled</div>")
+            del self.analysis_cards[key]
+        print(f"📊 Job pool: {self.jobs.metrics()}")
+        print(f"🖼️ UI updates: {self.ui_updates.metrics()}")
+        
+        # 4. Trigger Session Wrap-up (Phase 4 Logic)
+        if hasattr(self, 'session_summary_timer') and not any(s.running for s in self.streams.values()):
             self.session_summary_timer.stop()
         
         # Trigger Final Report (The Judge)
-        self.finalize_session()
+        self.finalize_session(stream_id)
 
-    def finalize_session(self):
-        if not self.memory["summaries"]:
+    def finalize_session(self, stream_id: str = None):
+        state = self._stream(stream_id)
+        if not state.memory["summaries"]:
             return
             
-        print("⚖️ Generating Final Session Report...")
+        print(f"⚖️ Generating Final Session Report [{state.stream_id}]...")
         self.status.setText("⚖️ JUDGING SESSION...")
         
-        # Create worker thread
-        final_thread = QThread()
-        final_worker = FinalReportWorker(self.memory["summaries"], self.memory["trend"])
-        final_worker.moveToThread(final_thread)
-        
-        final_worker.finished.connect(self._show_final_report)
-        final_worker.finished.connect(final_thread.quit)
-        final_worker.finished.connect(final_worker.deleteLater)
-        final_thread.finished.connect(final_thread.deleteLater)
-        
-        self.active_threads.append(final_thread) 
-        final_thread.start()
+        final_worker = FinalReportWorker(state.memory["summaries"], state.memory["trend"])
+        final_worker.finished.connect(lambda report, sid=state.stream_id: self._show_final_report(report, sid))
+        self.jobs.submit(final_worker, lane="summary", group=state.stream_id)
 
-    def _show_final_report(self, report):
+    def _show_final_report(self, report, stream_id: str = None):
         if not report: return
         
         # Format HTML for final report
         html = f"""
         <div style="background-color:#1a1a24; border:1px solid #6366f1; border-radius:8px; padding:15px; margin-top:20px; margin-bottom:20px;">
-            <h2 style="color:#6366f1; margin-top:0;">⚖️ FINAL VERDICT</h2>
+            <h2 style="color:#6366f1; margin-top:0;">⚖️ FINAL VERDICT{self._stream_tag(stream_id)}</h2>
             <p><b>Topic:</b> {report.get('topic')}</p>
             <p><b>Sentiment:</b> <span style="font-weight:bold; color:{'#ef4444' if 'HAWK' in report.get('sentiment','').upper() else '#22c55e' if 'DOVE' in report.get('sentiment','').upper() else '#fbbf24'}">{report.get('sentiment')}</span></p>
             <div style="background-color:#2a2a3a; padding:10px; border-radius:4px; margin:10px 0;">
@@ -1473,10 +1835,7 @@ class PakeAnalyzerWindow(QMainWindow):
         </div>
         """
         
-        cursor = self.transcript.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(html)
-        self.transcript.ensureCursorVisible()
+        self.ui_updates.post("transcript", Row("html", html))
         self._set_status("🔴 STOPPED", "#ef4444")
 
 
@@ -1493,6 +1852,7 @@ class PakeAnalyzerWindow(QMainWindow):
     def open_settings(self):
         dlg = SettingsDialog(self)
         dlg.exec()
+        self._sync_stream_controls()  # Streams added in Settings show up in the selector
 
     def open_telegram(self):
         dlg = TelegramDashboard(self)
@@ -1532,16 +1892,51 @@ class PakeAnalyzerWindow(QMainWindow):
         """Handle incoming messages from backend"""
         msg_type = payload.get("type")
         data = payload.get("data", {})
+        state = self._stream(payload.get("stream_id"))
         
         # Allow status updates even if 'paused' (backend might be shutting down)
         if msg_type == "segment":
-            if self.is_running:
-                self._add_segment(data)
+            if "id" in payload:
+                self.segment_cache[(state.stream_id, payload["id"])] = data
+            if state.running:
+                self.ui_updates.post("transcript", self._segment_row(data, state.stream_id))
+            self._clear_interim(state.stream_id)
+        elif msg_type == "interim":
+            if state.running:
+                self.ui_updates.post("interim", data, key=state.stream_id)
         elif msg_type == "batch":
-            if self.is_running:
-                self._process_batch(data)
+            self._resolve_batch_segments(data, state.stream_id)
+            if state.running:
+                self._process_batch(data, state.stream_id)
+
+    def _flush_interims(self, pending: dict):
+        self.interims.update(pending)
+        self._render_interims()
+
+    def _clear_interim(self, stream_id: str):
+        """The final segment replaces the interim of its stream"""
+        self.ui_updates.discard("interim", stream_id)
+        if self.interims.pop(stream_id, None) is not None:
+            self._render_interims()
+
+    def _render_interims(self):
+        lines = [f"✍️ {seg.get('speaker', '?')}{self._stream_tag(stream_id)}: {seg.get('text', '')}"
+                 for stream_id, seg in self.interims.items()]
+        self.interim_label.setText("\n".join(lines))
+        self.interim_label.setVisible(bool(lines))
+
+    def _resolve_batch_segments(self, batch: dict, stream_id: str = None):
+        """Framed batches carry segment ids only: fill the bodies from the cache"""
+        current_batch = batch.get("current_batch", {})
+        ids = current_batch.get("segment_ids", [])
+        if "segments" in current_batch:
+            for seg_id in ids:
+                self.segment_cache.pop((stream_id, seg_id), None)
+            return
+        cached = (self.segment_cache.pop((stream_id, seg_id), None) for seg_id in ids)
+        current_batch["segments"] = [seg for seg in cached if seg is not None]
             
-    def _add_segment(self, seg: dict):
+    def _segment_row(self, seg: dict, stream_id: str = None) -> Row:
         speaker = seg.get("speaker", "?")
         text = seg.get("text", "")
         start = seg.get("start", 0)
@@ -1554,37 +1949,22 @@ class PakeAnalyzerWindow(QMainWindow):
         color = colors[idx % len(colors)]
         
         time_str = f"{int(start // 60)}:{int(start % 60):02d}"
+        # Tag segments from secondary streams (e.g. ECB / BoJ feeds)
+        if self._stream_tag(stream_id):
+            time_str = f"{stream_id} • {time_str}"
         
-        html = f'''<table style="width:100%; margin-bottom:8px; border-collapse:collapse;">
-<tr>
-<td style="width:100px; vertical-align:top; padding-right:8px;">
-<span style="font-size:10px; color:{color}; font-weight:bold;">{speaker}</span><br/>
-<span style="font-size:9px; color:#606070;">{time_str}</span>
-</td>
-<td style="vertical-align:top; border-left:2px solid {color}; padding-left:10px;">
-<span style="font-size:13px; color:#e0e0e0;">{text}</span>
-</td>
-</tr>
-</table>'''
-        
-        cursor = self.transcript.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(html)
-        self.transcript.ensureCursorVisible()
+        return Row("segment", text, speaker, time_str, color)
         
-    def _cleanup_finished_threads(self):
-        """Deprecated: Unsafe."""
-        pass
-
-    def _safe_remove_thread(self, thread, worker):
-        """Safely remove finished thread/worker from tracking lists."""
-        if thread in self.active_threads:
-            self.active_threads.remove(thread)
-        if worker in self.active_workers:
-            self.active_workers.remove(worker)
-        # print(f"♻️ Cleaned up thread. Active: {len(self.active_threads)}")
+    def _on_jobs_changed(self, metrics: dict):
+        queued = metrics["queued"]
+        self.progress.setToolTip(
+            f"LLM jobs: {metrics['running']} running, "
+            f"{queued['analysis']} analysis / {queued['translation']} translation / {queued['summary']} summary queued"
+        )
         
-    def _process_batch(self, batch: dict):
+    def _process_batch(self, batch: dict, stream_id: str = None):
+        state = self._stream(stream_id)
+        stream_id = state.stream_id
         self.progress.show()
         
         current_batch = batch.get("current_batch", {})
@@ -1594,70 +1974,40 @@ class PakeAnalyzerWindow(QMainWindow):
         
         # ดึง previous_context จาก batch (ถ้ามี)
         previous_context = batch.get("previous_context", "")
-        self.last_context = previous_context  # เก็บไว้ใช้ต่อ
+        state.last_context = previous_context  # เก็บไว้ใช้ต่อ
         
-        # --- Start Translation Thread ---
+        # Results are routed back to this stream's state (slots run on the GUI thread)
+        # --- Queue Translation ---
         if config.get("enable_translation"):
-            print(f"🔄 Starting Translation Thread for Batch #{batch_num}")
-            translate_thread = QThread()
+            print(f"🔄 Queueing Translation for Batch #{batch_num} [{stream_id}]")
             translate_worker = TranslateWorker(segments, batch_num)
-            translate_worker.moveToThread(translate_thread)
-            
-            translate_thread.started.connect(translate_worker.run)
-            translate_worker.finished.connect(self._update_translation)
-            translate_worker.finished.connect(translate_thread.quit)
-            translate_worker.finished.connect(translate_worker.deleteLater)
-            translate_thread.finished.connect(translate_thread.deleteLater)
-            
-            # SAFE Thread Cleanup
-            translate_thread.finished.connect(lambda: self._safe_remove_thread(translate_thread, translate_worker))
-            
-            # Keep reference to prevent garbage collection - CRITICAL!
-            self.active_threads.append(translate_thread)
-            self.active_workers.append(translate_worker)
-            translate_thread.start()
-        
-        # --- Start Analysis Thread (with full memory) ---
-        print(f"🔄 Starting Analysis Thread for Batch #{batch_num}")
-        analysis_thread = QThread()
+            translate_worker.finished.connect(lambda n, segs, sid=stream_id: self._update_translation(n, segs, sid))
+            self.jobs.submit(translate_worker, lane="translation", group=stream_id)
+        
+        # --- Queue Analysis (with this stream's memory) ---
+        print(f"🔄 Queueing Analysis for Batch #{batch_num} [{stream_id}]")
         analysis_worker = AnalysisWorker(
             text, batch_num, 
             previous_context=previous_context,
             memory={
-                "summaries": self.memory["summaries"].copy(),
-                "markets": self.memory["markets"].copy(),
-                "trend": self.memory["trend"].copy()
+                "summaries": state.memory["summaries"].copy(),
+                "markets": state.memory["markets"].copy(),
+                "trend": state.memory["trend"].copy()
             }
         )
-        analysis_worker.moveToThread(analysis_thread)
-        
-        analysis_thread.started.connect(analysis_worker.run)
-        analysis_worker.finished.connect(self._update_analysis)
-        analysis_worker.finished.connect(analysis_thread.quit)
-        analysis_worker.finished.connect(analysis_worker.deleteLater)
-        analysis_thread.finished.connect(analysis_thread.deleteLater)
-        analysis_thread.finished.connect(lambda: self.progress.hide())
-        
-        # SAFE Thread Cleanup
-        analysis_thread.finished.connect(lambda: self._safe_remove_thread(analysis_thread, analysis_worker))
-        
-        # Keep reference to prevent garbage collection - CRITICAL!
-        self.active_threads.append(analysis_thread)
-        self.active_workers.append(analysis_worker)
-        analysis_thread.start()
+        analysis_worker.partial.connect(lambda fields, sid=stream_id: self._update_analysis_partial(fields, sid))
+        analysis_worker.finished.connect(lambda result, sid=stream_id: self._update_analysis(result, sid))
+        analysis_worker.finished.connect(lambda _: self.progress.hide())
+        self.jobs.submit(analysis_worker, lane="analysis", group=stream_id)
         
-    def _update_translation(self, batch_num: int, segments: list):
+    def _update_translation(self, batch_num: int, segments: list, stream_id: str = None):
         if not segments:
             return
             
         now = datetime.datetime.now().strftime("%H:%M:%S")
         
-        # Header for the batch
-        header_html = f'''<div style="font-size:10px; color:#606070; margin-top:8px; margin-bottom:4px; border-bottom:1px solid #2a2a3a;">BATCH #{batch_num} • {now}</div>'''
-        
-        cursor = self.thai_view.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(header_html)
+        # Header for the batch, then its segments (one append for the whole batch)
+        rows = [Row("header", f"BATCH #{batch_num}{self._stream_tag(stream_id)} • {now}")]
         
         colors = ["#6366f1", "#a855f7", "#22c55e", "#ef4444", "#f59e0b"]
         
@@ -1671,73 +2021,36 @@ class PakeAnalyzerWindow(QMainWindow):
             except:
                 idx = 0
             color = colors[idx % len(colors)]
+            rows.append(Row("segment", text, speaker, color=color))
             
-            html = f'''<table style="width:100%; margin-bottom:6px; border-collapse:collapse;">
-        <tr>
-        <td style="width:90px; vertical-align:top; padding-right:8px;">
-        <span style="font-size:10px; color:{color}; font-weight:bold;">{speaker}</span>
-        </td>
-        <td style="vertical-align:top; border-left:2px solid {color}; padding-left:10px;">
-        <span style="font-size:13px; color:#e0e0e0;">{text}</span>
-        </td>
-        </tr>
-        </table>'''
-            cursor.insertHtml(html)
-            
-        self.thai_view.ensureCursorVisible()
-        
-    def _update_analysis(self, result: dict):
-        if "error" in result:
-            print(f"Analysis Error: {result['error']}")
-            return
-            
-        summary = result.get("summary", "-")
-        # 🔥 เพิ่ม: ติดตามแนวโน้มตัวเลข
-        self._track_numeric_trends(summary)
-        
+        self.thai_view.append_rows(rows)
+        
+    def _render_analysis_card(self, key: tuple, html: str):
+        """Insert the (stream_id, batch_num) card at the top of the AI feed, or redraw it in place"""
+        frame = self.analysis_cards.get(key)
+        if frame is None:
+            cursor = QTextCursor(self.ai_feed.document())
+            cursor.movePosition(QTextCursor.Start)
+            # Own frame per card: it keeps its place while newer cards go on top
+            frame = cursor.insertFrame(QTextFrameFormat())
+            self.analysis_cards[key] = frame
+            cursor = frame.firstCursorPosition()
+        else:
+            cursor = frame.firstCursorPosition()
+            cursor.setPosition(frame.lastPosition(), QTextCursor.KeepAnchor)
+        cursor.insertHtml(html)
+
+    def _analysis_card_html(self, result: dict) -> str:
         batch_num = result.get("batch_num", 0)
+        summary = result.get("summary", "-")
         prediction = result.get("prediction", "-")
         sentiment = result.get("sentiment", "NEUTRAL").upper()
         signal_strength = result.get("signal_strength", "MEDIUM")
         consistency_note = result.get("consistency_note", "")
-        
-        # เพิ่มข้อมูลแนวโน้มใน consistency_note
-        trend_note = ""
-        if self.trend_tracker["last_direction"] == "down":
-            trend_note = " (แนวโน้มเงินเฟ้อลดลง → dovish)"
-        elif self.trend_tracker["last_direction"] == "up":
-            trend_note = " (แนวโน้มเงินเฟ้อเพิ่มขึ้น → hawkish)"
-        
-        if trend_note:
-            consistency_note += trend_note
         speaker_identified = result.get("speaker_identified", "")
         gold = result.get("gold", "-")
         forex = result.get("forex", "-")
         stock = result.get("stock", "-")
-        
-        # 🧠 Enhanced Memory Storage
-        self.memory["summaries"].append({"batch": batch_num, "summary": summary, "sentiment": sentiment})
-        self.memory["markets"].append({"batch": batch_num, "gold": gold, "forex": forex, "stock": stock})
-        
-        # Update trend counter
-        if "HAWK" in sentiment:
-            self.memory["trend"]["hawkish"] += 1
-        elif "DOVE" in sentiment:
-            self.memory["trend"]["dovish"] += 1
-        else:
-            self.memory["trend"]["neutral"] += 1
-        
-        # Keep max 10 entries
-        if len(self.memory["summaries"]) > 10:
-            self.memory["summaries"].pop(0)
-        if len(self.memory["markets"]) > 10:
-            self.memory["markets"].pop(0)
-        
-        # Update trend indicator in header
-        self._update_trend_indicator()
-        
-        print(f"🧠 Memory: {len(self.memory['summaries'])} summaries, Trend: {self.memory['trend']}")
-        
         now = datetime.datetime.now().strftime("%H:%M:%S")
         
         s_color = "#606070"
@@ -1755,7 +2068,7 @@ class PakeAnalyzerWindow(QMainWindow):
         html = f'''<table style="width:100%; margin-bottom:14px; background:#1a1a24; border-radius:8px; border:1px solid #2a2a3a;">
 <tr><td style="padding:12px;">
 <div style="margin-bottom:8px; font-size:10px; color:#606070;">
-BATCH #{batch_num} • {now}
+BATCH #{batch_num}{self._stream_tag(result.get("stream_id"))} • {now}
 <span style="margin-left:8px; color:{str_color}; font-size:9px;">⚡{signal_strength}</span>
 <span style="float:right; color:{s_color}; font-weight:bold; background:{s_bg}; padding:2px 8px; border-radius:4px;">{sentiment}</span>
 </div>
@@ -1780,40 +2093,170 @@ BATCH #{batch_num} • {now}
 </div>
 </td></tr>
 </table>'''
+        return html
+
+    def _update_analysis_partial(self, fields: dict, stream_id: str = None):
+        """Streaming: show the card as soon as its first fields are complete (latest fields per flush)"""
+        key = (self._stream(stream_id).stream_id, fields.get("batch_num", 0))
+        self.ui_updates.post("analysis_partial", fields, key=key)
+
+    def _flush_analysis_partials(self, pending: dict):
+        for key, fields in pending.items():
+            card = {field: "…" for field in ("summary", "prediction", "sentiment", "signal_strength", "gold", "forex", "stock")}
+            card.update(fields, stream_id=key[0])
+            self._render_analysis_card(key, self._analysis_card_html(card))
+
+    def _update_analysis(self, result: dict, stream_id: str = None):
+        state = self._stream(stream_id)
+        stream_id = state.stream_id
+        tag = self._stream_tag(stream_id)
+        batch_num = result.get("batch_num", 0)
+        key = (stream_id, batch_num)
+        # The final card replaces the streamed one: a partial still waiting must not overwrite it
+        self.ui_updates.discard("analysis_partial", key)
+        if "error" in result:
+            print(f"Analysis Error: {result['error']}")
+            if key in self.analysis_cards:
+                self._render_analysis_card(key, f"<div style='font-size:10px; color:#ef4444;'>BATCH #{batch_num}{tag} • analysis failed</div>")
+                del self.analysis_cards[key]
+            return
+
+        if "prefiltered" in result:
+            # No LLM call: a compact card, and no effect on memory / trend
+            local = result["prefiltered"]
+            label = "administrative" if local["label"] == "ADMIN" else "no policy signal"
+            self._render_analysis_card(key,
+                f"<div style='font-size:10px; color:#606070; margin-bottom:10px;'>BATCH #{batch_num}{tag} • "
+                f"{datetime.datetime.now().strftime('%H:%M:%S')} • ⏭️ {label} ({local['confidence']:.0%}) - skipped AI analysis</div>")
+            self.analysis_cards.pop(key, None)
+            # The big picture still follows the batch count
+            self._maybe_update_big_picture(batch_num, stream_id)
+            return
+            
+        summary = result.get("summary", "-")
+        # 🔥 เพิ่ม: ติดตามแนวโน้มตัวเลข (ของ stream นี้)
+        self._track_numeric_trends(summary, state.trend_tracker)
         
-        cursor = self.ai_feed.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        cursor.insertHtml(html)
+        prediction = result.get("prediction", "-")
+        sentiment = result.get("sentiment", "NEUTRAL").upper()
+        signal_strength = result.get("signal_strength", "MEDIUM")
+        consistency_note = result.get("consistency_note", "")
+        
+        # เพิ่มข้อมูลแนวโน้มใน consistency_note
+        trend_note = ""
+        if state.trend_tracker["last_direction"] == "down":
+            trend_note = " (แนวโน้มเงินเฟ้อลดลง → dovish)"
+        elif state.trend_tracker["last_direction"] == "up":
+            trend_note = " (แนวโน้มเงินเฟ้อเพิ่มขึ้น → hawkish)"
+        
+        if trend_note:
+            consistency_note += trend_note
+        speaker_identified = result.get("speaker_identified", "")
+        gold = result.get("gold", "-")
+        forex = result.get("forex", "-")
+        stock = result.get("stock", "-")
+        
+        # 🧠 Enhanced Memory Storage (per stream)
+        memory = state.memory
+        memory["summaries"].append({"batch": batch_num, "summary": summary, "sentiment": sentiment})
+        memory["markets"].append({"batch": batch_num, "gold": gold, "forex": forex, "stock": stock})
+        
+        # Update trend counter
+        if "HAWK" in sentiment:
+            memory["trend"]["hawkish"] += 1
+        elif "DOVE" in sentiment:
+            memory["trend"]["dovish"] += 1
+        else:
+            memory["trend"]["neutral"] += 1
+        
+        # Keep max 10 entries
+        if len(memory["summaries"]) > 10:
+            memory["summaries"].pop(0)
+        if len(memory["markets"]) > 10:
+            memory["markets"].pop(0)
+        
+        # Update trend indicator in header
+        self._update_trend_indicator()
+        
+        print(f"🧠 Memory [{stream_id}]: {len(memory['summaries'])} summaries, Trend: {memory['trend']}")
+        
+        self._render_analysis_card(key, self._analysis_card_html({**result, "consistency_note": consistency_note,
+                                                                  "stream_id": stream_id}))
+        self.analysis_cards.pop(key, None)
+        self._maybe_update_big_picture(batch_num, stream_id)
 
+    def _maybe_update_big_picture(self, batch_num: int, stream_id: str):
+        memory = self._stream(stream_id).memory
         # 🔥 TRIGGER BIG PICTURE UPDATE
         # อัปเดตทุกๆ 2 Batches (ไวขึ้น) เพื่อจับความเปลี่ยนแปลงได้ทันที
         # ส่วนการส่ง Telegram จะถูกคุมด้วย Logic ใน _update_big_picture
-        if batch_num > 0 and (batch_num % 2 == 0 or batch_num == 1):
+        # (prefiltered batches count too; nothing to summarise before the first analysis)
+        if batch_num > 0 and (batch_num % 2 == 0 or batch_num == 1) and memory["summaries"]:
              # Remove blocking cooldown here to allow analysis to run
             print("🌍 Triggering Global Summary Update...")
             self.last_big_picture_time = time.time()
             
-            # สร้าง Thread สำหรับ Summary แยกต่างหาก
-            summary_thread = QThread()
             # ส่งประวัติสรุปทั้งหมดไปให้ AI วิเคราะห์ (Copy of list created in __init__)
-            summary_worker = SessionSummaryWorker(self.memory["summaries"]) 
-            summary_worker.moveToThread(summary_thread)
-            
-            summary_thread.started.connect(summary_worker.run)
-            summary_worker.finished.connect(self._update_big_picture) # สร้างฟังก์ชันนี้รับผล
-            summary_worker.finished.connect(summary_thread.quit)
-            summary_worker.finished.connect(summary_worker.deleteLater)
-            summary_thread.finished.connect(summary_thread.deleteLater)
-            summary_thread.finished.connect(lambda: self._cleanup_finished_threads())
-            
-            self.active_threads.append(summary_thread)
-            # self.active_workers.append(summary_worker)  <-- Delete later handles this, no need to keep strict ref if deleteLater is connected
-            # But we keep it to be safe against GC during execution
-            self.active_workers.append(summary_worker)
-            summary_thread.start()
+            # key="summary": a newer summary replaces one still waiting in the queue
+            summary_worker = SessionSummaryWorker(memory["summaries"]) 
+            summary_worker.partial.connect(lambda fields, sid=stream_id: self._update_big_picture_partial(fields, sid))
+            summary_worker.finished.connect(lambda data, sid=stream_id: self._update_big_picture(data, sid)) # สร้างฟังก์ชันนี้รับผล
+            self.jobs.submit(summary_worker, lane="summary", key=("summary", stream_id), group=stream_id)
 
     # เพิ่มฟังก์ชันใหม่สำหรับแสดงผล Big Picture
-    def _update_big_picture(self, data: dict):
+    def _big_picture_html(self, data: dict) -> str:
+        topic = data.get("main_topic", "-")
+        points = data.get("key_points", [])
+        sentiment = data.get("overall_sentiment", "NEUTRAL")
+        market = data.get("market_implication", "-")
+        confidence = data.get("confidence_score", "-")
+        
+        # สร้าง HTML สวยๆ
+        points_html = "".join([f"<li style='margin-bottom:4px;'>{p}</li>" for p in points])
+        
+        color = "#f59e0b"
+        bg_color = "rgba(245, 158, 11, 0.1)"
+        if "HAWK" in sentiment: 
+            color = "#ef4444"
+            bg_color = "rgba(239, 68, 68, 0.1)"
+        elif "DOVE" in sentiment: 
+            color = "#22c55e"
+            bg_color = "rgba(34, 197, 94, 0.1)"
+        
+        html = f"""
+        <div style='font-weight:bold; font-size:16px; color:#e0e0e0; margin-bottom:8px; border-bottom: 1px solid #2a2a3a; padding-bottom:5px;'>
+            📌 {topic}
+        </div>
+        
+        <div style='background:{bg_color}; border-left: 3px solid {color}; padding: 8px; margin-bottom: 10px; border-radius: 4px;'>
+            <div style='font-size:10px; color:{color}; font-weight:bold; margin-bottom:2px;'>INTELLIGENCE ASSESSMENT</div>
+            <span style='font-size:12px; font-weight:bold; color:#e0e0e0;'>SENTIMENT: {sentiment}</span>
+            <span style='float:right; font-size:10px; color:#808090;'>Confidence: {confidence}/10</span>
+        </div>
+        
+        <ul style='margin:0; padding-left:15px; color:#b0b0c0; font-size:13px; margin-bottom:12px;'>
+            {points_html}
+        </ul>
+        
+        <div style='background:#2a2a3a; padding:8px; border-radius:4px;'>
+                <div style='font-size:12px; color:#e0e0e0; font-style:italic;'>"{market}"</div>
+        </div>
+        """
+        return html
+
+    def _update_big_picture_partial(self, fields: dict, stream_id: str = None):
+        """Streaming: fill the Big Picture panel as fields complete (latest fields per flush)"""
+        self.ui_updates.post("big_picture_partial", fields, key=self._stream(stream_id).stream_id)
+
+    def _flush_big_picture_partial(self, pending: dict):
+        # One panel: the stream that streamed last wins
+        data = {"main_topic": "…", "overall_sentiment": "…", "market_implication": "…", "confidence_score": "…",
+                **list(pending.values())[-1]}
+        self.big_picture_view.setHtml(self._big_picture_html(data))
+
+    def _update_big_picture(self, data: dict, stream_id: str = None):
+        state = self._stream(stream_id)
+        self.ui_updates.discard("big_picture_partial", state.stream_id)
         if not data: return
         
         topic = data.get("main_topic", "-")
@@ -1826,13 +2269,13 @@ BATCH #{batch_num} • {now}
         current_points_str = " ".join(points)
         similarity = 0.0
         
-        if hasattr(self, 'last_big_picture_points') and self.last_big_picture_points:
-            matcher = difflib.SequenceMatcher(None, self.last_big_picture_points, current_points_str)
+        if state.big_picture_points:
+            matcher = difflib.SequenceMatcher(None, state.big_picture_points, current_points_str)
             similarity = matcher.ratio()
-            print(f"🧐 Big Picture Similarity: {similarity*100:.1f}%")
+            print(f"🧐 Big Picture Similarity [{state.stream_id}]: {similarity*100:.1f}%")
             
         # Store for next time
-        self.last_big_picture_points = current_points_str
+        state.big_picture_points = current_points_str
         
         
         # 🧠 Smart Notification Logic
@@ -1857,7 +2300,7 @@ BATCH #{batch_num} • {now}
         html = f"""
         <div style="background-color:#2a2a3a; border-left:4px solid #f59e0b; padding:10px; margin:10px 0;">
             <div style="font-size:11px; color:#f59e0b; font-weight:bold; margin-bottom:4px;">
-                🌍 BIG PICTURE UPDATE {f'(Sim: {similarity*100:.0f}%)' if similarity > 0 else ''}
+                🌍 BIG PICTURE UPDATE{self._stream_tag(state.stream_id)} {f'(Sim: {similarity*100:.0f}%)' if similarity > 0 else ''}
             </div>
             <div style="font-size:13px; color:#e0e0e0;"><b>Topic:</b> {topic}</div>
             <div style="font-size:12px; color:#c0c0c0; margin-top:4px;">
@@ -1868,10 +2311,7 @@ BATCH #{batch_num} • {now}
             </div>
         </div>
         """
-        cursor = self.transcript.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(html)
-        self.transcript.ensureCursorVisible()
+        self.ui_updates.post("transcript", Row("html", html))
         
         # 2. Update Telegram
         if should_post:
@@ -1889,43 +2329,7 @@ BATCH #{batch_num} • {now}
         else:
             print(f"💤 Skipping Telegram Post (Sim: {similarity*100:.0f}% | Last: {int(now - self.last_telegram_post_time)}s ago)")
         
-        sentiment = data.get("overall_sentiment", "NEUTRAL")
-        market = data.get("market_implication", "-")
-        confidence = data.get("confidence_score", "-")
-        
-        # สร้าง HTML สวยๆ
-        points_html = "".join([f"<li style='margin-bottom:4px;'>{p}</li>" for p in points])
-        
-        color = "#f59e0b"
-        bg_color = "rgba(245, 158, 11, 0.1)"
-        if "HAWK" in sentiment: 
-            color = "#ef4444"
-            bg_color = "rgba(239, 68, 68, 0.1)"
-        elif "DOVE" in sentiment: 
-            color = "#22c55e"
-            bg_color = "rgba(34, 197, 94, 0.1)"
-        
-        html = f"""
-        <div style='font-weight:bold; font-size:16px; color:#e0e0e0; margin-bottom:8px; border-bottom: 1px solid #2a2a3a; padding-bottom:5px;'>
-            📌 {topic}
-        </div>
-        
-        <div style='background:{bg_color}; border-left: 3px solid {color}; padding: 8px; margin-bottom: 10px; border-radius: 4px;'>
-            <div style='font-size:10px; color:{color}; font-weight:bold; margin-bottom:2px;'>INTELLIGENCE ASSESSMENT</div>
-            <span style='font-size:12px; font-weight:bold; color:#e0e0e0;'>SENTIMENT: {sentiment}</span>
-            <span style='float:right; font-size:10px; color:#808090;'>Confidence: {confidence}/10</span>
-        </div>
-        
-        <ul style='margin:0; padding-left:15px; color:#b0b0c0; font-size:13px; margin-bottom:12px;'>
-            {points_html}
-        </ul>
-        
-        <div style='background:#2a2a3a; padding:8px; border-radius:4px;'>
-                <div style='font-size:12px; color:#e0e0e0; font-style:italic;'>"{market}"</div>
-        </div>
-        """
-        
-        self.big_picture_view.setHtml(html)
+        self.big_picture_view.setHtml(self._big_picture_html(data))
         
         # Scroll to top just in case
         self.big_picture_view.verticalScrollBar().setValue(0)
@@ -1975,10 +2379,12 @@ BATCH #{batch_num} • {now}
             tg_manager.log_activity("ERROR", f"Big Picture Error: {e}")
     
     def _update_trend_indicator(self):
-        """Update the overall trend indicator in header"""
-        trend = self.memory["trend"]
+        """Update the overall trend indicator in header (for the selected stream)"""
+        trend = self._stream(self._selected_stream()).memory["trend"]
         total = trend["hawkish"] + trend["dovish"] + trend["neutral"]
         if total == 0:
+            self.trend_label.setText("📊 TREND: -")
+            self.trend_label.setStyleSheet("font-size: 11px; color: #606070; padding: 4px 10px; background: #1a1a24; border-radius: 4px; margin-left: 20px;")
             return
         
         # Find dominant trend
@@ -2005,14 +2411,11 @@ BATCH #{batch_num} • {now}
         
     def closeEvent(self, event):
         # Stop server first
-        self.server.stop()
-        self.server.wait(1000)
-        
-        # Wait for all active threads to finish
-        for thread in self.active_threads:
-            if thread.isRunning():
-                thread.quit()
-                thread.wait(2000)  # Wait up to 2 seconds per thread
+        self.ipc_server.close()
+        self._close_ring()
+        
+        # Drop queued LLM jobs and give running ones a moment to finish
+        self.jobs.wait(2000)
         
         event.accept()
 
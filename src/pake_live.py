@@ -1,18 +1,30 @@
-import json
 import os
+import queue
+import socket
 import subprocess
 import sys
 import threading
 import time
-import datetime
 import httpx
 from dotenv import load_dotenv
-import websocket # pip install websocket-client
 from pathlib import Path
 
-# Load environment variables
+# Load environment variables (before the local imports: they read their settings at import time)
 load_dotenv()
 
+from audio_ingest import AudioIngest, FRAME_BYTES
+from batch_scheduler import BatchTimer
+from deepgram_transport import ReconnectingTransport
+from gui_outbox import GuiOutbox, spool_path_for
+from live_async import (KEEPALIVE_AFTER, KEEPALIVE_INTERVAL, AsyncAudioSource, async_runner,
+                        result_handoff, run_stream)
+import ipc_transport
+from ipc_protocol import IpcReader, client_handshake, encode_message
+from ipc_transport import ShmRing
+from live_session import DEFAULT_STREAM_ID, Session, SessionRegistry
+from transcript_journal import TranscriptJournal, final_path, write_final
+from vad import VAD_ENABLED
+
 # Detect venv Python path
 SCRIPT_DIR = Path(__file__).parent.resolve()
 VENV_PYTHON = SCRIPT_DIR / ".venv310" / "Scripts" / "python.exe"
@@ -27,28 +39,19 @@ if not DEEPGRAM_API_KEY:
     print("Error: DEEPGRAM_KEY not found in .env")
     sys.exit(1)
 
-# Batch Configuration
-BATCH_SIZE = 10          
-BATCH_INTERVAL = 30      
+# Batch Configuration (batch timing lives in batch_scheduler, BATCH_* in .env)
 CONTEXT_WINDOW = 500     
 
-# Global State
-session_data = {
-    "meta": {"url": "", "title": "Waiting...", "started_at": ""},
-    "segments": []
-}
+# Streaming Mode: "thread" (WebSocketApp + producer/consumer threads) or "async" (shared event loop)
+STREAM_MODE = os.getenv("STREAM_MODE", "thread").strip().lower()
 
-batch_state = {
-    "buffer": [],              
-    "last_send_time": None,    
-    "batch_count": 0,          
-    "sent_context": ""         
-}
+# Global State: one Session per stream id
+sessions = SessionRegistry()
 
 # Control State
-is_running = False
-current_ws = None
 gui_socket = None
+gui_codec = None  # Negotiated IPC codec; None = legacy NDJSON
+gui_ring = None   # ShmRing carrying backend -> GUI messages (shm transport)
 socket_lock = threading.Lock()
 
 # Deepgram WebSocket URL (Nova-2)
@@ -60,75 +63,152 @@ DEEPGRAM_URL = (
 )
 
 def connect_to_gui():
-    """Establish TCP connection to GUI server and start listener"""
-    global gui_socket
-    import socket
+    """Connect to the GUI over the configured IPC transport and start listener"""
+    global gui_socket, gui_codec, gui_ring
+    kind, control, address = ipc_transport.settings()
     
     while True:
+        ring = None
         try:
-            print(f"🔗 Connecting to GUI (localhost:8765)...")
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.connect(('localhost', 8765))
-            gui_socket = s
-            print(f"✅ GUI Connected! Waiting for commands...")
+            print(f"🔗 Connecting to GUI ({control}: {address})...")
+            s = ipc_transport.connect(control, address)
+            # Offer the shared-memory ring for segment traffic if configured
+            offer = {}
+            if kind == "shm":
+                ring = ShmRing.create()
+                offer["shm"] = {"name": ring.name, "size": ring.capacity}
+            # Negotiate framed IPC before anything else is sent
+            codec, reader, pending, ack = client_handshake(s, **offer)
+            if ring and not (ack and ack.get("shm")):
+                print("⚠️ GUI did not attach the shared-memory ring, using the socket")
+                ring.close()
+                ring = None
+            with socket_lock:
+                gui_codec = codec
+                gui_ring = ring
+                gui_socket = s
+            protocol = f"framed/{codec.name}" if codec else "ndjson (legacy GUI)"
+            print(f"✅ GUI Connected ({protocol}{' + shm ring' if ring else ''})! Waiting for commands...")
+            gui_outbox.connected()
             
             # Start listener thread
-            threading.Thread(target=listen_to_gui, args=(s,), daemon=True).start()
+            threading.Thread(target=listen_to_gui, args=(s, reader, pending), daemon=True).start()
             return
         except Exception as e:
+            if ring:
+                ring.close()
             print(f"⚠️ GUI connection failed: {e}. Retrying in 3s...")
             time.sleep(3)
 
-def listen_to_gui(sock):
-    """Listen for commands from GUI"""
-    global is_running
-    buffer = ""
+def close_gui_ring():
+    """Unlink the shared-memory ring (it would outlive the process otherwise)"""
+    global gui_ring
+    with socket_lock:
+        if gui_ring:
+            gui_ring.close()
+            gui_ring = None
+
+def drop_gui_connection(sock):
+    """Forget a dead GUI link; the outbox spools to disk until we reconnect"""
+    global gui_socket
+    with socket_lock:
+        if gui_socket is sock:
+            gui_socket = None
+    close_gui_ring()
+    gui_outbox.disconnected()
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+def listen_to_gui(sock, reader=None, pending=()):
+    """Listen for commands from GUI; reconnects when the GUI goes away"""
+    reader = reader or IpcReader()
+    for cmd in pending:
+        handle_command(cmd)
     while True:
         try:
-            data = sock.recv(4096).decode('utf-8')
+            data = sock.recv(65536)
             if not data:
                 print("❌ GUI Disconnected")
-                os._exit(0) # Exit if GUI closes
+                break
             
-            buffer += data
-            while "\n" in buffer:
-                line, buffer = buffer.split("\n", 1)
-                if not line.strip(): continue
-                handle_command(json.loads(line))
+            for cmd in reader.feed(data):
+                handle_command(cmd)
         except Exception as e:
             print(f"❌ Socket Read Error: {e}")
             break
+    
+    # Sessions keep transcribing; GUI traffic is spooled until it is back
+    drop_gui_connection(sock)
+    connect_to_gui()
 
 def handle_command(cmd):
-    """Process incoming JSON commands"""
-    global is_running
+    """Process incoming JSON commands (START/STOP target one stream_id)"""
     print(f"📩 Command Received: {cmd}")
     
     msg_type = cmd.get("type")
+    stream_id = cmd.get("stream_id")
     
     if msg_type == "START":
         url = cmd.get("url")
         if not url: return
-        print(f"🚀 START COMMAND: {url}")
-        if is_running:
-            stop_transcription()
-        start_transcription(url)
+        stream_id = stream_id or DEFAULT_STREAM_ID
+        mode = cmd.get("mode") or STREAM_MODE
+        vad = bool(cmd.get("vad", VAD_ENABLED))
+        print(f"🚀 START COMMAND [{stream_id}]: {url} (mode={mode}, vad={vad})")
+        # Only restart this stream; others keep running
+        if stream_id in sessions:
+            stop_transcription(stream_id)
+        start_transcription(url, mode, stream_id, vad)
         
     elif msg_type == "STOP":
-        print("🛑 STOP COMMAND")
-        stop_transcription()
+        if stream_id:
+            print(f"🛑 STOP COMMAND [{stream_id}]")
+            stop_transcription(stream_id)
+        else:
+            # Legacy STOP without a stream id stops everything
+            print("🛑 STOP COMMAND (all streams)")
+            for sid in sessions.ids():
+                stop_transcription(sid)
+
+def broadcast_to_gui(session, payload):
+    """Queue data for the local GUI (never blocks the caller)"""
+    payload["stream_id"] = session.stream_id
+    gui_outbox.put(payload, owner=session.session_id)
+
+def _write_to_gui(payload):
+    """Blocking write of one message; runs on the outbox writer thread"""
+    with socket_lock:
+        # Codec, socket and ring are swapped together by the handshake: encode
+        # with the codec of the link the bytes are written to
+        sock, ring, codec = gui_socket, gui_ring, gui_codec
+        if not sock:
+            raise ConnectionError("GUI not connected")
+        if codec is not None and payload.get("type") == "batch":
+            # A framed GUI already has the segment bodies cached by id,
+            # so only the ids go over the wire
+            data = payload["data"]
+            gui_batch = {k: v for k, v in data["current_batch"].items() if k != "segments"}
+            payload = {**payload, "data": {**data, "current_batch": gui_batch}}
+        data = encode_message(payload, codec)
+        try:
+            if ring:
+                ring.write(data)
+            else:
+                sock.sendall(data)
+        except Exception:
+            # Wake the listener so it drops the link and reconnects
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            raise
 
-def broadcast_to_gui(payload):
-    """Send data to local GUI via TCP socket"""
-    global gui_socket
-    if not gui_socket: return
-        
-    try:
-        with socket_lock:
-            message = json.dumps(payload) + '\n'
-            gui_socket.sendall(message.encode('utf-8'))
-    except Exception as e:
-        print(f"⚠️ GUI send error: {e}")
+# Outbound GUI queue: bounded, coalescing, spools finals while the GUI is away
+# (one spool per GUI address; spooled messages of ended sessions are not replayed)
+gui_outbox = GuiOutbox(_write_to_gui, spool_path=spool_path_for(ipc_transport.settings()[2]),
+                       is_live=sessions.is_live)
 
 # --- Core Logic ---
 
@@ -142,121 +222,127 @@ def get_video_title(url):
     except Exception:
         return "Live Stream / Unknown"
 
-def start_transcription(url):
-    global is_running, session_data, batch_state
+def start_transcription(url, mode=STREAM_MODE, stream_id=DEFAULT_STREAM_ID, vad=VAD_ENABLED):
+    # Fresh State for this stream
+    session = Session(stream_id, url, title=get_video_title(url), mode=mode, vad=vad)
+    session.journal = TranscriptJournal.for_session(session)
+    session.is_running = True
+    sessions.add(session)
     
-    is_running = True
+    if mode == "async":
+        # Run as a coroutine on the shared event loop
+        session.stream = async_runner.submit(run_deepgram_pipeline_async(session))
+    else:
+        # Run in separate thread
+        threading.Thread(target=run_deepgram_pipeline, args=(session,), daemon=True).start()
+    return session
+
+def stop_transcription(stream_id=DEFAULT_STREAM_ID):
+    session = sessions.pop(stream_id)
+    if not session: return
+    session.is_running = False
+    session.close_connection()
+    # Finals already handed off by an async stream belong in the final batch
+    result_handoff.drain()
     
-    # Reset State
-    session_data = {
-        "meta": {
-            "url": url,
-            "title": get_video_title(url),
-            "started_at": datetime.datetime.now().isoformat()
-        },
-        "segments": []
-    }
-    batch_state = {
-        "buffer": [], "last_send_time": None, "batch_count": 0, "sent_context": ""
-    }
+    audio = session.audio.as_dict()
+    session.meta["audio"] = audio
+    print(f"📊 Audio [{stream_id}]: read {audio['seconds_read']}s, sent {audio['seconds_sent']}s "
+          f"({audio['saved_pct']}% saved, {audio['reconnects']} reconnects)")
+    print(f"📊 GUI outbox: {gui_outbox.metrics()}")
     
-    # Run in separate thread
-    threading.Thread(target=run_deepgram_pipeline, args=(url,), daemon=True).start()
-
-def stop_transcription():
-    global is_running, current_ws
-    is_running = False
-    if current_ws:
-        current_ws.close()
+    # Trigger Final Save & Report (compaction runs off the command thread;
+    # the journal already holds every segment if we die before it finishes)
+    threading.Thread(target=save_transcript, args=(session,)).start()
+    send_final_summary(session)
+    print(f"✅ Stopped [{stream_id}].")
+
+def run_deepgram_pipeline(session):
+    url = session.meta["url"]
+    headers = {"Authorization": f"Token {DEEPGRAM_API_KEY}"}
     
-    # Trigger Final Save & Report
-    save_transcript()
-    send_final_summary()
-    print("✅ Stopped.")
-
-def run_deepgram_pipeline(url):
-    global current_ws
+    def on_result(data):
+        if not session.is_running: return
+        try:
+            process_deepgram_message(session, data)
+        except: pass
     
-    headers = {"Authorization": f"Token {DEEPGRAM_API_KEY}"}
+    # Reconnecting WebSocket: replays the last few seconds of audio after a drop
+    gate = session.gate
+    transport = ReconnectingTransport(DEEPGRAM_URL, headers, on_result,
+                                      to_stream=gate.to_stream_time, stats=session.audio)
+    session.ws = transport
+    if not transport.connect():
+        return
     
-    # Audio Pipeline Function
-    def send_audio(ws):
-        import queue
-        audio_queue = queue.Queue(maxsize=100)
-        
-        print(f"🎧 Starting Audio Stream: {url}")
-        
-        # 1. Audio Producer Thread
-        def producer():
-            pipeline_cmd = (
-                f'"{VENV_PYTHON}" -m yt_dlp "{url}" -o - -q --no-warnings | '
-                'ffmpeg -hide_banner -loglevel panic -i pipe:0 -f s16le -ac 1 -ar 16000 pipe:1'
-            )
-            process = None
+    print(f"🎧 Starting Audio Stream: {url}")
+    
+    # 1. Audio Producer (yt_dlp -> ffmpeg, owned directly, no shell)
+    # Lives across reconnects so no audio is lost while the socket is down
+    ingest = AudioIngest(url, python=VENV_PYTHON).start()
+    
+    # 2. Audio Consumer (VAD gate + Keep-Alive)
+    last_data_time = time.time()
+    silence_chunk = bytes(FRAME_BYTES) # 100ms of silence
+    keepalive_after = KEEPALIVE_INTERVAL if gate.enabled else KEEPALIVE_AFTER
+    
+    try:
+        while session.is_running:
             try:
-                process = subprocess.Popen(pipeline_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, bufsize=10**6)
-                while is_running:
-                    data = process.stdout.read(4096)
-                    if not data: break
-                    audio_queue.put(data)
-            except Exception as e:
-                print(f"❌ Producer Error: {e}")
-            finally:
-                if process: process.terminate()
-                audio_queue.put(None) # Signal end
-        
-        threading.Thread(target=producer, daemon=True).start()
-        
-        # 2. Audio Consumer (with Keep-Alive)
-        last_data_time = time.time()
-        silence_chunk = b'\x00' * 3200 # 100ms of silence
-        
-        try:
-            while is_running:
+                # Wait for the next frame with small timeout
+                frame = ingest.get(timeout=0.1)
+                if frame is None: break
+                
+                session.audio.bytes_read += len(frame)
                 try:
-                    # Non-blocking get from queue with small timeout
-                    chunk = audio_queue.get(timeout=0.1)
-                    if chunk is None: break
-                    
-                    ws.send(chunk, opcode=websocket.ABNF.OPCODE_BINARY)
-                    last_data_time = time.time()
-                except queue.Empty:
-                    # If queue is empty for more than 1 second, send silence to keep connection alive
-                    if time.time() - last_data_time > 1.0:
-                        ws.send(silence_chunk, opcode=websocket.ABNF.OPCODE_BINARY)
+                    for chunk in gate.feed(frame):
+                        transport.send(chunk)
                         last_data_time = time.time()
+                finally:
+                    ingest.release(frame)
+            except queue.Empty:
+                pass
             
-            ws.send('{"type": "CloseStream"}')
-        except Exception as e:
-            print(f"❌ Audio Consumer Error: {e}")
-        finally:
-            ws.close()
-
-    # WebSocket Callbacks
-    def on_open(ws):
-        print("🟢 Deepgram Connected")
-        threading.Thread(target=send_audio, args=(ws,), daemon=True).start()
-
-    def on_message(ws, message):
-        if not is_running: return
-        try:
-            process_deepgram_message(json.loads(message))
-        except: pass
-
-    def on_error(ws, error):
-        print(f"\nWebSocket Error: {error}")
-
-    def on_close(ws, close_status_code, close_msg):
-        print("\nDeepgram Connection closed")
+            if time.time() - last_data_time > keepalive_after:
+                if gate.enabled:
+                    # Silence is being dropped: KeepAlive holds the socket without audio
+                    transport.keepalive()
+                else:
+                    # No audio for more than 1 second: send silence to keep connection alive
+                    transport.send(silence_chunk)
+                last_data_time = time.time()
         
-    current_ws = websocket.WebSocketApp(
-        DEEPGRAM_URL, header=headers,
-        on_open=on_open, on_message=on_message,
-        on_error=on_error, on_close=on_close
-    )
-    current_ws.run_forever()
-
-def process_deepgram_message(data):
+        transport.finish()
+    except Exception as e:
+        print(f"❌ Audio Consumer Error: {e}")
+    finally:
+        ingest.stop()
+        if not session.is_running:
+            transport.close()
+        print(f"\nDeepgram Connection closed [{session.stream_id}]")
+
+async def run_deepgram_pipeline_async(session):
+    """Async mode: audio, WebSocket and GUI broadcast share one event loop"""
+    url = session.meta["url"]
+    headers = {"Authorization": f"Token {DEEPGRAM_API_KEY}"}
+    print(f"🎧 Starting Audio Stream (async): {url}")
+    
+    def on_result(data):
+        # Runs on the event loop: batching takes session.batch_lock, so it is
+        # handed to the result thread instead of run here
+        if session.is_running:
+            result_handoff.put(process_deepgram_message, session, data)
+    
+    try:
+        await run_stream(
+            AsyncAudioSource(url, python=VENV_PYTHON), on_result,
+            lambda: session.is_running, DEEPGRAM_URL, headers,
+            gate=session.gate, stats=session.audio
+        )
+    except Exception as e:
+        print(f"❌ Async Pipeline Error: {e}")
+
+def process_deepgram_message(session, data):
     if "channel" in data:
         alternatives = data["channel"]["alternatives"]
         if alternatives:
@@ -270,7 +356,7 @@ def process_deepgram_message(data):
                 if words and "speaker" in words[0]:
                     speaker_id = words[0]["speaker"]
                 
-                speaker_label = f"[Speaker {speaker_id}] "
+                speaker_label = f"[{session.stream_id}][Speaker {speaker_id}] "
                 
                 if is_final:
                     start = data.get("start", 0.0)
@@ -282,52 +368,79 @@ def process_deepgram_message(data):
                         "start": start,
                         "end": end
                     }
-                    session_data["segments"].append(segment)
-                    add_to_batch(segment)
+                    add_to_batch(session, segment, data.get("speech_final", False))
+                    if session.journal:
+                        session.journal.append(segment)
                     
                     sys.stdout.write(f"\r[ FINAL ] {speaker_label}{transcript}\n")
                     sys.stdout.flush()
                 else:
+                    # Coalesced by the outbox: only the newest interim per stream is sent
+                    broadcast_to_gui(session, {"type": "interim", "data": {
+                        "speaker": f"Speaker {speaker_id}",
+                        "text": transcript,
+                        "start": data.get("start", 0.0)
+                    }})
                     sys.stdout.write(f"\r[Interim] {speaker_label}{transcript}")
                     sys.stdout.flush()
 
-def add_to_batch(segment):
-    batch_state["buffer"].append(segment)
-    if batch_state["last_send_time"] is None:
-        batch_state["last_send_time"] = time.time()
-    
-    # Send to GUI immediately
-    broadcast_to_gui({"type": "segment", "data": segment})
-    
-    # Check Batch trigger
-    elapsed = time.time() - batch_state["last_send_time"]
-    if len(batch_state["buffer"]) >= BATCH_SIZE or elapsed >= BATCH_INTERVAL:
-        send_batch()
-
-def send_batch():
-    if not batch_state["buffer"]: return
+def add_to_batch(session, segment, speech_final=False):
+    # Store, send and schedule in one lock hold: the batch timer must not cut
+    # a batch between a segment's id and its body reaching the GUI outbox
+    with session.batch_lock:
+        segment_id = session.segments.append(segment)
+        # Send to GUI immediately (the id lets framed batches reference it later)
+        broadcast_to_gui(session, {"type": "segment", "id": segment_id, "data": segment})
+
+        # Check Batch trigger (the batch timer covers quiet periods)
+        session.scheduler.add(segment["text"], speech_final)
+        reason = session.scheduler.due()
+        if reason:
+            send_batch(session, reason)
+
+def send_batch(session, reason="flush"):
+    with session.batch_lock:
+        _send_batch(session, reason)
+
+def flush_if_due(session):
+    """Batch timer tick: due() and the flush see the same scheduler state as add_to_batch"""
+    with session.batch_lock:
+        reason = session.scheduler.due()
+        if reason:
+            _send_batch(session, reason)
+
+def _send_batch(session, reason):
+    batch_state = session.batch
+    store = session.segments
+    # The batch is the index range [first, last) of the segment store
+    first, last = batch_state["first_index"], len(store)
+    if first >= last:
+        # Nothing left to send: drop the scheduler's pending state so it does not fire again
+        session.scheduler.flushed()
+        return
     
     # Create unique clip_id once per session
-    if "clip_id" not in session_data["meta"]:
-        session_data["meta"]["clip_id"] = f"dg_{int(time.time())}"
+    clip_id = session.clip_id()
 
-    batch_text = " ".join([s["text"] for s in batch_state["buffer"]])
+    batch_text = store.text(first, last)
+    batch_segments = store.slice(first, last)
     
     # Update Context
     sent_context = batch_state["sent_context"]
 
     # Calculate time range
-    start_time = batch_state["buffer"][0]["start"]
-    end_time = batch_state["buffer"][-1]["end"]
+    start_time = store.start(first)
+    end_time = store.end(last - 1)
     
     payload = {
         "event": "batch_segments",
-        "clip_id": session_data["meta"]["clip_id"],
+        "clip_id": clip_id,
         "batch_number": batch_state["batch_count"] + 1,
         "metadata": {
-            "url": session_data["meta"]["url"],
-            "title": session_data["meta"]["title"],
-            "started_at": session_data["meta"]["started_at"],
+            "stream_id": session.stream_id,
+            "url": session.meta["url"],
+            "title": session.meta["title"],
+            "started_at": session.meta["started_at"],
             "model": "nova-2",
             "language": "en"
         },
@@ -336,11 +449,13 @@ def send_batch():
             "end": end_time,
             "duration": end_time - start_time
         },
+        "trigger": reason,
         "previous_context": sent_context[-CONTEXT_WINDOW:] if sent_context else "",
         "current_batch": {
             "text": batch_text,
-            "segments": batch_state["buffer"].copy(),
-            "segment_count": len(batch_state["buffer"])
+            "segments": batch_segments,
+            "segment_ids": list(range(first, last)),
+            "segment_count": len(batch_segments)
         },
         "full_text_with_context": (
             sent_context[-CONTEXT_WINDOW:] + " " + batch_text
@@ -349,11 +464,12 @@ def send_batch():
     
     batch_state["sent_context"] = (sent_context + " " + batch_text)[-CONTEXT_WINDOW*3:]
     batch_state["batch_count"] += 1
-    batch_state["last_send_time"] = time.time()
+    session.scheduler.flushed()
     
-    # Broadcast batch to GUI for AI analysis
-    broadcast_to_gui({"type": "batch", "data": payload})
-    print(f"📤 Sent Batch #{payload['batch_number']}")
+    # Broadcast batch to GUI for AI analysis (segment bodies are dropped at
+    # write time if the link is framed)
+    broadcast_to_gui(session, {"type": "batch", "data": payload})
+    print(f"📤 Sent Batch #{payload['batch_number']} [{session.stream_id}] ({reason})")
 
     # Send non-blocking via Webhook (Only if configured)
     if N8N_WEBHOOK_URL:
@@ -369,48 +485,55 @@ def send_batch():
     else:
         print(f"\n✅ Batch #{payload['batch_number']} broadcast to GUI ({payload['current_batch']['segment_count']} segments)")
 
-    batch_state["buffer"] = []
+    batch_state["first_index"] = last
+
 
+# Flushes due batches when no new segment arrives to trigger them
+batch_timer = BatchTimer(sessions.all, flush_if_due)
 
-def save_transcript():
-    if not session_data["segments"]: return
-    safe_title = "".join([c for c in session_data["meta"]["title"] if c.isalnum() or c in " -_"])[:50]
-    timestamp = int(time.time())
-    filename = f"transcripts/[FINAL] {safe_title}_{timestamp}.json"
-    os.makedirs("transcripts", exist_ok=True)
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(session_data, f, ensure_ascii=False, indent=2)
-    print(f"💾 Saved: {filename}")
+def save_transcript(session):
+    """Compact the session journal into the [FINAL] json"""
+    if session.journal:
+        session.journal.update_meta(session.meta)
+        filename = session.journal.compact(session.data)
+    elif session.segments:
+        filename = write_final(session.data, final_path(session.meta["title"]))
+    else:
+        filename = None
+    if filename:
+        print(f"💾 Saved: {filename}")
 
-def send_final_summary():
+def send_final_summary(session):
     """Send complete transcription summary"""
     # Force send remaining buffer first
-    if batch_state["buffer"]:
-        send_batch()
+    if session.pending():
+        send_batch(session, "final")
     
-    if not N8N_WEBHOOK_URL or not session_data["segments"]:
+    store = session.segments
+    if not N8N_WEBHOOK_URL or not store:
         return
     
-    full_text = " ".join([s["text"] for s in session_data["segments"]])
+    # The store's text arena already is the space-joined transcript
+    full_text = store.full_text
     
     payload = {
         "event": "transcription_complete",
-        "clip_id": session_data["meta"].get("clip_id", f"dg_{int(time.time())}"),
-        "metadata": session_data["meta"],
-        "total_batches": batch_state["batch_count"],
+        "clip_id": session.clip_id(),
+        "metadata": session.meta,
+        "total_batches": session.batch["batch_count"],
         "summary": {
-            "total_segments": len(session_data["segments"]),
-            "total_duration": session_data["segments"][-1]["end"] if session_data["segments"] else 0,
+            "total_segments": len(store),
+            "total_duration": store.end(len(store) - 1),
             "full_text": full_text
         },
-        "segments": session_data["segments"]
+        "segments": store.to_list()
     }
     
     def send_async():
         try:
             with httpx.Client(timeout=15.0) as client:
                 client.post(N8N_WEBHOOK_URL, json=payload)
-            print(f"\n📤 Final summary sent ({len(session_data['segments'])} total segments)")
+            print(f"\n📤 Final summary sent [{session.stream_id}] ({len(session.segments)} total segments)")
         except Exception as e:
             print(f"\n⚠️ Final webhook failed: {str(e)[:50]}")
     
@@ -418,9 +541,12 @@ def send_final_summary():
 
 if __name__ == "__main__":
     try:
+        gui_outbox.start()
+        batch_timer.start()
         connect_to_gui() # BLOCKS until connected
         # Loop forever to keep listener alive
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        close_gui_ring()
         print("\nServer Closed.")
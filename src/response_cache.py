@@ -0,0 +1,228 @@
+"""
+Response Cache
+==============
+Persistent cache of LLM answers in front of the OpenRouter calls, so replays,
+rebroadcasts and repeated boilerplate ("the committee decided to maintain the
+target range...") are not paid for twice.
+
+Entries are keyed by (kind, model, prompt version, normalized text):
+- exact tier: SHA-256 of the normalized text (case, punctuation and
+  whitespace differences ignored)
+- near tier (optional per lookup): MinHash over word trigrams with LSH bands,
+  accepted when the estimated Jaccard similarity >= LLM_CACHE_NEAR_THRESHOLD
+  and the text quotes exactly the same numbers (3.2% vs 3.4% never matches)
+
+Backed by SQLite (data/llm_cache.sqlite) with TTL expiry and LRU eviction
+beyond LLM_CACHE_MAX_ENTRIES. Safe to share between worker threads.
+
+    answer, tier = response_cache.get("Analysis", model, "1", text, near=True)
+    if answer is None:
+        answer = llm_gateway.complete(...)
+        response_cache.put("Analysis", model, "1", text, answer)
+"""
+
+import array
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("data", "llm_cache.sqlite"))
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL_HOURS", 24 * 7)) * 3600     # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+CACHE_NEAR_THRESHOLD = float(os.getenv("LLM_CACHE_NEAR_THRESHOLD", 0.9))  # 0 disables the near tier
+
+MINHASH_PERMS = 64
+LSH_BANDS = 16              # 16 bands x 4 rows: J=0.9 pairs collide in some band ~100% of the time
+_ROWS = MINHASH_PERMS // LSH_BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1967)  # Fixed: signatures must stay comparable across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(MINHASH_PERMS)]
+
+_PUNCT = re.compile(r"[\"'!?;:()\[\]{}<>*#@&/\\|~^`_“”‘’…–—-]|(?<!\d)[.,]|[.,](?!\d)")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*%?")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    numbers TEXT NOT NULL,
+    signature BLOB,
+    response TEXT NOT NULL,
+    cost REAL NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries(used);
+CREATE TABLE IF NOT EXISTS bands (
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_bucket ON bands(bucket);
+CREATE INDEX IF NOT EXISTS bands_key ON bands(key);
+"""
+
+
+def normalize(text):
+    """Casefold, drop punctuation (decimal points and % are kept), collapse whitespace."""
+    return " ".join(_PUNCT.sub(" ", text.casefold()).split())
+
+
+def minhash(normalized):
+    """MinHash signature of the word trigrams of an already normalized text."""
+    words = normalized.split()
+    shingles = {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _buckets(scope, signature):
+    """One LSH bucket id per band, namespaced by scope so models/prompts never mix."""
+    packed = array.array("Q", signature).tobytes()
+    width = _ROWS * 8
+    return [zlib.crc32(packed[i * width:(i + 1) * width], zlib.crc32(f"{scope}|{i}".encode("utf-8")))
+            for i in range(LSH_BANDS)]
+
+
+class ResponseCache:
+    """SQLite-backed exact + near-duplicate cache of LLM responses (JSON dicts)."""
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES,
+                 near_threshold=CACHE_NEAR_THRESHOLD, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.near_threshold = near_threshold
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = None          # Opened on first use
+        self.count = 0
+        self.hits = {"exact": 0, "near": 0}
+        self.misses = 0
+        self.saved = 0.0
+
+    def _open(self):
+        if self.db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.executescript(_SCHEMA)
+            self._purge_expired()
+            self.count = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return self.db
+
+    def get(self, kind, model, version, text, near=False):
+        """Returns `(response, "exact" | "near")`, or `(None, None)` on a miss."""
+        scope = f"{kind}|{model}|{version}"
+        norm = normalize(text)
+        key = hashlib.sha256(f"{scope}|{norm}".encode("utf-8")).hexdigest()
+        with self.lock:
+            db = self._open()
+            now = self.clock()
+            row = db.execute("SELECT response, cost, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[2] <= self.ttl:
+                return self._hit(db, key, row, "exact", now)
+
+            if near and self.near_threshold > 0:
+                signature = minhash(norm)
+                numbers = " ".join(_NUMBER.findall(norm))
+                best, best_sim = None, self.near_threshold
+                for bucket in _buckets(scope, signature):
+                    for (candidate,) in db.execute("SELECT key FROM bands WHERE bucket = ?", (bucket,)):
+                        entry = db.execute("SELECT response, cost, created, scope, numbers, signature "
+                                           "FROM entries WHERE key = ?", (candidate,)).fetchone()
+                        if (entry is None or entry[3] != scope or entry[4] != numbers
+                                or now - entry[2] > self.ttl):
+                            continue
+                        sim = similarity(signature, array.array("Q", entry[5]))
+                        if sim >= best_sim:
+                            best, best_sim = (candidate, entry[:3]), sim
+                if best is not None:
+                    return self._hit(db, best[0], best[1], "near", now)
+
+            self.misses += 1
+            return None, None
+
+    def _hit(self, db, key, row, tier, now):
+        db.execute("UPDATE entries SET used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        self.hits[tier] += 1
+        self.saved += row[1]
+        return json.loads(row[0]), tier
+
+    def put(self, kind, model, version, text, response):
+        """Store a successful response (its `cost` is what a later hit saves)."""
+        scope = f"{kind}|{model}|{version}"
+        norm = normalize(text)
+        key = hashlib.sha256(f"{scope}|{norm}".encode("utf-8")).hexdigest()
+        signature = minhash(norm)
+        try:
+            cost = float(response.get("cost", 0) or 0)
+        except (TypeError, ValueError):
+            cost = 0.0
+        with self.lock:
+            db = self._open()
+            now = self.clock()
+            db.execute("BEGIN")
+            try:
+                existed = db.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+                db.execute("DELETE FROM bands WHERE key = ?", (key,))
+                db.execute("INSERT INTO entries (key, scope, numbers, signature, response, cost, created, used) "
+                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (key, scope, " ".join(_NUMBER.findall(norm)), array.array("Q", signature).tobytes(),
+                            json.dumps(response, ensure_ascii=False), cost, now, now))
+                db.executemany("INSERT INTO bands (bucket, key) VALUES (?, ?)",
+                               [(bucket, key) for bucket in _buckets(scope, signature)])
+                self.count += 0 if existed else 1
+                if self.count > self.max_entries:
+                    self._evict(self.count - self.max_entries + max(self.max_entries // 10, 1))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def _evict(self, n):
+        # LRU: drop the least recently used entries (in chunks, so this runs rarely)
+        keys = self.db.execute("SELECT key FROM entries ORDER BY used LIMIT ?", (n,)).fetchall()
+        self.db.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self.db.executemany("DELETE FROM bands WHERE key = ?", keys)
+        self.count -= len(keys)
+
+    def _purge_expired(self):
+        cutoff = self.clock() - self.ttl
+        keys = self.db.execute("SELECT key FROM entries WHERE created < ?", (cutoff,)).fetchall()
+        self.db.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self.db.executemany("DELETE FROM bands WHERE key = ?", keys)
+
+    def stats(self):
+        lookups = self.hits["exact"] + self.hits["near"] + self.misses
+        return {
+            "entries": self.count,
+            "exact_hits": self.hits["exact"],
+            "near_hits": self.hits["near"],
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "saved": round(self.saved, 6)
+        }
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+
+# Global instance
+response_cache = ResponseCache()
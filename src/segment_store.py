@@ -0,0 +1,119 @@
+"""
+Segment Store
+=============
+Columnar storage for a session's final transcript segments.
+
+Instead of one dict per segment, speakers are interned to small ids, start/end
+live in `array('d')` columns and all texts share one UTF-8 arena (joined by a
+single space, so the arena IS the full text). Appends are O(1), batches are
+index ranges, and time ranges are found by bisecting the start column.
+Segments arrive in time order (the timeline aligner keeps them monotonic).
+"""
+
+import bisect
+from array import array
+
+SEPARATOR = b" "
+
+
+class SegmentStore:
+    """Append-only transcript segments in parallel arrays."""
+
+    __slots__ = ("_speakers", "_speaker_ids", "_speaker", "_start", "_end", "_offsets", "_arena")
+
+    def __init__(self, segments=()):
+        self._speakers = []          # id -> label
+        self._speaker_ids = {}       # label -> id
+        self._speaker = array("H")
+        self._start = array("d")
+        self._end = array("d")
+        self._offsets = array("Q")   # arena offset where each text starts
+        self._arena = bytearray()
+        for seg in segments:
+            self.append(seg)
+
+    def append(self, segment):
+        """Add a `{"speaker", "text", "start", "end"}` segment; returns its index."""
+        label = segment["speaker"]
+        sid = self._speaker_ids.get(label)
+        if sid is None:
+            sid = self._speaker_ids[label] = len(self._speakers)
+            self._speakers.append(label)
+
+        if self._offsets:
+            self._arena += SEPARATOR
+        self._offsets.append(len(self._arena))
+        self._arena += segment["text"].encode("utf-8")
+        self._speaker.append(sid)
+        self._start.append(segment["start"])
+        self._end.append(segment["end"])
+        return len(self._start) - 1
+
+    def __len__(self):
+        return len(self._start)
+
+    def _text_end(self, i):
+        # Text i ends right before the separator preceding text i + 1
+        return self._offsets[i + 1] - len(SEPARATOR) if i + 1 < len(self._offsets) else len(self._arena)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.slice(*i.indices(len(self))[:2])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        return {
+            "speaker": self._speakers[self._speaker[i]],
+            "text": self._arena[self._offsets[i]:self._text_end(i)].decode("utf-8"),
+            "start": self._start[i],
+            "end": self._end[i]
+        }
+
+    def __iter__(self):
+        return iter(self.slice(0, len(self)))
+
+    def slice(self, i, j):
+        """Segments [i, j) as dicts (the JSON shape sent to the GUI and saved)."""
+        j = min(j, len(self))
+        if i >= j:
+            return []
+        speakers, ids, offsets = self._speakers, self._speaker, self._offsets
+        # One arena copy for the whole range, then split on the known offsets
+        base = offsets[i]
+        blob = bytes(self._arena[base:self._text_end(j - 1)])
+        bounds = [offsets[k] - base for k in range(i, j)] + [len(blob) + len(SEPARATOR)]
+        return [{
+            "speaker": speakers[ids[k]],
+            "text": blob[bounds[n]:bounds[n + 1] - len(SEPARATOR)].decode("utf-8"),
+            "start": self._start[k],
+            "end": self._end[k]
+        } for n, k in enumerate(range(i, j))]
+
+    def index_range(self, t0, t1):
+        """(i, j) of the segments starting in [t0, t1)."""
+        return bisect.bisect_left(self._start, t0), bisect.bisect_left(self._start, t1)
+
+    def between(self, t0, t1):
+        """Segments starting in [t0, t1)."""
+        return self.slice(*self.index_range(t0, t1))
+
+    def text(self, i=0, j=None):
+        """Space-joined text of segments [i, j) straight from the arena."""
+        j = len(self) if j is None else min(j, len(self))
+        if i >= j:
+            return ""
+        return self._arena[self._offsets[i]:self._text_end(j - 1)].decode("utf-8")
+
+    @property
+    def full_text(self):
+        return self._arena.decode("utf-8")
+
+    def start(self, i):
+        return self._start[i]
+
+    def end(self, i):
+        return self._end[i]
+
+    def to_list(self):
+        return list(self)
@@ -0,0 +1,318 @@
+"""
+Sentiment Pre-filter
+====================
+Cheap local stage in front of AnalysisWorker's LLM call. Moderator chatter
+("Thank you. Next question, Bloomberg...") and boilerplate without any
+policy signal is labeled locally instead of paying for an analysis.
+
+- Lexicon: hawkish / dovish / risk-off / risk-on phrases taken from
+  DECISION_RULES, plus administrative and neutral ("meeting by meeting")
+  phrases; one compiled regex, hits counted per class with NumPy
+- Model: multinomial logistic regression over the lexicon counts and a few
+  shape features (length, questions). Trained on SEED_SAMPLES plus the
+  batches the LLM has labeled so far (data/prefilter_samples.jsonl)
+- A batch is skipped only when the model is confident (>= PREFILTER_CONFIDENCE)
+  that it is ADMIN or NEUTRAL, no directional phrase or policy term
+  (inflation, rates, tariffs, gold...) occurs in it, and it is short
+  (<= PREFILTER_MAX_WORDS); anything doubtful goes to the LLM
+
+    python src/sentiment_prefilter.py train     # refit on recorded samples
+    python src/sentiment_prefilter.py classify "Thank you. Next question."
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import threading
+
+try:
+    import numpy as np # pip install numpy
+except ImportError:  # Without NumPy every batch goes to the LLM
+    np = None
+
+PREFILTER_CONFIDENCE = float(os.getenv("PREFILTER_CONFIDENCE", 0.9))
+PREFILTER_MAX_WORDS = int(os.getenv("PREFILTER_MAX_WORDS", 60))
+MODEL_PATH = os.getenv("PREFILTER_MODEL_PATH", os.path.join("data", "prefilter_model.json"))
+SAMPLES_PATH = os.getenv("PREFILTER_SAMPLES_PATH", os.path.join("data", "prefilter_samples.jsonl"))
+
+CLASSES = ["ADMIN", "NEUTRAL", "HAWKISH", "DOVISH", "RISK-OFF", "RISK-ON"]
+DIRECTIONAL = ["HAWKISH", "DOVISH", "RISK-OFF", "RISK-ON"]
+
+LEXICON = {
+    "HAWKISH": [
+        "higher for longer", "not confident", "rate hike", "raise rates", "raising rates", "hike",
+        "further tightening", "additional policy firming", "tighten", "tightening", "restrictive",
+        "inflation remains elevated", "inflation is too high", "elevated inflation", "upside risk*",
+        "sticky", "tight labor market", "strong labor market", "overheat*",
+        "premature", "not in a hurry", "no hurry", "reaccelerat*", "running hot", "wage pressures"
+    ],
+    "DOVISH": [
+        "rate cut", "rate cuts", "cut rates", "cutting rates", "lower rates", "cut", "cuts", "disinflation",
+        "inflation has come down", "inflation is coming down", "come down significantly", "cooling", "cooled",
+        "softening", "easing", "downside risk*", "one time price increase", "one-time",
+        "unemployment has risen", "weaker", "weakening", "recession", "slowdown", "accommodative"
+    ],
+    "RISK-OFF": [
+        "war", "conflict", "sanctions", "attack", "escalation", "trade war", "supply shock", "pandemic",
+        "crisis", "default", "shutdown", "protectionism", "invasion", "missile", "retaliat*"
+    ],
+    "RISK-ON": [
+        "peace", "ceasefire", "trade deal", "trade agreement", "stronger than expected", "better than expected",
+        "breakthrough", "resolution", "de-escalation"
+    ],
+    "ADMIN": [
+        "thank you", "thanks", "next question", "good afternoon", "good morning", "welcome", "my name is",
+        "bloomberg", "reuters", "wall street journal", "cnbc", "fox business", "associated press", "new york times",
+        "go ahead", "can you hear", "sorry", "microphone", "last question", "we'll take", "take a question",
+        "press conference", "chair powell", "mister chairman", "mr. chairman", "mr chairman", "hi", "hello"
+    ],
+    "NEUTRAL": [
+        "meeting by meeting", "data dependent", "incoming data", "well positioned", "maintain the target range",
+        "decided to maintain", "balance sheet", "we'll see", "too early to say", "hard to say",
+        "not going to comment", "wouldn't want to speculate", "speculate", "monitor", "uncertain",
+        "both sides", "dual mandate", "two-sided", "as appropriate"
+    ],
+}
+
+# Not a class: any of these means the batch has substance worth an LLM look
+SIGNAL_TERMS = [
+    "inflation", "prices", "rate*", "interest", "labor market", "jobs", "employment", "unemployment", "wages",
+    "economy", "growth", "gdp", "recession", "tariff*", "trade", "dollar", "gold", "oil", "stocks", "markets",
+    "treasury", "yields", "debt", "deficit", "fiscal", "congress", "policy", "mandate*", "risks", "balanced",
+    "next move", "fed funds", "basis points", "qt", "stimulus", "ai", "productivity", "consumer*", "spending",
+    "housing", "banks", "credit"
+]
+
+# Hand-labeled press-conference lines; recorded LLM labels are added on `train`
+SEED_SAMPLES = [
+    ("Thank you. Next question, please.", "ADMIN"),
+    ("Good afternoon. My colleagues and I remain squarely focused on our dual mandate.", "ADMIN"),
+    ("Thank you, Mr. Chairman. Howard Schneider from Reuters.", "ADMIN"),
+    ("Hi, Chair Powell, Steve Liesman, CNBC. Thanks for taking my question.", "ADMIN"),
+    ("Can you hear me? Sorry, I think my microphone was off.", "ADMIN"),
+    ("We'll take the last question from the Wall Street Journal. Go ahead.", "ADMIN"),
+    ("Thanks. Colby Smith with the Financial Times.", "ADMIN"),
+    ("Okay. Thank you very much.", "ADMIN"),
+    ("Welcome, everyone, to the press conference.", "ADMIN"),
+    ("Mister chairman, thanks. Edward Lawrence from Fox Business.", "ADMIN"),
+    ("We will continue to make our decisions meeting by meeting based on the incoming data.", "NEUTRAL"),
+    ("The committee decided to maintain the target range for the federal funds rate.", "NEUTRAL"),
+    ("I'm not going to comment on that, it's hard to say at this point.", "NEUTRAL"),
+    ("We think we're well positioned to respond to the evolving outlook.", "NEUTRAL"),
+    ("I wouldn't want to speculate about future meetings, we'll see.", "NEUTRAL"),
+    ("The outlook is uncertain and there are risks on both sides of our mandate.", "NEUTRAL"),
+    ("We will adjust the stance of policy as appropriate.", "NEUTRAL"),
+    ("The balance sheet runoff is continuing as planned and we monitor money markets.", "NEUTRAL"),
+    ("We are not confident that inflation is on a sustainable path, we may keep rates higher for longer.", "HAWKISH"),
+    ("Inflation remains elevated and the labor market is tight, so policy must stay restrictive.", "HAWKISH"),
+    ("It would be premature to cut, we are not in a hurry and may need further tightening.", "HAWKISH"),
+    ("Upside risks to inflation have grown and wage pressures are sticky.", "HAWKISH"),
+    ("A rate hike is not off the table if inflation reaccelerates.", "HAWKISH"),
+    ("Inflation has come down significantly and the labor market is cooling.", "DOVISH"),
+    ("We see ongoing disinflation in services and tariffs are a one-time price increase.", "DOVISH"),
+    ("Downside risks to employment have risen, so we lowered rates with this cut.", "DOVISH"),
+    ("The economy is softening and unemployment has risen, easing is appropriate.", "DOVISH"),
+    ("Rate cuts later this year are likely as inflation cooled.", "DOVISH"),
+    ("The escalation of the conflict and new sanctions raise the risk of a supply shock.", "RISK-OFF"),
+    ("A trade war and the threat of retaliation weigh on the outlook.", "RISK-OFF"),
+    ("The attack on shipping lanes and the war pushed oil higher.", "RISK-OFF"),
+    ("A ceasefire and a peace agreement were announced this morning.", "RISK-ON"),
+    ("The trade deal is a breakthrough and growth was stronger than expected.", "RISK-ON"),
+    ("Data came in better than expected after the de-escalation.", "RISK-ON"),
+]
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _alternation(phrases):
+    # Whole words/phrases; a trailing "*" marks a stem ("reaccelerat*")
+    return "|".join(f"({re.escape(p[:-1])})" if p.endswith("*") else f"({re.escape(p)})\\b" for p in phrases)
+
+
+def _compile(lexicon):
+    phrases, classes = [], []
+    for label, items in lexicon.items():
+        for phrase in items:
+            phrases.append(phrase)
+            classes.append(CLASSES.index(label))
+    order = sorted(range(len(phrases)), key=lambda i: -len(phrases[i]))   # longest match wins
+    pattern = re.compile(r"\b(?:" + _alternation([phrases[i] for i in order]) + r")")
+    group_class = [classes[i] for i in order]
+    return pattern, group_class
+
+
+class Verdict:
+    __slots__ = ("label", "confidence", "skip", "hits", "signal")
+
+    def __init__(self, label, confidence, skip, hits, signal=False):
+        self.label = label
+        self.confidence = confidence
+        self.skip = skip
+        self.hits = hits
+        self.signal = signal
+
+    def as_dict(self):
+        return {"label": self.label, "confidence": round(self.confidence, 3), "hits": self.hits}
+
+
+class SentimentPrefilter:
+    """Lexicon features + multinomial logistic regression."""
+
+    N_FEATURES = len(CLASSES) + 3   # per-class hits, log length, questions, bias
+
+    def __init__(self, model_path=MODEL_PATH, samples_path=SAMPLES_PATH, confidence=PREFILTER_CONFIDENCE,
+                 max_words=PREFILTER_MAX_WORDS):
+        self.model_path = model_path
+        self.samples_path = samples_path
+        self.confidence = confidence
+        self.max_words = max_words
+        self.pattern, self.group_class = _compile(LEXICON)
+        self.signal_pattern = re.compile(r"\b(?:" + _alternation(SIGNAL_TERMS) + r")")
+        self.weights = None     # (classes, features), loaded or trained on first use
+        self.lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+
+    @property
+    def available(self):
+        return np is not None
+
+    def features(self, text):
+        """Feature vector, per-class lexicon hit counts and word count."""
+        lower = text.lower()
+        hits = np.zeros(len(CLASSES))
+        groups = [m.lastindex - 1 for m in self.pattern.finditer(lower)]
+        if groups:
+            hits = np.bincount(np.take(self.group_class, groups), minlength=len(CLASSES)).astype(float)
+        words = len(_WORD.findall(lower))
+        x = np.empty(self.N_FEATURES)
+        x[:len(CLASSES)] = np.log1p(hits)
+        x[-3] = math.log1p(words) / 4
+        x[-2] = min(text.count("?"), 3)
+        x[-1] = 1.0
+        return x, hits, words
+
+    def _matrix(self, texts):
+        return np.vstack([self.features(t)[0] for t in texts]) if texts else np.zeros((0, self.N_FEATURES))
+
+    def fit(self, samples, epochs=400, lr=0.5, l2=1e-3):
+        """Train on `(text, label)` pairs; returns training accuracy."""
+        samples = [(t, l) for t, l in samples if l in CLASSES]
+        X = self._matrix([t for t, _ in samples])
+        y = np.array([CLASSES.index(l) for _, l in samples])
+        Y = np.eye(len(CLASSES))[y]
+        W = np.zeros((len(CLASSES), self.N_FEATURES))
+        for _ in range(epochs):
+            P = self._softmax(X @ W.T)
+            W -= lr * ((P - Y).T @ X / len(X) + l2 * W)
+        self.weights = W
+        return float((np.argmax(X @ W.T, axis=1) == y).mean())
+
+    @staticmethod
+    def _softmax(z):
+        z = z - z.max(axis=-1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=-1, keepdims=True)
+
+    def _ensure_model(self):
+        if self.weights is not None:
+            return
+        with self.lock:
+            if self.weights is not None:
+                return
+            try:
+                with open(self.model_path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved.get("classes") == CLASSES and len(saved["weights"][0]) == self.N_FEATURES:
+                    self.weights = np.array(saved["weights"])
+                    return
+            except (OSError, ValueError, KeyError, IndexError):
+                pass
+            self.fit(SEED_SAMPLES)
+
+    def classify(self, text):
+        """Verdict for one batch text (never skips when NumPy is missing)."""
+        if not self.available or not text.strip():
+            return Verdict("UNKNOWN", 0.0, False, {})
+        self._ensure_model()
+        x, hits, words = self.features(text)
+        p = self._softmax(self.weights @ x)
+        label = CLASSES[int(np.argmax(p))]
+        low_signal = p[CLASSES.index("ADMIN")] + p[CLASSES.index("NEUTRAL")]
+        directional = sum(hits[CLASSES.index(c)] for c in DIRECTIONAL)
+        signal = directional > 0 or self.signal_pattern.search(text.lower()) is not None
+        skip = bool(label in ("ADMIN", "NEUTRAL") and low_signal >= self.confidence and not signal
+                    and words <= self.max_words)
+        self.checked += 1
+        self.skipped += skip
+        counts = {c: int(n) for c, n in zip(CLASSES, hits) if n}
+        return Verdict(label, float(low_signal if label in ("ADMIN", "NEUTRAL") else p.max()), skip, counts, signal)
+
+    def record(self, text, sentiment, signal_strength=""):
+        """Keep an LLM-labeled batch as a training sample for the next `train`."""
+        label = next((c for c in CLASSES if c in (sentiment or "").upper()), None)
+        if label is None or not text.strip():
+            return
+        try:
+            if os.path.dirname(self.samples_path):
+                os.makedirs(os.path.dirname(self.samples_path), exist_ok=True)
+            with open(self.samples_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"text": text, "label": label, "strength": signal_strength},
+                                   ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Failed to record prefilter sample: {e}")
+
+    def recorded_samples(self):
+        samples = []
+        try:
+            with open(self.samples_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        samples.append((entry["text"], entry["label"]))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+        return samples
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.model_path) or ".", exist_ok=True)
+        with open(self.model_path, "w", encoding="utf-8") as f:
+            json.dump({"classes": CLASSES, "weights": self.weights.tolist()}, f)
+
+    def stats(self):
+        rate = self.skipped / self.checked if self.checked else 0.0
+        return {"checked": self.checked, "skipped": self.skipped, "call_reduction": round(rate, 3)}
+
+
+# Global instance
+prefilter = SentimentPrefilter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local pre-classifier for analysis batches")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("train", help="Refit on seed + recorded samples and save the model")
+    classify = sub.add_parser("classify", help="Classify a text")
+    classify.add_argument("text")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy is required (pip install numpy)")
+        return
+    if args.command == "train":
+        recorded = prefilter.recorded_samples()
+        accuracy = prefilter.fit(SEED_SAMPLES + recorded)
+        prefilter.save()
+        print(f"✅ Trained on {len(SEED_SAMPLES)} seed + {len(recorded)} recorded samples "
+              f"(train accuracy {accuracy:.1%}) -> {prefilter.model_path}")
+    else:
+        verdict = prefilter.classify(args.text)
+        print(f"{'⏭️ skip' if verdict.skip else '🧠 send to LLM'}: {verdict.as_dict()}")
+
+
+if __name__ == "__main__":
+    main()
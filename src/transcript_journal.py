@@ -0,0 +1,207 @@
+"""
+Transcript Journal
+==================
+Crash-safe transcript persistence. Every final segment is appended to a JSONL
+journal as it arrives (flushed per line, fsync'd at most FSYNC_INTERVAL after
+it was written, also when the stream goes quiet), so a crash loses at most the
+last fsync interval instead of the whole session. At stop the journal is
+compacted into the usual `[FINAL] <title>_<ts>.json` file.
+
+Each session gets its own journal (`<stream>_<ms>_<session>.jsonl`, created
+exclusively), so a restarted stream never appends to, or has its journal
+removed by, the compaction of the session before it.
+
+Journal lines:
+    {"type": "meta", ...}       session metadata (later lines update earlier ones)
+    {"type": "segment", ...}    one final segment
+
+Recover sessions left behind by a crash:
+    python src/transcript_journal.py list
+    python src/transcript_journal.py recover transcripts/journal/main_1700000000000_3f2a9c1e.jsonl
+    python src/transcript_journal.py recover --all
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+
+TRANSCRIPT_DIR = "transcripts"
+JOURNAL_DIR = os.path.join(TRANSCRIPT_DIR, "journal")
+FSYNC_INTERVAL = float(os.getenv("TRANSCRIPT_FSYNC_SECONDS", 2.0))
+
+
+def final_path(title, out_dir=TRANSCRIPT_DIR, timestamp=None):
+    """Path of the compacted transcript (same naming as before journaling)."""
+    safe_title = "".join([c for c in title if c.isalnum() or c in " -_"])[:50]
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    return os.path.join(out_dir, f"[FINAL] {safe_title}_{timestamp}.json")
+
+
+def write_final(data, path):
+    """Write `{"meta", "segments"}` atomically (tmp file + rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def journal_timestamp(path):
+    """Unix seconds from a journal name (`<stream>_<ms>_<session>` or the older `<stream>_<s>`)."""
+    parts = os.path.splitext(os.path.basename(path))[0].split("_")
+    if len(parts) >= 3 and parts[-2].isdigit() and len(parts[-2]) > 10:
+        return int(parts[-2]) // 1000
+    if len(parts) >= 2 and parts[-1].isdigit():
+        return int(parts[-1])
+    return None
+
+
+def read_journal(path):
+    """Rebuild `{"meta", "segments"}` from a journal; a torn last line is skipped."""
+    meta, segments, skipped = {}, [], 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1  # Partial write at crash time
+                continue
+            kind = entry.pop("type", None)
+            if kind == "meta":
+                meta.update(entry)
+            elif kind == "segment":
+                segments.append(entry)
+    if skipped:
+        print(f"⚠️ Skipped {skipped} unreadable journal line(s) in {path}")
+    return {"meta": meta, "segments": segments}
+
+
+class TranscriptJournal:
+    """Append-only JSONL journal for one session."""
+
+    def __init__(self, path, meta=None, fsync_interval=FSYNC_INTERVAL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = open(path, "x", encoding="utf-8")   # never share a journal with another session
+        self._last_fsync = time.time()
+        self._sync_timer = None   # pending fsync of lines written since the last one
+        self._lock = threading.Lock()
+        if meta:
+            self.update_meta(meta)
+
+    @classmethod
+    def for_session(cls, session, journal_dir=JOURNAL_DIR):
+        name = f"{session.stream_id}_{int(time.time() * 1000)}_{session.session_id[:8]}.jsonl"
+        return cls(os.path.join(journal_dir, name), meta=session.meta)
+
+    def _write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            waited = time.time() - self._last_fsync
+            if waited >= self.fsync_interval:
+                self._fsync()
+            elif self._sync_timer is None:
+                # No later write may come (quiet stream, crash): sync these lines on a timer
+                self._sync_timer = threading.Timer(self.fsync_interval - waited, self._timed_fsync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+
+    def _fsync(self):
+        # Caller holds the lock
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.time()
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+    def _timed_fsync(self):
+        with self._lock:
+            if self._file is not None:
+                self._fsync()
+
+    def append(self, segment):
+        self._write({"type": "segment", **segment})
+
+    def update_meta(self, meta):
+        self._write({"type": "meta", **meta})
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            self._fsync()
+            self._file.close()
+            self._file = None
+
+    def compact(self, data=None, out_dir=TRANSCRIPT_DIR):
+        """Close the journal and write the `[FINAL]` json; this journal's file is removed on success.
+
+        `data` is the in-memory `{"meta", "segments"}` when the session is still
+        around; otherwise the journal itself is replayed.
+        """
+        self.close()
+        if data is None:
+            data = read_journal(self.path)
+        if not data["segments"]:
+            os.remove(self.path)
+            return None
+        path = write_final(data, final_path(data["meta"].get("title", "Untitled"), out_dir))
+        os.remove(self.path)
+        return path
+
+
+def recover(path, out_dir=TRANSCRIPT_DIR):
+    """Compact a journal left behind by a crashed session."""
+    data = read_journal(path)
+    if not data["segments"]:
+        print(f"⚪ {path}: no segments, nothing to recover")
+        return None
+    data["meta"]["recovered_from"] = os.path.basename(path)
+    # Keep the crash-time timestamp from the journal name when possible
+    out = write_final(data, final_path(data["meta"].get("title", "Untitled"), out_dir, journal_timestamp(path)))
+    os.remove(path)
+    print(f"💾 Recovered {len(data['segments'])} segments: {out}")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pake transcript journal tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="list journals left behind by crashed sessions")
+    rec = sub.add_parser("recover", help="rebuild [FINAL] json from journals")
+    rec.add_argument("journals", nargs="*")
+    rec.add_argument("--all", action="store_true", help="recover every journal in " + JOURNAL_DIR)
+    rec.add_argument("--out", default=TRANSCRIPT_DIR)
+    args = parser.parse_args(argv)
+
+    leftovers = sorted(glob.glob(os.path.join(JOURNAL_DIR, "*.jsonl")))
+    if args.command == "list":
+        for path in leftovers:
+            data = read_journal(path)
+            print(f"{path}: {len(data['segments'])} segments - {data['meta'].get('title', '?')}")
+        if not leftovers:
+            print("No journals to recover.")
+        return 0
+
+    targets = leftovers if args.all else args.journals
+    if not targets:
+        parser.error("give journal paths or --all")
+    for path in targets:
+        recover(path, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
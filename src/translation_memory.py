@@ -0,0 +1,157 @@
+"""
+Translation Memory
+==================
+Segment-level memory of earlier translations, so TranslateWorker only sends
+sentences it has not seen before ("Thank you.", "Next question, please.",
+the same answer repeated at every press conference...).
+
+- `lookup(model, version, texts)` -> cached translation (or None) per text
+- `store(model, version, pairs)` remembers (source, translation) pairs
+- `parse_numbered(reply, count)` maps a numbered model reply back onto the
+  segments it was asked about, tolerating dropped, merged or unnumbered lines
+
+Sources are matched on the same normalized form as the response cache (case,
+punctuation and whitespace ignored). Backed by SQLite
+(data/translation_memory.sqlite), least recently used entries are evicted
+beyond TM_MAX_ENTRIES.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from response_cache import normalize
+
+TM_PATH = os.getenv("TM_PATH", os.path.join("data", "translation_memory.sqlite"))
+TM_MAX_ENTRIES = int(os.getenv("TM_MAX_ENTRIES", 20000))
+
+# "3. [Speaker 1]: text", also "3-4. ..." when the model merged two lines
+_NUMBERED = re.compile(r"^\s*(\d+)(?:\s*[-–&,]\s*\d+)?\s*[.)]\s*(?:\[[^\]]*\]\s*:?)?\s*(.*)$")
+_LABEL = re.compile(r"^\s*(?:\d+\s*[.)]\s*)?(?:\[[^\]]*\]\s*:?)?\s*")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS memory_used ON memory(used);
+"""
+
+
+def parse_numbered(reply, count):
+    """
+    Translations for lines 1..count of a numbered reply ("3. [Speaker 1]: ...").
+    Returns `count` entries, None where the model dropped (or merged away) a
+    line; a merged line goes to its first number. When the numbers are
+    unusable but the line count matches, lines are aligned by position.
+    """
+    lines = [line.strip() for line in reply.strip().split("\n") if line.strip()]
+    lines = [line for line in lines if not line.startswith("```")]
+    result = [None] * count
+    for line in lines:
+        m = _NUMBERED.match(line)
+        if m and 1 <= int(m.group(1)) <= count and m.group(2).strip():
+            if result[int(m.group(1)) - 1] is None:
+                result[int(m.group(1)) - 1] = m.group(2).strip()
+
+    if None in result and len(lines) == count:
+        # Renumbered or unnumbered reply with one line per segment
+        result = [_LABEL.sub("", line, count=1).strip() or None for line in lines]
+    return result
+
+
+class TranslationMemory:
+    """Persistent source -> translation memory, scoped by model and prompt version."""
+
+    def __init__(self, path=TM_PATH, max_entries=TM_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.db = None          # Opened on first use
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self):
+        if self.db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.executescript(_SCHEMA)
+            self.count = self.db.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+        return self.db
+
+    @staticmethod
+    def _key(model, version, text):
+        return hashlib.sha256(f"{model}|{version}|{normalize(text)}".encode("utf-8")).hexdigest()
+
+    def lookup(self, model, version, texts):
+        """Cached translation for each of `texts` (None where unseen)."""
+        keys = [self._key(model, version, text) for text in texts]
+        with self.lock:
+            db = self._open()
+            found = {}
+            unique = list(set(keys))
+            for i in range(0, len(unique), 500):   # SQLite host-parameter limit
+                chunk = unique[i:i + 500]
+                found.update(db.execute(f"SELECT key, translation FROM memory WHERE key IN "
+                                        f"({','.join('?' * len(chunk))})", chunk).fetchall())
+            if found:
+                db.executemany("UPDATE memory SET used = ?, hits = hits + 1 WHERE key = ?",
+                               [(time.time(), key) for key in found])
+            result = [found.get(key) for key in keys]
+            self.hits += sum(t is not None for t in result)
+            self.misses += sum(t is None for t in result)
+            return result
+
+    def store(self, model, version, pairs):
+        """Remember `(source, translation)` pairs."""
+        rows = [(self._key(model, version, source), source, translation, time.time())
+                for source, translation in pairs if source.strip() and translation]
+        if not rows:
+            return
+        with self.lock:
+            db = self._open()
+            db.execute("BEGIN")
+            try:
+                before = db.total_changes
+                db.executemany("INSERT OR IGNORE INTO memory (key, source, translation, used) VALUES (?, ?, ?, ?)",
+                               rows)
+                self.count += db.total_changes - before
+                if self.count > self.max_entries:
+                    # LRU, in chunks so this runs rarely
+                    n = self.count - self.max_entries + max(self.max_entries // 10, 1)
+                    keys = db.execute("SELECT key FROM memory ORDER BY used LIMIT ?", (n,)).fetchall()
+                    db.executemany("DELETE FROM memory WHERE key = ?", keys)
+                    self.count -= len(keys)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+
+# Global instance
+translation_memory = TranslationMemory()
@@ -0,0 +1,136 @@
+"""
+Voice Activity Gate
+===================
+Cheap energy / zero-crossing VAD, vectorized with NumPy over 10 ms sub-frames
+of each 100 ms PCM frame. Long silences are dropped instead of being streamed
+to Deepgram (the sender uses a KeepAlive text message meanwhile); the gate
+remembers where audio was cut so Deepgram's timestamps can be mapped back onto
+the real stream timeline.
+"""
+
+import bisect
+import collections
+import math
+import os
+
+try:
+    import numpy as np # pip install numpy
+except ImportError:  # Without NumPy the gate is a pass-through
+    np = None
+
+from audio_ingest import BYTES_PER_SAMPLE, SAMPLE_RATE
+
+BYTES_PER_SECOND = SAMPLE_RATE * BYTES_PER_SAMPLE
+
+VAD_ENABLED = os.getenv("VAD_ENABLED", "0").strip() == "1"
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", -45))    # dBFS
+VAD_ZCR_MAX = float(os.getenv("VAD_ZCR_MAX", 0.35))             # crossings per sample
+VAD_MIN_SILENCE = float(os.getenv("VAD_MIN_SILENCE", 1.0))      # seconds kept before dropping
+VAD_PREROLL_MS = int(os.getenv("VAD_PREROLL_MS", 300))          # audio re-sent before speech onset
+SUBFRAME_SAMPLES = SAMPLE_RATE // 100                           # 10 ms
+
+
+class AudioStats:
+    """Per-session audio counters (bytes read from ffmpeg vs. bytes billed by Deepgram)."""
+
+    __slots__ = ("bytes_read", "bytes_sent", "reconnects")
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.bytes_sent = 0
+        self.reconnects = 0
+
+    def as_dict(self):
+        saved = 1 - self.bytes_sent / self.bytes_read if self.bytes_read else 0.0
+        return {
+            "bytes_read": self.bytes_read,
+            "bytes_sent": self.bytes_sent,
+            "seconds_read": round(self.bytes_read / BYTES_PER_SECOND, 1),
+            "seconds_sent": round(self.bytes_sent / BYTES_PER_SECOND, 1),
+            "saved_pct": round(saved * 100, 1),
+            "reconnects": self.reconnects
+        }
+
+
+class VadGate:
+    """Decides per frame whether audio goes to Deepgram."""
+
+    def __init__(self, enabled=VAD_ENABLED, threshold_db=VAD_THRESHOLD_DB, zcr_max=VAD_ZCR_MAX,
+                 min_silence=VAD_MIN_SILENCE, preroll_ms=VAD_PREROLL_MS):
+        if enabled and np is None:
+            print("⚠️ VAD requested but NumPy is missing; sending all audio")
+            enabled = False
+        self.enabled = enabled
+        self.threshold = 32768.0 * 10 ** (threshold_db / 20)    # linear RMS
+        self.zcr_max = zcr_max
+        self.min_silence = min_silence
+        self.preroll_ms = preroll_ms
+
+        self.dropping = False
+        self._silence = 0.0          # seconds of continuous silence
+        self._preroll = None         # recent dropped frames (copies) for the speech onset
+        self._sent_pos = 0.0         # seconds sent to Deepgram so far
+        self._dropped = 0.0          # seconds dropped in the current gap
+
+        # Gap map: (sent-timeline position, cumulative seconds dropped before it).
+        # One list of pairs: the sender thread appends while the receive thread
+        # reads, and a single append is atomic where two would not be
+        self._gaps = [(0.0, 0.0)]
+
+    def is_speech(self, frame):
+        x = np.frombuffer(frame, dtype="<i2")
+        usable = len(x) - len(x) % SUBFRAME_SAMPLES
+        if usable == 0:
+            return False
+        sub = x[:usable].reshape(-1, SUBFRAME_SAMPLES).astype(np.float32)
+        rms = np.sqrt(np.mean(sub * sub, axis=1))
+        zcr = np.count_nonzero(np.diff(np.signbit(sub), axis=1), axis=1) / SUBFRAME_SAMPLES
+        # Loud enough, and either voiced (low ZCR) or clearly above the floor
+        active = (rms >= self.threshold) & ((zcr <= self.zcr_max) | (rms >= self.threshold * 5.6))
+        return bool(active.any())
+
+    def feed(self, frame):
+        """Return the frames to send for this input frame (possibly none)."""
+        seconds = len(frame) / BYTES_PER_SECOND
+        if not self.enabled:
+            self._sent_pos += seconds
+            return (frame,)
+
+        if self.is_speech(frame):
+            self._silence = 0.0
+            if not self.dropping:
+                self._sent_pos += seconds
+                return (frame,)
+            # Speech onset after a dropped gap: resend a short pre-roll first
+            self.dropping = False
+            preroll = list(self._preroll)
+            preroll_s = sum(len(f) for f in preroll) / BYTES_PER_SECOND
+            self._record_gap(self._dropped - preroll_s)
+            self._dropped = 0.0
+            self._sent_pos += preroll_s + seconds
+            return (*preroll, frame)
+
+        self._silence += seconds
+        if self._silence <= self.min_silence:
+            # Short pause: keep it so Deepgram's endpointing still sees it
+            self._sent_pos += seconds
+            return (frame,)
+
+        if not self.dropping:
+            self.dropping = True
+            slots = max(1, math.ceil(self.preroll_ms / 1000 / seconds)) if seconds else 1
+            self._preroll = collections.deque(maxlen=slots)
+        self._preroll.append(bytes(frame))  # ring frames are reused, keep a copy
+        self._dropped += seconds
+        return ()
+
+    def _record_gap(self, dropped):
+        if dropped <= 0:
+            return
+        self._gaps.append((self._sent_pos, self._gaps[-1][1] + dropped))
+
+    def to_stream_time(self, t):
+        """Map a time on the sent (Deepgram) timeline back to the stream timeline."""
+        gaps = self._gaps
+        i = bisect.bisect_right(gaps, (t, math.inf)) - 1
+        return t + gaps[i][1]
@@ -0,0 +1,65 @@
+"""
+Benchmark: ForexFactory calendar parsing
+========================================
+Parses the saved week / today pages (test/fixtures/ff_calendar_*.html)
+with the legacy fetch_news row loop (BeautifulSoup html.parser over the
+whole page, 7+ row.find per row) and with parse_calendar on the table
+slice (lxml iterparse, and the html.parser fallback). Checks that every
+path yields the same events, that blank-time continuation rows inherit
+the time above, and that the week page parses at least 10x faster.
+
+Usage: python test/bench_calendar_parser.py
+"""
+
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+import economic_detector
+from economic_detector import calendar_table, parse_calendar
+from verify_ff_scraper import inherit_times, legacy_parse, load
+
+ROUNDS = 10
+TARGET_SPEEDUP = 10
+
+
+def timed(fn):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    return (time.perf_counter() - t0) / ROUNDS * 1000, result
+
+
+def new_parse(page):
+    records, _ = parse_calendar(calendar_table(page))
+    return [record._asdict() for record in records]
+
+
+def fallback_parse(page):
+    economic_detector.etree, etree = None, economic_detector.etree
+    try:
+        return new_parse(page)
+    finally:
+        economic_detector.etree = etree
+
+
+if __name__ == "__main__":
+    ok = True
+    for name in ("ff_calendar_week.html", "ff_calendar_today.html"):
+        page = load(name)
+        legacy_ms, legacy = timed(lambda: legacy_parse(page))
+        fast_ms, fast = timed(lambda: new_parse(page))
+        slow_ms, slow = timed(lambda: fallback_parse(page))
+        blank = sum(1 for event in legacy if not event["time"])
+        same = fast == slow == inherit_times(legacy)
+        speedup = legacy_ms / fast_ms
+        passed = same and all(event["time"] for event in fast) and (speedup >= TARGET_SPEEDUP or "week" not in name)
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {name} ({len(page) // 1024} KB, {len(fast)} events, {blank} continuation rows): "
+              f"legacy {legacy_ms:.1f} ms | html.parser slice {slow_ms:.1f} ms | lxml {fast_ms:.1f} ms "
+              f"({speedup:.1f}x), same events: {same}")
+    sys.exit(0 if ok else 1)
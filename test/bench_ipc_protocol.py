@@ -0,0 +1,130 @@
+"""
+Benchmark: NDJSON vs. framed IPC between pake_live and pake_gui
+===============================================================
+Replays a recorded session (a `[FINAL] ...json` transcript) as the backend
+would emit it - one `segment` message per final plus a `batch` every 10 -
+through a local socket pair and reports bytes on the wire and end-to-end
+throughput for:
+
+  ndjson   legacy: full segments repeated in every batch, split()-based reader
+  json     framed compact JSON, batches reference segment ids
+  msgpack  framed msgpack (only if msgpack is installed)
+
+Usage: python test/bench_ipc_protocol.py ["transcripts/[FINAL] ....json"] [repeat]
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from ipc_protocol import CODECS, IpcReader, encode_message
+
+BATCH_SIZE = 10
+CONTEXT_WINDOW = 500
+
+
+def load_session(path=None, repeat=1):
+    if path:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        # Synthetic 3-hour press conference (mixed English / Thai annotations)
+        data = {"meta": {"stream_id": "main", "url": "https://youtube.com/live/x", "title": "FOMC",
+                         "started_at": "2026-01-28T14:30:00"},
+                "segments": [{"speaker": f"Speaker {i % 3}",
+                              "text": f"Inflation has eased substantially but remains somewhat elevated ({i}) ยังสูงอยู่",
+                              "start": i * 1.1, "end": i * 1.1 + 1.0} for i in range(10_000)]}
+    return data["meta"], data["segments"] * repeat
+
+
+def session_messages(meta, segments, by_reference):
+    """The backend's message sequence for one session."""
+    messages, context, first = [], "", 0
+    for i, seg in enumerate(segments):
+        messages.append({"type": "segment", "id": i, "data": seg, "stream_id": "main"})
+        if i + 1 - first >= BATCH_SIZE:
+            batch = segments[first:i + 1]
+            text = " ".join(s["text"] for s in batch)
+            current = {"text": text, "segment_ids": list(range(first, i + 1)), "segment_count": len(batch)}
+            if not by_reference:
+                current["segments"] = batch
+            messages.append({"type": "batch", "stream_id": "main", "data": {
+                "event": "batch_segments", "clip_id": "dg_main_0", "batch_number": len(messages),
+                "metadata": meta, "time_range": {"start": batch[0]["start"], "end": batch[-1]["end"]},
+                "previous_context": context[-CONTEXT_WINDOW:], "current_batch": current,
+                "full_text_with_context": (context[-CONTEXT_WINDOW:] + " " + text).strip()
+            }})
+            context = (context + " " + text)[-CONTEXT_WINDOW * 3:]
+            first = i + 1
+    return messages
+
+
+def legacy_reader(sock, count):
+    """The original listen_to_gui loop: str buffer + split('\\n', 1)."""
+    buffer, received = "", 0
+    while received < count:
+        data = sock.recv(65536).decode("utf-8")
+        if not data:
+            break
+        buffer += data
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            if line.strip():
+                json.loads(line)
+                received += 1
+    return received
+
+
+def framed_reader(sock, count, codec):
+    reader, received = IpcReader(codec), 0
+    while received < count:
+        data = sock.recv(65536)
+        if not data:
+            break
+        for _ in reader.feed(data):
+            received += 1
+    return received
+
+
+def run(name, messages, codec, legacy):
+    a, b = socket.socketpair()
+    result = {}
+
+    def consume():
+        result["received"] = legacy_reader(b, len(messages)) if legacy else framed_reader(b, len(messages), codec)
+
+    reader = threading.Thread(target=consume)
+    t0 = time.perf_counter()
+    reader.start()
+    wire = 0
+    for msg in messages:
+        data = encode_message(msg, codec)
+        wire += len(data)
+        a.sendall(data)
+    reader.join()
+    elapsed = time.perf_counter() - t0
+    a.close()
+    b.close()
+    print(f"{name:<8} | {wire / 1e6:7.2f} MB on wire | {elapsed * 1000:8.1f} ms | "
+          f"{len(messages) / elapsed:9.0f} msg/s | received {result['received']}/{len(messages)}")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    meta, segments = load_session(path, repeat)
+    print(f"🧪 Replaying {len(segments)} segments ({'recorded' if path else 'synthetic'} session)\n")
+
+    run("ndjson", session_messages(meta, segments, by_reference=False), None, legacy=True)
+    by_ref = session_messages(meta, segments, by_reference=True)
+    for name in ("json", "msgpack"):
+        if name in CODECS:
+            run(name, by_ref, CODECS[name], legacy=False)
+        else:
+            print(f"{name:<8} | skipped (pip install {name})")
@@ -0,0 +1,136 @@
+"""
+Benchmark: IPC transports (TCP vs. Unix socket vs. shared-memory ring)
+=====================================================================
+A "backend" process sends framed `segment` messages to a "GUI" process and
+the GUI side reports one-way latency (p50 / p95); throughput is measured
+with an unpaced run. The shm reader polls like the GUI's QTimer (2 ms) and,
+for reference, with a busy loop.
+
+Usage: python test/bench_ipc_transport.py [messages]
+"""
+
+import multiprocessing as mp
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from ipc_protocol import CODECS, IpcReader, encode_message
+from ipc_transport import HAS_UNIX, ShmRing, parse_tcp_address
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+PACE = 0.0002          # seconds between messages for the latency run
+CODEC = CODECS["json"]
+SEGMENT = {"speaker": "Speaker 0", "text": "Inflation has eased substantially but remains somewhat elevated",
+           "start": 12.3, "end": 15.9}
+
+
+def message(i):
+    return {"type": "segment", "id": i, "stream_id": "main", "data": SEGMENT, "sent": time.perf_counter()}
+
+
+# --- GUI side (child process) ---
+
+def gui_socket(kind, address, count, ready, results):
+    if kind == "unix":
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+    else:
+        server = socket.socket()
+        server.bind(parse_tcp_address(address))
+    server.listen(1)
+    ready.set()
+    conn, _ = server.accept()
+    reader, latencies = IpcReader(CODEC), []
+    while len(latencies) < count:
+        data = conn.recv(65536)
+        if not data:
+            break
+        now = time.perf_counter()
+        latencies.extend(now - msg["sent"] for msg in reader.feed(data))
+    results.send(latencies)
+
+
+def gui_shm(name, poll, count, ready, results):
+    ring = ShmRing.attach(name, untrack=False)  # Child shares our resource tracker
+    ready.set()
+    reader, latencies = IpcReader(CODEC), []
+    while len(latencies) < count:
+        data = ring.read()
+        if not data:
+            if poll:
+                time.sleep(poll)
+            continue
+        now = time.perf_counter()
+        latencies.extend(now - msg["sent"] for msg in reader.feed(data))
+    ring.close()
+    results.send(latencies)
+
+
+# --- Backend side ---
+
+def run(kind, pace, poll=0.0):
+    ready = mp.Event()
+    recv_end, send_end = mp.Pipe(duplex=False)
+    ring = None
+    if kind == "shm":
+        ring = ShmRing.create(1024 * 1024)
+        child = mp.Process(target=gui_shm, args=(ring.name, poll, MESSAGES, ready, send_end))
+    else:
+        if kind == "unix":
+            address = os.path.join(tempfile.mkdtemp(), "bench.sock")
+        else:
+            probe = socket.socket()
+            probe.bind(("127.0.0.1", 0))
+            address = f"127.0.0.1:{probe.getsockname()[1]}"
+            probe.close()
+        child = mp.Process(target=gui_socket, args=(kind, address, MESSAGES, ready, send_end))
+    child.start()
+    ready.wait(10)
+
+    if ring:
+        send = ring.write
+    else:
+        if kind == "unix":
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            s.connect(address)
+        else:
+            s = socket.create_connection(parse_tcp_address(address))
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send = s.sendall
+
+    t0 = time.perf_counter()
+    for i in range(MESSAGES):
+        send(encode_message(message(i), CODEC))
+        if pace:
+            time.sleep(pace)
+    latencies = recv_end.recv()
+    elapsed = time.perf_counter() - t0
+    child.join()
+    if ring:
+        ring.close()
+    else:
+        s.close()
+    return latencies, elapsed
+
+
+def report(name, kind, poll=0.0):
+    latencies, _ = run(kind, PACE, poll)
+    _, elapsed = run(kind, 0, poll)
+    q = statistics.quantiles(latencies, n=20)
+    print(f"{name:<16} | p50 {statistics.median(latencies) * 1e6:7.1f} us | p95 {q[18] * 1e6:7.1f} us | "
+          f"{MESSAGES / elapsed:9.0f} msg/s")
+
+
+if __name__ == "__main__":
+    print(f"🧪 {MESSAGES} segment messages per transport (framed {CODEC.name}, GUI in its own process)\n")
+    report("tcp", "tcp")
+    if HAS_UNIX:
+        report("unix", "unix")
+    report("shm poll 2ms", "shm", 0.002)
+    report("shm busy-poll", "shm", 0.0)
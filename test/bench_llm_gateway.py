@@ -0,0 +1,67 @@
+"""
+Benchmark: client-per-call vs. the pooled LLM gateway
+=====================================================
+Sequential chat calls against the local mock OpenRouter (TLS with a
+self-signed cert when openssl is available, so the handshake cost the old
+workers paid on every call is part of the picture). The mock answers after
+MOCK_DELAY, so the difference is pure client overhead.
+
+Usage: python test/bench_llm_gateway.py [calls]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import time
+
+import httpx
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from llm_gateway import LlmGateway
+from mock_openrouter import MockOpenRouter
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+MOCK_DELAY = 0.005
+BODY = {"model": "mock/analysis", "messages": [{"role": "user", "content": "x" * 2000}]}
+
+
+def per_call(url):
+    # What the workers did: a fresh httpx.Client (and connection) per request
+    latencies = []
+    for _ in range(CALLS):
+        t0 = time.perf_counter()
+        with httpx.Client(timeout=60, verify=False) as client:
+            client.post(url + "/chat/completions", json=BODY).json()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def gateway(url):
+    gw = LlmGateway(api_key="bench", base_url=url, verify=False)
+    gw.complete(BODY)  # Loop + first connection, as after the first batch of a session
+    latencies = []
+    for _ in range(CALLS):
+        t0 = time.perf_counter()
+        gw.complete(BODY)
+        latencies.append(time.perf_counter() - t0)
+    gw.close()
+    return latencies
+
+
+def report(name, latencies, connections):
+    q = statistics.quantiles(latencies, n=20)
+    print(f"  {name:<16} | p50 {statistics.median(latencies) * 1000:6.2f} ms | "
+          f"p95 {q[18] * 1000:6.2f} ms | {connections:3d} connection(s)")
+
+
+if __name__ == "__main__":
+    for use_tls in ([False, True] if shutil.which("openssl") else [False]):
+        print(f"🧪 {CALLS} calls, mock latency {MOCK_DELAY * 1000:.0f} ms, {'https' if use_tls else 'http'}")
+        for name, run in (("client per call", per_call), ("gateway", gateway)):
+            server = MockOpenRouter(delay=MOCK_DELAY, tls=use_tls).start()
+            latencies = run(server.base_url)
+            report(name, latencies, server.connections)
+            server.stop()
@@ -0,0 +1,85 @@
+"""
+Benchmark: list-of-dicts transcript vs. SegmentStore
+====================================================
+Simulates sessions of growing length and reports retained memory, the cost
+of cutting batches of 10 and the final-summary `full_text` build time.
+
+Usage: python test/bench_segment_store.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from segment_store import SegmentStore
+
+SESSION_SIZES = [1_000, 10_000, 50_000]   # ~3 hours is roughly 10k finals
+BATCH_SIZE = 10
+TEXT = "the committee judged that the risks to achieving its employment and inflation goals"
+
+
+def make_segments(n):
+    return [{"speaker": f"Speaker {i % 3}", "text": f"{TEXT} {i}", "start": i * 1.0, "end": i * 1.0 + 0.9}
+            for i in range(n)]
+
+
+def fresh(seg):
+    # Deepgram results arrive as freshly parsed JSON: nothing is shared between segments
+    return {"speaker": "".join(seg["speaker"]), "text": "".join(seg["text"]),
+            "start": seg["start"], "end": seg["end"]}
+
+
+def run_list(segments):
+    kept, buffer = [], []
+    for seg in segments:
+        seg = fresh(seg)
+        kept.append(seg)
+        buffer.append(seg)
+        if len(buffer) >= BATCH_SIZE:
+            " ".join([s["text"] for s in buffer])
+            buffer.copy()
+            buffer = []
+    t0 = time.perf_counter()
+    " ".join([s["text"] for s in kept])
+    return kept, time.perf_counter() - t0
+
+
+def run_store(segments):
+    store, first = SegmentStore(), 0
+    for seg in segments:
+        store.append(fresh(seg))
+        if len(store) - first >= BATCH_SIZE:
+            store.text(first, len(store))
+            store.slice(first, len(store))
+            first = len(store)
+    t0 = time.perf_counter()
+    store.full_text
+    return store, time.perf_counter() - t0
+
+
+def measure(fn, segments):
+    # Timing and memory in separate runs: tracemalloc slows allocation-heavy code
+    t0 = time.perf_counter()
+    _, summary = fn(segments)
+    total = time.perf_counter() - t0
+
+    tracemalloc.start()
+    kept, _ = fn(segments)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return memory, total, summary
+
+
+if __name__ == "__main__":
+    for n in SESSION_SIZES:
+        segments = make_segments(n)
+        for name, fn in (("list", run_list), ("store", run_store)):
+            memory, total, summary = measure(fn, segments)
+            print(f"{name:<6} {n:>6} segments | retained {memory / 1e6:7.2f} MB | "
+                  f"session {total * 1000:8.1f} ms | full_text {summary * 1000:6.2f} ms")
+        print()
@@ -0,0 +1,107 @@
+"""
+Benchmark the local sentiment pre-filter.
+
+1. Agreement with the test_sentiment_rules.py cases (the live-LLM rule
+   checks): directional cases must reach the LLM, labels should agree
+2. Call reduction on the saved press-conference transcript in txt.md,
+   cut into batches at sentence ends (~20 words minimum)
+3. A synthetic session with known labels: skipped share vs. substantive
+   batches wrongly skipped
+4. Cost per classification
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from sentiment_prefilter import SentimentPrefilter
+
+# Same cases as test_sentiment_rules.py
+RULE_CASES = [
+    ("Inflation has come down significantly from its peak, and the labor market is cooling appropriately.", "DOVISH"),
+    ("We are not confident that inflation is on a sustainable path to 2%. We may need to keep rates higher for longer.",
+     "HAWKISH"),
+    ("The committee decided to maintain the target range for the federal funds rate at 5.25 to 5.5 percent.", "NEUTRAL"),
+    ("Most of the overrun in goods prices is from tariffs. And that's actually good news because if it weren't from "
+     "tariffs, it might mean it's from demand and that's a harder problem to solve. We do think tariffs are likely to "
+     "move through and be a one time price increase. If you look away from goods and look at services, you do see "
+     "ongoing disinflation in all the categories of services.", "DOVISH"),
+]
+
+CHATTER = ["Thank you. Next question.", "Thanks, Chair Powell. Nick Timiraos, Wall Street Journal.",
+           "Go ahead, please.", "Sorry, can you hear me now?", "Good afternoon, everyone.",
+           "Thank you, Mr. Chairman. Jean Yung, Market News.", "We'll take the last question."]
+BOILERPLATE = ["We will make our decisions meeting by meeting based on the incoming data.",
+               "I wouldn't want to speculate about that.", "We think we're well positioned.",
+               "The outlook remains uncertain and we'll see how the data come in."]
+SUBSTANTIVE = ["Inflation remains elevated and we may need to keep policy restrictive for longer.",
+               "The labor market is cooling and downside risks to employment have risen.",
+               "We see ongoing disinflation in services, and tariffs should be a one-time price increase.",
+               "It would be premature to cut while upside risks to inflation persist.",
+               "The conflict and new sanctions are a supply shock for energy prices.",
+               "A rate cut in March is possible if inflation keeps coming down."]
+
+
+def transcript_batches(min_words=20):
+    with open(os.path.join(PROJECT_ROOT, "txt.md"), encoding="utf-8") as f:
+        text = f.read().split('\n"""\n')[1]   # the raw transcript block after the analysis cards
+    lines = [l.strip() for l in text.splitlines()
+             if l.strip() and not l.startswith("Speaker") and not re.match(r"^\d+:\d+\s*$", l) and l.strip() != '"""']
+    batches, current = [], []
+    for line in lines:
+        current.append(line)
+        if len(" ".join(current).split()) >= min_words and line.rstrip().endswith((".", "?")):
+            batches.append(" ".join(current))
+            current = []
+    if current:
+        batches.append(" ".join(current))
+    return batches
+
+
+def main():
+    prefilter = SentimentPrefilter(model_path=os.devnull)   # seed model only, ignore local training data
+
+    print("📏 test_sentiment_rules.py cases")
+    agree, safe = 0, 0
+    for text, expected in RULE_CASES:
+        v = prefilter.classify(text)
+        agree += v.label == expected
+        safe += not (v.skip and expected != "NEUTRAL")
+        print(f"   {'⏭️' if v.skip else '🧠'} expected {expected:<8} local {v.label:<8} p={v.confidence:.2f}  {text[:50]}...")
+    print(f"   label agreement {agree}/{len(RULE_CASES)}, directional cases sent to LLM {safe}/{len(RULE_CASES)}")
+
+    batches = transcript_batches()
+    prefilter.checked = prefilter.skipped = 0
+    skipped = [b for b in batches if prefilter.classify(b).skip]
+    print(f"\n🎙️ txt.md press conference: {len(batches)} batches, skipped {len(skipped)} "
+          f"({len(skipped) / len(batches):.0%} fewer analysis calls)")
+    for b in skipped:
+        print(f"   ⏭️ {b[:90]}...")
+
+    rng = random.Random(3)
+    session = []
+    for _ in range(300):
+        kind = rng.choices(["chatter", "boilerplate", "substantive"], [0.3, 0.2, 0.5])[0]
+        pool = {"chatter": CHATTER, "boilerplate": BOILERPLATE, "substantive": SUBSTANTIVE}[kind]
+        session.append((" ".join(rng.sample(pool, min(2, len(pool)))), kind))
+    prefilter.checked = prefilter.skipped = 0
+    verdicts = [(prefilter.classify(text), kind) for text, kind in session]
+    wrong = sum(v.skip for v, kind in verdicts if kind == "substantive")
+    low = sum(kind != "substantive" for _, kind in session)
+    print(f"\n🧪 synthetic session: {prefilter.stats()} - low-signal batches {low}/300, "
+          f"substantive batches skipped {wrong}")
+
+    texts = [t for t, _ in session] * 10
+    t0 = time.perf_counter()
+    for t in texts:
+        prefilter.classify(t)
+    print(f"\n⚡ {(time.perf_counter() - t0) / len(texts) * 1e6:.0f} µs per batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark: thread-per-stream vs. asyncio streaming
+==================================================
+Runs 1, 4 and 16 simultaneous streams against a local WebSocket stand-in for
+Deepgram and reports wall time, CPU time and peak thread count per mode.
+
+The stand-in answers every 10th audio frame with a Deepgram-shaped final
+result, so both modes exercise send, receive and JSON parsing.
+
+Usage: python test/bench_stream_modes.py [frames_per_stream]
+"""
+
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import websocket # pip install websocket-client
+import websockets # pip install websockets
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from audio_ingest import FRAME_BYTES
+from live_async import run_stream
+
+FRAMES_PER_STREAM = int(sys.argv[1]) if len(sys.argv) > 1 else 300   # 30s of audio
+STREAM_COUNTS = [1, 4, 16]
+RESULT_EVERY = 10
+
+
+# --- Local Deepgram stand-in ---
+
+def start_stand_in():
+    """Start the fake Deepgram server on its own loop; returns ws:// URL."""
+    ready = threading.Event()
+    state = {}
+
+    async def handler(ws, *args):
+        frames = 0
+        async for message in ws:
+            if isinstance(message, str):
+                if "CloseStream" in message:
+                    break
+                continue
+            frames += 1
+            if frames % RESULT_EVERY == 0:
+                start = (frames - RESULT_EVERY) * 0.1
+                await ws.send(json.dumps({
+                    "is_final": True, "speech_final": True,
+                    "start": start, "duration": RESULT_EVERY * 0.1,
+                    "channel": {"alternatives": [{
+                        "transcript": f"segment {frames // RESULT_EVERY}",
+                        "words": [{"word": "segment", "speaker": 0}]
+                    }]}
+                }))
+        await ws.close()
+
+    async def serve():
+        server = await websockets.serve(handler, "127.0.0.1", 0, max_size=None)
+        state["port"] = list(server.sockets)[0].getsockname()[1]
+        ready.set()
+        await asyncio.Future()  # Serve forever
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    if not ready.wait(10):
+        raise RuntimeError("Stand-in server failed to start")
+    return f"ws://127.0.0.1:{state['port']}"
+
+
+# --- Synthetic audio ---
+
+class SyntheticAsyncSource:
+    def __init__(self, frames):
+        self.frames = frames
+        self.frame_bytes = FRAME_BYTES
+        self._frame = bytes(FRAME_BYTES)
+
+    async def start(self):
+        return self
+
+    async def read(self):
+        if self.frames == 0:
+            return None
+        self.frames -= 1
+        await asyncio.sleep(0)
+        return self._frame
+
+    async def stop(self):
+        pass
+
+
+# --- Thread mode (the original run_deepgram_pipeline shape) ---
+
+def thread_stream(url, frames, results, done):
+    audio_queue = queue.Queue(maxsize=100)
+
+    def producer():
+        for _ in range(frames):
+            audio_queue.put(bytes(FRAME_BYTES))
+        audio_queue.put(None)
+
+    def send_audio(ws):
+        threading.Thread(target=producer, daemon=True).start()
+        while True:
+            chunk = audio_queue.get()
+            if chunk is None:
+                break
+            ws.send(chunk, opcode=websocket.ABNF.OPCODE_BINARY)
+        ws.send('{"type": "CloseStream"}')
+
+    def on_open(ws):
+        threading.Thread(target=send_audio, args=(ws,), daemon=True).start()
+
+    def on_message(ws, message):
+        results.append(json.loads(message))
+
+    app = websocket.WebSocketApp(url, on_open=on_open, on_message=on_message,
+                                 on_close=lambda *a: done.set())
+    app.run_forever()
+    done.set()
+
+
+def run_thread_mode(url, streams):
+    results = [[] for _ in range(streams)]
+    events = [threading.Event() for _ in range(streams)]
+    peak = [threading.active_count()]
+    for i in range(streams):
+        threading.Thread(target=thread_stream, args=(url, FRAMES_PER_STREAM, results[i], events[i]),
+                         daemon=True).start()
+    while not all(e.is_set() for e in events):
+        peak[0] = max(peak[0], threading.active_count())
+        time.sleep(0.005)
+    return sum(len(r) for r in results), peak[0]
+
+
+# --- Async mode ---
+
+def run_async_mode(url, streams):
+    results = []
+    peak = [threading.active_count()]
+
+    async def main():
+        async def sample_threads():
+            while True:
+                peak[0] = max(peak[0], threading.active_count())
+                await asyncio.sleep(0.005)
+        sampler = asyncio.ensure_future(sample_threads())
+        await asyncio.gather(*[
+            run_stream(SyntheticAsyncSource(FRAMES_PER_STREAM), results.append, lambda: True, url)
+            for _ in range(streams)
+        ])
+        sampler.cancel()
+
+    asyncio.run(main())
+    return len(results), peak[0]
+
+
+def bench(name, fn, url, streams):
+    base_threads = threading.active_count()
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    count, peak = fn(url, streams)
+    wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+    expected = streams * (FRAMES_PER_STREAM // RESULT_EVERY)
+    print(f"{name:<7} {streams:>3} streams | wall {wall:6.2f}s | cpu {cpu:6.2f}s | "
+          f"results {count}/{expected} | extra threads {peak - base_threads}")
+
+
+if __name__ == "__main__":
+    url = start_stand_in()
+    print(f"🧪 Stand-in at {url}, {FRAMES_PER_STREAM} frames ({FRAME_BYTES} B) per stream\n")
+    for n in STREAM_COUNTS:
+        bench("thread", run_thread_mode, url, n)
+        bench("async", run_async_mode, url, n)
+        print()
@@ -0,0 +1,178 @@
+"""
+Local mock of the OpenRouter chat-completions endpoint for the gateway tests.
+
+    server = MockOpenRouter(delay=0.05, failures=[503, 429]).start()
+    ... point clients at server.base_url ...
+    server.stop()
+
+Answers with HTTP/1.1 keep-alive (optionally over TLS with a throwaway
+self-signed cert), replays `failures` as status codes for the first
+requests, and records connections opened and peak in-flight requests per
+model. `"stream": true` requests get SSE chunks: the first after `delay`
+(time to first token), then one ~4-character token every `token_delay`;
+non-streamed answers arrive after the same total generation time. `reply`
+may be a function of the request body (e.g. a fake translator). A system
+message seen before is reported as cached prompt tokens, like a provider's
+prompt cache (~4 characters per token). `model_delay` overrides `delay` per
+model (a slow primary vs. a fast backup).
+"""
+
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True   # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.mock.lock:
+            self.server.mock.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        mock = self.server.mock
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model")
+        with mock.lock:
+            mock.requests += 1
+            status = mock.failures.pop(0) if mock.failures else 200
+            mock.in_flight[model] = mock.in_flight.get(model, 0) + 1
+            mock.peak[model] = max(mock.peak.get(model, 0), mock.in_flight[model])
+        try:
+            reply = mock.reply_for(body)
+            cached = mock.prompt_cache(body)
+            time.sleep(mock.model_delay.get(model, mock.delay))
+            if status == 200 and body.get("stream"):
+                self._stream(mock, reply, cached)
+                return
+            if status == 200:
+                time.sleep(mock.token_delay * len(mock.tokens(reply)))
+                payload = {
+                    "choices": [{"message": {"content": reply}}],
+                    "usage": {"prompt_tokens": 100 + cached, "completion_tokens": 20, "total_tokens": 120 + cached,
+                              "prompt_tokens_details": {"cached_tokens": cached}},
+                    "cost": 0.0001
+                }
+            else:
+                payload = {"error": {"code": status, "message": "mock failure"}}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # the client cancelled (e.g. a hedged request that lost)
+        finally:
+            with mock.lock:
+                mock.in_flight[model] -= 1
+
+    def _stream(self, mock, reply, cached=0):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(text):
+            payload = text.encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        event(": OPENROUTER PROCESSING\n\n")   # keep-alive comment, as OpenRouter sends
+        tokens = mock.tokens(reply)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(mock.token_delay)
+            event(f"data: {json.dumps({'model': 'mock', 'choices': [{'delta': {'content': token}}]})}\n\n")
+        usage = {"prompt_tokens": 100 + cached, "completion_tokens": len(tokens), "total_tokens": 100 + cached + len(tokens),
+                 "prompt_tokens_details": {"cached_tokens": cached},
+                 "cost": 0.0001}
+        event(f"data: {json.dumps({'model': 'mock', 'choices': [], 'usage': usage})}\n\n")
+        event("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def self_signed_context(tmpdir):
+    """TLS context with a throwaway cert (None if the openssl CLI is missing)."""
+    if not shutil.which("openssl"):
+        return None
+    cert, key = os.path.join(tmpdir, "cert.pem"), os.path.join(tmpdir, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+class MockOpenRouter:
+    def __init__(self, delay=0.0, failures=(), reply='{"summary": "ok"}', tls=False, token_delay=0.0, model_delay=None):
+        self.delay = delay
+        self.model_delay = dict(model_delay or {})
+        self.token_delay = token_delay
+        self.failures = list(failures)
+        self.reply = reply
+        self.tls = tls
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = {}
+        self.peak = {}
+        self.bodies = []
+        self._prefixes = set()
+        self._tmpdir = None
+        self.server = None
+
+    def prompt_cache(self, body):
+        """Cached prompt tokens for this request (0 the first time a system message is seen)."""
+        messages = body.get("messages") or [{}]
+        with self.lock:
+            self.bodies.append(body)
+            if messages[0].get("role") != "system":
+                return 0
+            prefix = json.dumps(messages[0], sort_keys=True, ensure_ascii=False)
+            seen = prefix in self._prefixes
+            self._prefixes.add(prefix)
+        return len(prefix) // 4 if seen else 0
+
+    def reply_for(self, body):
+        return self.reply(body) if callable(self.reply) else self.reply
+
+    def tokens(self, reply=None):
+        reply = self.reply if reply is None else reply
+        return [reply[i:i + 4] for i in range(0, len(reply), 4)]
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.mock = self
+        scheme = "http"
+        if self.tls:
+            self._tmpdir = tempfile.mkdtemp()
+            context = self_signed_context(self._tmpdir)
+            if context is None:
+                raise RuntimeError("openssl not found: cannot create a TLS mock")
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            scheme = "https"
+        self.base_url = f"{scheme}://127.0.0.1:{self.server.server_address[1]}/api/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
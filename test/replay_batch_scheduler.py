@@ -0,0 +1,144 @@
+"""
+Replay: fixed batches (10 segments / 30 s) vs. the adaptive BatchScheduler
+==========================================================================
+Feeds saved `[FINAL] ...json` transcripts through both batching rules on a
+simulated clock: each final arrives shortly after its `end`, speech_final is
+inferred from the pause before the next segment, and the batch timer ticks
+once per second. Reports per-segment batch latency (arrival -> batch sent,
+p50 / p95), LLM calls per hour and tokens per batch. Fails if the adaptive
+rule makes more LLM calls per hour than the fixed one (cost regression).
+
+Usage: python test/replay_batch_scheduler.py [transcript.json ...]
+       (default: transcripts/[FINAL] *.json, or a synthetic session if none)
+"""
+
+import glob
+import json
+import math
+import os
+import random
+import statistics
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from batch_scheduler import TICK_SECONDS, BatchScheduler, estimate_tokens
+
+LEGACY_SIZE = 10
+LEGACY_INTERVAL = 30
+FINALIZE_DELAY = 0.3   # Deepgram final arrives ~300 ms after the words end
+ENDPOINT_GAP = 0.5     # pause that Deepgram would mark as speech_final
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def load_segments(paths):
+    sessions = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            segments = json.load(f).get("segments", [])
+        if segments:
+            sessions.append((os.path.basename(path), segments))
+    return sessions
+
+
+def synthetic_session(minutes=60, seed=7):
+    """Press-conference pacing: bursts of speech, short pauses, Q&A gaps."""
+    rng = random.Random(seed)
+    words = ("the committee remains highly attentive to inflation risks and judges that "
+             "the labor market has cooled while growth moderated in the third quarter").split()
+    segments, t = [], 0.0
+    while t < minutes * 60:
+        duration = rng.uniform(1.5, 6.0)
+        text = " ".join(rng.choice(words) for _ in range(int(duration * 2.6)))
+        segments.append({"speaker": "Speaker 0", "text": text, "start": t, "end": t + duration})
+        t += duration + rng.choice([0.05, 0.1, 0.2, 0.8, 1.5, 6.0])
+    return [("synthetic", segments)]
+
+
+def arrivals(segments):
+    """(arrival time, text, speech_final) per final segment."""
+    events = []
+    for i, seg in enumerate(segments):
+        gap = segments[i + 1]["start"] - seg["end"] if i + 1 < len(segments) else math.inf
+        events.append((seg["end"] + FINALIZE_DELAY, seg["text"], gap >= ENDPOINT_GAP))
+    return events
+
+
+def replay_legacy(events):
+    # Old pake_live: only checked when a segment arrives
+    latencies, batches, pending, last_send = [], [], [], None
+    for at, text, _ in events:
+        if last_send is None:
+            last_send = at
+        pending.append((at, text))
+        if len(pending) >= LEGACY_SIZE or at - last_send >= LEGACY_INTERVAL:
+            latencies.extend(at - a for a, _ in pending)
+            batches.append(sum(estimate_tokens(t) for _, t in pending))
+            pending, last_send = [], at
+    return latencies, batches, pending
+
+
+def replay_adaptive(events):
+    clock = Clock()
+    scheduler = BatchScheduler(clock=clock)
+    latencies, batches, pending = [], [], []
+
+    def flush():
+        latencies.extend(clock.now - a for a, _ in pending)
+        batches.append(sum(estimate_tokens(t) for _, t in pending))
+        pending.clear()
+        scheduler.flushed()
+
+    next_tick = TICK_SECONDS
+    for at, text, speech_final in events:
+        while next_tick < at:        # timer ticks between arrivals
+            clock.now = next_tick
+            if scheduler.due():
+                flush()
+            next_tick += TICK_SECONDS
+        clock.now = at
+        pending.append((at, text))
+        scheduler.add(text, speech_final)
+        if scheduler.due():
+            flush()
+    while pending:                   # stream quiet after the last segment
+        clock.now = next_tick
+        if scheduler.due():
+            flush()
+        next_tick += TICK_SECONDS
+    return latencies, batches, pending
+
+
+def report(name, hours, result):
+    latencies, batches, left = result
+    q = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+    print(f"  {name:<9} | latency p50 {statistics.median(latencies):5.1f}s p95 {q[18]:5.1f}s "
+          f"max {max(latencies):6.1f}s | {len(batches) / hours:6.0f} calls/h | "
+          f"{statistics.mean(batches):5.0f} tok/batch | {len(left)} never sent")
+    return len(batches) / hours
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(PROJECT_ROOT, "transcripts", "[[]FINAL[]] *.json")))
+    sessions = load_segments(paths) or synthetic_session()
+    ok = True
+    for name, segments in sessions:
+        events = arrivals(segments)
+        hours = max(segments[-1]["end"] - segments[0]["start"], 1.0) / 3600
+        print(f"🎬 {name}: {len(segments)} segments, {hours * 60:.0f} min")
+        legacy = report("legacy", hours, replay_legacy(events))
+        adaptive = report("adaptive", hours, replay_adaptive(events))
+        if adaptive > legacy:
+            ok = False
+            print(f"  ❌ adaptive makes {adaptive - legacy:.0f} more LLM calls/h than legacy")
+        else:
+            print(f"  ✅ adaptive calls/h within legacy ({adaptive:.0f} <= {legacy:.0f})")
+    sys.exit(0 if ok else 1)
@@ -1,9 +1,13 @@
 
+import queue
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve() / "src"))
+from audio_ingest import AudioIngest, FRAME_BYTES
+
 # Detect venv Python path
 SCRIPT_DIR = Path(__file__).parent.resolve()
 # Use the same logic as pake_live.py, but assuming running from 'test' folder
@@ -23,32 +27,27 @@ def test_pipeline(url):
         print("❌ ffmpeg NOT found or error: ", e)
         return
 
-    pipeline_cmd = (
-        f'"{VENV_PYTHON}" -m yt_dlp "{url}" -o - -q --no-warnings | '
-        'ffmpeg -hide_banner -loglevel panic -i pipe:0 -f s16le -ac 1 -ar 16000 pipe:1'
-    )
-    
-    print(f"🚀 Running command:\n{pipeline_cmd}")
+    ingest = AudioIngest(url, python=VENV_PYTHON)
+    print(f"🚀 Running pipeline:\n{' '.join(ingest.source_cmd())}\n  -> {' '.join(ingest.decoder_cmd())}")
     
     try:
-        process = subprocess.Popen(pipeline_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, bufsize=10**6)
+        ingest.start()
         
-        print("⏳ Reading output (waiting for first 4096 bytes)...")
-        data = process.stdout.read(4096)
+        print(f"⏳ Reading output (waiting for first {FRAME_BYTES}-byte frame)...")
+        frame = ingest.get(timeout=30)
         
-        if data:
-            print(f"✅ Success! Received {len(data)} bytes from pipeline.")
+        if frame is not None:
+            print(f"✅ Success! Received {len(frame)} bytes from pipeline.")
+            ingest.release(frame)
         else:
             print("❌ No data received from pipeline.")
-            # Check stderr
-            _, stderr = process.communicate()
-            if stderr:
-                print(f"⚠️ Pipeline Stderr: {stderr.decode('utf-8', errors='ignore')}")
                 
-        process.terminate()
-        
+    except queue.Empty:
+        print("❌ Timed out waiting for audio.")
     except Exception as e:
         print(f"❌ Exception: {e}")
+    finally:
+        ingest.stop()
 
 if __name__ == "__main__":
     test_url = "https://www.youtube.com/watch?v=DnbxnlxSH4U" # The URL user failed with
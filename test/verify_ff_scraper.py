@@ -0,0 +1,230 @@
+"""
+Verify / benchmark the incremental ForexFactory scraper on the saved
+calendar fixtures (test/fixtures/ff_calendar_*.html) served by a local
+keep-alive server:
+
+- parsed events match the legacy full-page BeautifulSoup path (except
+  that blank-time continuation rows now carry the time of the row above)
+- ETag: a repeat fetch is a 304 and returns the previous list untouched
+- no validators: a page whose tokens changed but whose table did not is
+  not parsed; a changed `actual` is reported as the only changed event
+- one connection is reused for every fetch
+- ms per snipe fetch: legacy (new connection + html.parser on the whole
+  page) against conditional / incremental fetches
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from bs4 import BeautifulSoup
+from curl_cffi import requests
+
+import economic_detector
+from economic_detector import ForexFactoryScraper
+
+FIXTURES = os.path.join(PROJECT_ROOT, "test", "fixtures")
+ROUNDS = 20
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class CalendarServer:
+    """Serves one page per path; ETag on request, counts connections and 304s"""
+
+    def __init__(self, pages, etag=True):
+        self.pages = dict(pages)
+        self.etag = etag
+        self.connections = set()
+        self.requests = 0
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.connections.add(self.client_address)
+                server.requests += 1
+                body = server.pages[self.path.split("?")[-1]].encode("utf-8")
+                tag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if server.etag and self.headers.get("If-None-Match") == tag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", tag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if server.etag:
+                    self.send_header("ETag", tag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/calendar"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def scraper_for(server):
+    scraper = ForexFactoryScraper()
+    scraper.urls = {"today": server.base_url + "?day=today", "week": server.base_url + "?week=this"}
+    return scraper
+
+
+def legacy_fetch(url):
+    """fetch_news before the scraping engine: new connection, full-page html.parser"""
+    return legacy_parse(requests.get(url, impersonate="chrome110", timeout=15).content)
+
+
+def legacy_parse(content):
+    soup = BeautifulSoup(content, "html.parser")
+    table = soup.find("table", class_="calendar__table")
+    news_list = []
+    for row in table.find_all("tr", class_="calendar__row"):
+        impact_span = row.find("span", class_="on")
+        if not impact_span:
+            impact_span = row.select_one("span[class*='icon--ff-impact']")
+            if not impact_span:
+                continue
+        impact_class = impact_span.get("class", [])
+        impact = "Unknown"
+        for token, name in (("red", "High"), ("ora", "Medium"), ("yel", "Low"), ("gra", "Non-Econ")):
+            if f"icon--ff-impact-{token}" in impact_class:
+                impact = name
+                break
+        cells = {name: row.find("td", class_=f"calendar__{name}") for name in
+                 ("time", "currency", "event", "actual", "forecast", "previous")}
+        text = {name: cell.text.strip() if cell else "" for name, cell in cells.items()}
+        news_list.append({"time": text["time"], "currency": text["currency"], "impact": impact,
+                          "title": text["event"], "actual": text["actual"], "forecast": text["forecast"],
+                          "previous": text["previous"]})
+    return news_list
+
+
+def inherit_times(events):
+    """Legacy events with the continuation-row rule applied"""
+    last, out = "", []
+    for event in events:
+        event = {**event, "time": event["time"] or last}
+        last = event["time"]
+        out.append(event)
+    return out
+
+
+def timed(fn, rounds=ROUNDS):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - t0) / rounds * 1000, result
+
+
+def verify_etag(week, today):
+    server = CalendarServer({"week=this": week, "day=today": today}).start()
+    scraper = scraper_for(server)
+    first = scraper.fetch_changes("week")
+    legacy = inherit_times(legacy_fetch(scraper.urls["week"]))
+    day = scraper.fetch_changes("today")
+    second = scraper.fetch_changes("week")
+    server.stop()
+    ok = (first.status == "parsed" and first.events == legacy and len(first.changed) == len(legacy)
+          and day.status == "parsed" and day.events == inherit_times(legacy_parse(today))
+          and second.status == "not_modified" and second.events is first.events and server.not_modified == 1)
+    print(f"{'✅' if ok else '❌'} ETag: first fetch parsed {len(first.events)} events (same as legacy: "
+          f"{first.events == legacy}), today page kept apart ({len(day.events)} events), repeat week fetch "
+          f"{second.status}, same list returned: {second.events is first.events}")
+    return ok
+
+
+def verify_incremental(week):
+    server = CalendarServer({"week=this": week}, etag=False).start()
+    scraper = scraper_for(server)
+    first = scraper.fetch_changes("week")
+    server.pages["week=this"] = week.replace("SESSION_TOKEN", "SESSION_TOKEN_2")   # page noise only
+    noise = scraper.fetch_changes("week")
+    # The T+10s snipe: one actual comes in
+    target = next(event for event in first.events if event["impact"] == "High" and not event["actual"])
+    event_id = next(key for key, event in scraper.pages[scraper.urls["week"]].by_key.items() if event._asdict() == target)
+    row_start = week.index(f'data-event-id="{event_id}"')
+    cell = week.index('<td class="calendar__cell calendar__actual"></td>', row_start)
+    server.pages["week=this"] = week[:cell] + '<td class="calendar__cell calendar__actual"><span class="better">9.9%</span></td>' \
+        + week[cell + len('<td class="calendar__cell calendar__actual"></td>'):]
+    actual = scraper.fetch_changes("week")
+    server.stop()
+    ok = (noise.status == "unchanged" and noise.events is first.events and actual.status == "parsed"
+          and [(e["title"], e["actual"]) for e in actual.changed] == [(target["title"], "9.9%")]
+          and not actual.removed and len(server.connections) == 1 and server.requests == 3)
+    print(f"{'✅' if ok else '❌'} no validators: token-only change -> {noise.status}, new actual -> "
+          f"{len(actual.changed)} changed event ({target['currency']} {target['title']}), "
+          f"{server.requests} requests on {len(server.connections)} connection(s)")
+    return ok
+
+
+def verify_fallback_parser(week):
+    table = economic_detector.calendar_table(week)
+    fast = economic_detector.parse_calendar(table)
+    economic_detector.etree, etree = None, economic_detector.etree
+    try:
+        slow = economic_detector.parse_calendar(table)
+    finally:
+        economic_detector.etree = etree
+    ok = fast == slow and len(fast[0]) > 0
+    print(f"{'✅' if ok else '❌'} lxml and html.parser give the same {len(fast[0])} events and keys")
+    return ok
+
+
+def bench(week):
+    server = CalendarServer({"week=this": week}).start()
+    url = server.base_url + "?week=this"
+    legacy_ms, _ = timed(lambda: legacy_fetch(url))
+    legacy_conns = len(server.connections)
+
+    scraper = scraper_for(server)
+    cold_ms, _ = timed(lambda: (scraper.pages.clear(), scraper.fetch_changes("week")))
+    etag_ms, _ = timed(lambda: scraper.fetch_changes("week"))
+    server.etag = False
+    scraper.pages.clear()
+    scraper.fetch_changes("week")
+    same_ms, _ = timed(lambda: scraper.fetch_changes("week"))
+    server.stop()
+
+    parse_full_ms, _ = timed(lambda: legacy_parse(week), 5)
+    parse_table_ms, _ = timed(lambda: economic_detector.parse_calendar(economic_detector.calendar_table(week)), 5)
+    ok = cold_ms < legacy_ms and etag_ms < legacy_ms / 10 and same_ms < legacy_ms / 5
+    print(f"{'✅' if ok else '❌'} ms per snipe fetch (week, {len(week) // 1024} KB): legacy {legacy_ms:.1f} "
+          f"({legacy_conns} connections / {ROUNDS}) | full parse {cold_ms:.1f} | unchanged table {same_ms:.1f} | "
+          f"304 {etag_ms:.1f} (1 connection)")
+    print(f"   parse only: whole page with html.parser {parse_full_ms:.1f} ms, table slice "
+          f"{parse_table_ms:.1f} ms (see bench_calendar_parser.py)")
+    return ok
+
+
+if __name__ == "__main__":
+    week = load("ff_calendar_week.html")
+    ok = verify_etag(week, load("ff_calendar_today.html"))
+    ok = verify_incremental(week) and ok
+    ok = verify_fallback_parser(week) and ok
+    ok = bench(week) and ok
+    sys.exit(0 if ok else 1)
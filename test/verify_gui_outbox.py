@@ -0,0 +1,121 @@
+"""
+Verify the GUI outbox: producers never block on a slow GUI, interims are
+coalesced, and finals survive a GUI disconnect (spooled to disk, replayed in
+order on reconnect). Each backend spools to its own file, and spooled
+messages of sessions that ended (or of an earlier run) are not replayed.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from gui_outbox import GuiOutbox, spool_path_for
+
+
+class FakeGui:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.up = True
+        self.received = []
+        self.lock = threading.Lock()
+
+    def send(self, payload):
+        if not self.up:
+            raise ConnectionError("GUI gone")
+        time.sleep(self.delay)
+        with self.lock:
+            self.received.append(payload)
+
+
+def wait_for(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not cond():
+        time.sleep(0.01)
+    return cond()
+
+
+def verify_slow_gui(tmp):
+    gui = FakeGui(delay=0.05)   # 50 ms per message
+    outbox = GuiOutbox(gui.send, spool_path=os.path.join(tmp, "a.jsonl")).start()
+    outbox.connected()
+    t0 = time.perf_counter()
+    for i in range(50):
+        outbox.put({"type": "segment", "id": i, "stream_id": "main"})
+        outbox.put({"type": "interim", "text": f"partial {i}", "stream_id": "main"})
+    blocked = time.perf_counter() - t0
+    done = wait_for(lambda: len([p for p in gui.received if p["type"] == "segment"]) == 50)
+    interims = len([p for p in gui.received if p["type"] == "interim"])
+    ok = done and blocked < 0.05 and interims < 50
+    print(f"{'✅' if ok else '❌'} slow GUI: 100 puts took {blocked * 1000:.1f} ms, "
+          f"{interims}/50 interims sent (rest coalesced), metrics {outbox.metrics()}")
+    return ok
+
+
+def verify_disconnect(tmp):
+    gui = FakeGui()
+    outbox = GuiOutbox(gui.send, spool_path=os.path.join(tmp, "b.jsonl")).start()
+    outbox.connected()
+    for i in range(10):
+        outbox.put({"type": "segment", "id": i})
+    wait_for(lambda: len(gui.received) == 10)
+
+    gui.up = False              # GUI crashes ...
+    outbox.put({"type": "segment", "id": 10})  # ... writer notices on this send
+    wait_for(lambda: not outbox.metrics()["connected"])
+    for i in range(11, 30):
+        outbox.put({"type": "segment", "id": i})
+    spooled = outbox.metrics()["spooled"]
+
+    gui.up = True               # ... and comes back
+    outbox.connected()
+    wait_for(lambda: len(gui.received) == 30)
+    ids = [p["id"] for p in gui.received]
+    ok = ids == list(range(30)) and spooled == 20
+    print(f"{'✅' if ok else '❌'} disconnect: {spooled} finals spooled to disk, "
+          f"{len(ids)}/30 delivered in order={ids == list(range(30))}")
+    return ok
+
+
+def verify_stale_spool(tmp):
+    separate = spool_path_for("localhost:8765") != spool_path_for("localhost:8766")
+    path = os.path.join(tmp, "c.jsonl")
+    live = {"run1-fed", "run1-ecb"}
+    gui = FakeGui()
+    gui.up = False
+    outbox = GuiOutbox(gui.send, spool_path=path, is_live=live.__contains__).start()
+    for i in range(6):
+        outbox.put({"type": "segment", "id": i}, owner="run1-fed" if i % 2 else "run1-ecb")
+    live.discard("run1-ecb")    # ECB stream stopped while the GUI was away
+    gui.up = True
+    outbox.connected()
+    wait_for(lambda: len(gui.received) == 3 and outbox.metrics()["spooled"] == 0)
+    stopped_dropped = [p["id"] for p in gui.received] == [1, 3, 5]
+
+    # Backend restart: the next run's outbox finds the old spool, none of its sessions exist
+    gui.up = False
+    outbox.disconnected()
+    outbox.put({"type": "segment", "id": 6}, owner="run1-fed")
+    restarted_gui = FakeGui()
+    restarted = GuiOutbox(restarted_gui.send, spool_path=path, is_live={"run2-fed"}.__contains__).start()
+    restarted.connected()
+    wait_for(lambda: restarted.metrics()["stale_discarded"] == 1)
+    m = restarted.metrics()
+    ok = separate and stopped_dropped and m["stale_discarded"] == 1 and not restarted_gui.received \
+        and m["spooled"] == 0
+    print(f"{'✅' if ok else '❌'} stale spool: one spool per backend address {separate}, "
+          f"stopped session's finals dropped {stopped_dropped}, "
+          f"{m['stale_discarded']} message(s) of the previous run discarded after a restart")
+    return ok
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        ok = verify_slow_gui(tmp)
+        ok = verify_disconnect(tmp) and ok
+        ok = verify_stale_spool(tmp) and ok
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,157 @@
+"""
+Verify per-stream GUI state: the stream selector starts and stops one
+backend stream at a time, batches from each stream feed that stream's own
+memory / trend, analysis cards with the same batch number in two streams
+stay separate, STOP of one stream cancels only its jobs and ignores
+only its later messages, the live interim line follows each stream
+until its final arrives, and a batch labeled locally (no LLM call) still
+triggers its scheduled big-picture update without touching memory / trend.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["PAKE_IPC_ADDRESS"] = "localhost:18792"
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication([])
+
+
+def pump(seconds=0.2):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def batch(stream_id, number, text):
+    return {"type": "batch", "stream_id": stream_id,
+            "data": {"batch_number": number, "previous_context": "",
+                     "current_batch": {"text": text, "segments": [{"speaker": "Speaker 0", "text": text}],
+                                       "segment_ids": [number]}}}
+
+
+def analysis(number, sentiment, summary):
+    return {"batch_num": number, "summary": summary, "sentiment": sentiment, "signal_strength": "HIGH",
+            "prediction": "-", "gold": "-", "forex": "-", "stock": "-"}
+
+
+def verify():
+    import pake_gui
+    from config_manager import config
+    config.config.update({"stream_id": "main", "target_media_url": "https://example.invalid/fed",
+                          "streams": {"ecb": "https://example.invalid/ecb"}, "enable_translation": False})
+
+    window = pake_gui.PakeAnalyzerWindow()
+    commands, submitted, cancelled = [], [], []
+    window.send_command = lambda cmd, payload: commands.append((cmd, payload["stream_id"], payload.get("url")))
+    window.jobs.submit = lambda worker, lane="analysis", name=None, key=None, group=None: submitted.append((worker, lane, key, group))
+    window.jobs.cancel_all = lambda group=None: cancelled.append(group)
+
+    # START both streams from the selector
+    for stream_id in ("ecb", "main"):
+        window.stream_combo.setCurrentText(stream_id)
+        window.btn_start.click()
+    started = commands == [("START", "ecb", "https://example.invalid/ecb"), ("START", "main", "https://example.invalid/fed")]
+
+    # Batches feed each stream's own memory
+    window._on_message(batch("main", 1, "We will keep rates restrictive."))
+    window._on_message(batch("ecb", 1, "Rate cuts are appropriate."))
+    window._update_analysis_partial({"batch_num": 1, "summary": "…"}, "main")
+    window._update_analysis_partial({"batch_num": 1, "summary": "…"}, "ecb")
+    pump()
+    two_cards = set(window.analysis_cards) == {("main", 1), ("ecb", 1)}
+    window._update_analysis(analysis(1, "HAWKISH", "Fed hawkish"), "main")
+    window._update_analysis(analysis(1, "NEUTRAL", "ECB on hold, inflation 2.1% cpi"), "ecb")
+    window._on_message(batch("ecb", 2, "Further cuts possible."))
+    ecb_worker = submitted[-1][0]
+    main, ecb = window.streams["main"], window.streams["ecb"]
+    separate = (main.memory["trend"] == {"hawkish": 1, "dovish": 0, "neutral": 0}
+                and ecb.memory["trend"] == {"hawkish": 0, "dovish": 0, "neutral": 1}
+                and ecb_worker.memory["summaries"] == [{"batch": 1, "summary": "ECB on hold, inflation 2.1% cpi",
+                                                         "sentiment": "NEUTRAL"}]
+                and [job[3] for job in submitted] == ["main", "ecb", "main", "ecb", "ecb"])
+    trend_shown = "HAWKISH" in window.trend_label.text()   # "main" is selected
+
+    # A prefiltered batch #2 leaves memory alone but still refreshes the big picture
+    jobs_before = len(submitted)
+    window._update_analysis({"batch_num": 2, "prefiltered": {"label": "ADMIN", "confidence": 0.93}}, "main")
+    new_jobs = [(job[1], job[3]) for job in submitted[jobs_before:]]
+    prefiltered = (new_jobs == [("summary", "main")] and len(main.memory["summaries"]) == 1
+                   and main.memory["trend"] == {"hawkish": 1, "dovish": 0, "neutral": 0})
+
+    # Interims: one live line per stream, replaced by the stream's final
+    for text in ("Inflation", "Inflation is", "Inflation is easing"):
+        window._on_message({"type": "interim", "stream_id": "ecb", "data": {"speaker": "Speaker 1", "text": text}})
+    window._on_message({"type": "interim", "stream_id": "main", "data": {"speaker": "Speaker 0", "text": "We"}})
+    pump()
+    live_line = window.interim_label.text()
+    window._on_message({"type": "segment", "stream_id": "main", "id": 9,
+                        "data": {"speaker": "Speaker 0", "text": "We stay data dependent."}})
+    interims = (live_line == "✍️ Speaker 1 • ecb: Inflation is easing\n✍️ Speaker 0: We"
+                and window.interim_label.text() == "✍️ Speaker 1 • ecb: Inflation is easing")
+
+    # STOP only the ECB stream
+    window.stream_combo.setCurrentText("ecb")
+    stopped_button = window.btn_start.isChecked() and window.btn_start.text() == "⏹ STOP"
+    window.btn_start.click()
+    jobs_before = len(submitted)
+    window._on_message(batch("ecb", 3, "ignored after STOP"))
+    window._on_message(batch("main", 2, "still analysed"))
+    new_groups = [job[3] for job in submitted[jobs_before:]]
+    stop_ok = (commands[-1] == ("STOP", "ecb", None) and cancelled == ["ecb"] and main.running
+               and not ecb.running and new_groups == ["main"])
+    window.stream_combo.setCurrentText("main")
+    main_button = window.btn_start.isChecked()
+
+    stop_ok = stop_ok and window.interim_label.isHidden()
+    ok = (started and two_cards and separate and trend_shown and prefiltered and interims and stopped_button
+          and stop_ok and main_button)
+    print(f"{'✅' if ok else '❌'} per-stream GUI: START ecb + main {started}, separate cards {two_cards}, "
+          f"separate memory / trend {separate}, trend label follows selection {trend_shown}, "
+          f"prefiltered batch refreshes the big picture {prefiltered}, interim line per stream {interims}, "
+          f"STOP ecb only {stop_ok}, main still shown as running {main_button}")
+    window.close()
+    return ok
+
+
+def verify_pool_groups():
+    from gui.job_pool import JobPool
+    from PySide6.QtCore import QObject, Signal
+
+    class Idle(QObject):
+        finished = Signal()
+
+        def run(self):
+            time.sleep(0.2)
+
+    pool = JobPool(threads=1)
+    pool.submit(Idle(), group="main")
+    queued = [pool.submit(Idle(), group=group, key=("summary", group)) for group in ("main", "ecb", "ecb")]
+    pool.cancel_all(group="ecb")
+    kept = [job.group for job in queued if not job.cancelled]
+    ok = kept == ["main"] and pool.metrics()["queue_depth"] == 1 and pool.wait(2000)
+    print(f"{'✅' if ok else '❌'} job pool: cancel_all('ecb') kept queued jobs of {kept}")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # throwaway data/ for config and cost logs
+    try:
+        ok = verify()
+        ok = verify_pool_groups() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,148 @@
+"""
+Verify the GUI job pool: bounded threads, analysis jumps ahead of queued
+translation/summary jobs, a newer summary replaces a queued one, and STOP
+(cancel_all) drops the queue, silences running jobs and cancels their
+in-flight LLM requests, so wait() does not sit out the request.
+"""
+
+import os
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+from gui.job_pool import JobPool
+from llm_gateway import CancelToken, LlmGateway
+from mock_openrouter import MockOpenRouter
+
+LLM_DELAY = 5.0   # seconds the mock takes to answer
+
+
+class FakeWorker(QObject):
+    finished = Signal(str)
+    threads = set()
+
+    def __init__(self, name, duration=0.05):
+        super().__init__()
+        self.name = name
+        self.duration = duration
+
+    def run(self):
+        FakeWorker.threads.add(threading.get_ident())
+        time.sleep(self.duration)
+        self.finished.emit(self.name)
+
+
+class LlmWorker(QObject):
+    """Blocks on one gateway request, like the pake_gui LLM workers."""
+    finished = Signal(str)
+
+    def __init__(self, gateway):
+        super().__init__()
+        self.gateway = gateway
+        self.cancel = CancelToken()
+
+    def run(self):
+        try:
+            self.gateway.complete({"model": "mock/analysis", "messages": []}, cancel=self.cancel)
+            self.finished.emit("answered")
+        except Exception:
+            self.finished.emit("cancelled")
+
+
+class Collector(QObject):
+    """GUI-side receiver (the window's slots in pake_gui)."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = []
+
+    def append(self, name):
+        self.names.append(name)
+
+
+def run_until(app, cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not cond():
+        app.processEvents()
+        time.sleep(0.005)
+    return cond()
+
+
+def verify_priority(app):
+    pool, collector = JobPool(threads=1), Collector()
+    order = collector.names
+    pool.submit(FakeWorker("first"), lane="summary").worker.finished.connect(collector.append)
+    for name, lane in [("summary", "summary"), ("translation", "translation"), ("analysis", "analysis")]:
+        pool.submit(FakeWorker(name), lane=lane).worker.finished.connect(collector.append)
+    run_until(app, lambda: len(order) == 4)
+    ok = order == ["first", "analysis", "translation", "summary"]
+    print(f"{'✅' if ok else '❌'} priority lanes: completion order {order}")
+    return ok
+
+
+def verify_replace_and_cancel(app):
+    pool, collector = JobPool(threads=2), Collector()
+    done = collector.names
+    for i in range(2):
+        pool.submit(FakeWorker(f"busy{i}", 0.2), lane="analysis").worker.finished.connect(collector.append)
+    for i in range(3):
+        pool.submit(FakeWorker(f"summary{i}"), lane="summary", key="summary").worker.finished.connect(collector.append)
+    for i in range(4):
+        pool.submit(FakeWorker(f"translation{i}"), lane="translation").worker.finished.connect(collector.append)
+    depth = pool.metrics()["queued"]
+    pool.cancel_all()          # STOP while both threads are busy
+    pool.wait(2000)
+    run_until(app, lambda: False, 0.3)
+    m = pool.metrics()
+    ok = depth == {"analysis": 0, "translation": 4, "summary": 1} and done == [] and m["queue_depth"] == 0
+    print(f"{'✅' if ok else '❌'} replace + cancel: queued before STOP {depth}, results after STOP {done}, metrics {m}")
+    return ok
+
+
+def verify_cancel_in_flight(app):
+    server = MockOpenRouter(delay=LLM_DELAY).start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url, max_retries=0)
+    pool, collector = JobPool(threads=2), Collector()
+    for _ in range(2):
+        pool.submit(LlmWorker(gateway)).worker.finished.connect(collector.append)
+    run_until(app, lambda: len(server.bodies) == 2)
+    t0 = time.perf_counter()
+    pool.cancel_all()
+    drained = pool.wait(int(LLM_DELAY * 2000))
+    elapsed = time.perf_counter() - t0
+    run_until(app, lambda: False, 0.2)
+    ok = drained and elapsed < 1.0 and collector.names == []
+    print(f"{'✅' if ok else '❌'} STOP with 2 requests in flight: wait() returned after {elapsed * 1000:.0f} ms "
+          f"(mock answers after {LLM_DELAY:.0f} s), results after STOP {collector.names}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_long_session(app):
+    FakeWorker.threads.clear()
+    pool, collector = JobPool(threads=3), Collector()
+    done = collector.names
+    for i in range(300):
+        pool.submit(FakeWorker(str(i), 0.001), lane="analysis" if i % 2 else "translation").worker.finished.connect(collector.append)
+    run_until(app, lambda: len(done) == 300)
+    m = pool.metrics()
+    ok = len(done) == 300 and len(FakeWorker.threads) <= 3 and m["running"] == 0
+    print(f"{'✅' if ok else '❌'} 300 jobs on {len(FakeWorker.threads)} pool thread(s), "
+          f"wait p50 {m['wait_ms_p50']} ms / p95 {m['wait_ms_p95']} ms")
+    return ok
+
+
+if __name__ == "__main__":
+    app = QCoreApplication(sys.argv)
+    ok = verify_priority(app)
+    ok = verify_replace_and_cancel(app) and ok
+    ok = verify_cancel_in_flight(app) and ok
+    ok = verify_long_session(app) and ok
+    sys.exit(0 if ok else 1)
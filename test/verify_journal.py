@@ -0,0 +1,110 @@
+"""
+Verify transcript journaling: a session killed mid-write (torn last line) is
+recovered into the usual [FINAL] json, a clean stop compacts to the same
+shape the old one-shot json.dump produced, a STOP + START of one stream in
+the same second gets a journal of its own, and the last lines before a
+quiet stretch are fsync'd without waiting for another write.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+import transcript_journal
+from transcript_journal import TranscriptJournal, read_journal
+
+META = {"stream_id": "main", "url": "https://example.com/live", "title": "FOMC Press Conference",
+        "started_at": "2026-01-28T14:30:00"}
+SEGMENTS = [{"speaker": f"Speaker {i % 2}", "text": f"sentence {i} ยืนยัน", "start": i * 2.0, "end": i * 2.0 + 1.5}
+            for i in range(50)]
+
+
+def verify_recover(tmp):
+    path = os.path.join(tmp, "transcripts", "journal", "main_1769610600.jsonl")
+    journal = TranscriptJournal(path, meta=META)
+    for seg in SEGMENTS:
+        journal.append(seg)
+    journal._file.write('{"type": "segment", "speaker": "Speak')  # Killed mid-line
+    journal._file.flush()
+    journal._file = None  # Simulated crash: never closed or compacted
+
+    result = subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, "src", "transcript_journal.py"),
+                             "recover", "--all"], cwd=tmp, capture_output=True, text=True)
+    print(result.stdout.strip())
+    out = os.path.join(tmp, "transcripts", "[FINAL] FOMC Press Conference_1769610600.json")
+    with open(out, encoding="utf-8") as f:
+        data = json.load(f)
+    ok = data["segments"] == SEGMENTS and data["meta"]["title"] == META["title"] and not os.path.exists(path)
+    print(f"{'✅' if ok else '❌'} recovered {len(data['segments'])}/{len(SEGMENTS)} segments after crash")
+    return ok
+
+
+def verify_compact(tmp):
+    path = os.path.join(tmp, "journal", "main_1.jsonl")
+    journal = TranscriptJournal(path, meta=META)
+    for seg in SEGMENTS:
+        journal.append(seg)
+    replayed = read_journal(path)
+    out = journal.compact(out_dir=tmp)
+    with open(out, encoding="utf-8") as f:
+        text = f.read()
+    legacy = json.dumps({"meta": META, "segments": SEGMENTS}, ensure_ascii=False, indent=2)
+    ok = replayed["segments"] == SEGMENTS and text == legacy and not os.path.exists(path)
+    print(f"{'✅' if ok else '❌'} compaction matches the legacy [FINAL] format")
+    return ok
+
+
+def verify_restart_same_second(tmp):
+    journal_dir = os.path.join(tmp, "restart")
+
+    def session():
+        return SimpleNamespace(stream_id="main", session_id=uuid.uuid4().hex, meta=dict(META))
+
+    first = TranscriptJournal.for_session(session(), journal_dir)
+    first.append(SEGMENTS[0])
+    second = TranscriptJournal.for_session(session(), journal_dir)   # START right after STOP
+    second.append(SEGMENTS[1])
+    first.compact(out_dir=tmp)   # the stopped session's background compaction
+    second.append(SEGMENTS[2])
+    second.close()
+    own_file = first.path != second.path and os.path.exists(second.path)
+    ok = own_file and read_journal(second.path)["segments"] == SEGMENTS[1:3]
+    print(f"{'✅' if ok else '❌'} STOP + START in one second: separate journals {first.path != second.path}, "
+          f"the new session's journal survives the old one's compaction {own_file}")
+    return ok
+
+
+def verify_quiet_fsync(tmp):
+    synced = []
+    real_fsync = os.fsync
+    transcript_journal.os.fsync = lambda fd: synced.append(time.time())
+    try:
+        journal = TranscriptJournal(os.path.join(tmp, "quiet", "main_2.jsonl"), fsync_interval=0.2)
+        journal.append(SEGMENTS[0])   # the last line before the stream goes quiet
+        written = time.time()
+        time.sleep(0.5)
+        after_quiet = len(synced)
+        journal.close()
+    finally:
+        transcript_journal.os.fsync = real_fsync
+    ok = after_quiet == 1 and synced[0] - written < 0.4
+    print(f"{'✅' if ok else '❌'} quiet stream: last line fsync'd {(synced[0] - written) * 1000:.0f} ms after it "
+          f"was written with no later write ({after_quiet} fsync before close)")
+    return ok
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        ok = verify_recover(tmp)
+        ok = verify_compact(tmp) and ok
+        ok = verify_restart_same_second(tmp) and ok
+        ok = verify_quiet_fsync(tmp) and ok
+    sys.exit(0 if ok else 1)
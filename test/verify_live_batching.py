@@ -0,0 +1,269 @@
+"""
+Verify pake_live batching under concurrency: with finals arriving on one
+thread while the batch timer flushes on another, every id a batch
+references was queued to the GUI before that batch, every segment lands in
+exactly one batch, an empty flush clears the scheduler's pending state, and
+the batch timer's due() check never races a concurrent flushed().
+Also checks that GUI writes racing a reconnect handshake always encode with
+the codec of the link they are written to, that async-mode results
+never wait for batch_lock on the event loop, and that interims reach the
+outbox as coalescible "interim" messages.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+os.environ.setdefault("DEEPGRAM_KEY", "test")
+
+import pake_live
+from batch_scheduler import BatchScheduler, BatchTimer
+from ipc_protocol import CODECS, IpcReader
+from live_async import result_handoff
+from live_session import Session
+
+SEGMENTS = 3000
+
+
+class Recorder:
+    """Stands in for the GUI outbox: records queued messages in order"""
+
+    def __init__(self):
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def put(self, payload, owner=None):
+        with self.lock:
+            self.messages.append(payload)
+
+
+def final(i):
+    return {"channel": {"alternatives": [{"transcript": f"inflation remains elevated {i}",
+                                          "words": [{"speaker": 0}]}]},
+            "is_final": True, "start": float(i), "duration": 0.9}
+
+
+def verify_concurrent_flush():
+    recorder = pake_live.gui_outbox = Recorder()
+    session = Session("main", "https://example.invalid/live")
+    session.is_running = True
+    done = threading.Event()
+
+    def timer():
+        while not done.is_set():
+            pake_live.send_batch(session, "timer")   # flush whatever is pending, as often as possible
+
+    flusher = threading.Thread(target=timer)
+    flusher.start()
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        for i in range(SEGMENTS):
+            pake_live.process_deepgram_message(session, final(i))
+    finally:
+        done.set()
+        flusher.join()
+        pake_live.send_batch(session, "flush")
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    sent, early, batched = set(), 0, []
+    for message in recorder.messages:
+        if message["type"] == "segment":
+            sent.add(message["id"])
+        else:
+            ids = message["data"]["current_batch"]["segment_ids"]
+            early += sum(1 for seg_id in ids if seg_id not in sent)
+            batched.extend(ids)
+    batches = len(recorder.messages) - SEGMENTS
+    ok = early == 0 and batched == list(range(SEGMENTS))
+    print(f"{'✅' if ok else '❌'} {SEGMENTS} finals vs a busy flush thread: {batches} batches, "
+          f"{early} ids referenced before their segment, every segment in exactly one batch: "
+          f"{batched == list(range(SEGMENTS))}")
+    return ok
+
+
+def verify_empty_flush_resets():
+    pake_live.gui_outbox = Recorder()
+    session = Session("main", "https://example.invalid/live")
+    # Pending state without a pending segment (what a lost race used to leave behind)
+    session.scheduler.add("x" * 4000)
+    pake_live.send_batch(session, "timer")
+    ok = session.scheduler.pending_segments == 0 and session.scheduler.due() is None
+    print(f"{'✅' if ok else '❌'} empty flush clears the scheduler (pending segments "
+          f"{session.scheduler.pending_segments}, due {session.scheduler.due()})")
+    return ok
+
+
+def verify_timer_vs_flushed():
+    recorder = pake_live.gui_outbox = Recorder()
+    session = Session("main", "https://example.invalid/live")
+    session.is_running = True
+
+    def yielding_clock():
+        time.sleep(0.0001)   # hand the GIL over inside due(), between its reads of the state
+        return time.monotonic()
+
+    # Every segment is due at once, so add_to_batch calls flushed() on every add
+    session.scheduler = BatchScheduler(clock=yielding_clock, max_latency=0, min_interval=0, max_tokens=10 ** 9)
+    timer = BatchTimer(lambda: [session], pake_live.flush_if_due)
+    done = threading.Event()
+
+    def ticks():
+        while not done.is_set():
+            timer.check()
+
+    ticker = threading.Thread(target=ticks)
+    ticker.start()
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        for i in range(1000):
+            pake_live.add_to_batch(session, {"speaker": "Speaker 0", "text": "x", "start": float(i), "end": i + 0.5})
+    finally:
+        done.set()
+        ticker.join()
+        sys.stdout.close()
+        sys.stdout = stdout
+    batched = [seg_id for message in recorder.messages if message["type"] == "batch"
+               for seg_id in message["data"]["current_batch"]["segment_ids"]]
+    ok = timer.errors == 0 and batched == list(range(1000))
+    print(f"{'✅' if ok else '❌'} batch timer vs flushed() on every add: {timer.errors} timer errors, "
+          f"every segment in exactly one batch: {batched == list(range(1000))}")
+    return ok
+
+
+class Link:
+    """Fake GUI socket that remembers the codec its handshake negotiated"""
+
+    def __init__(self, codec):
+        self.codec = codec
+        self.chunks = []
+
+    def sendall(self, data):
+        self.chunks.append(data)
+
+    def shutdown(self, how):
+        pass
+
+
+def decodes(link):
+    """True if everything written to the link parses with its codec (framed: ids only)"""
+    data = b"".join(link.chunks)
+    try:
+        if link.codec is None:
+            return all(json.loads(line)["type"] == "batch" for line in data.splitlines())
+        return all("segments" not in message["data"]["current_batch"]
+                   for message in IpcReader(link.codec).feed(data))
+    except Exception:
+        return False
+
+
+def verify_codec_swap():
+    batch = {"type": "batch", "data": {"current_batch": {"text": "x", "segments": [{"text": "x"}],
+                                                          "segment_ids": [0]}}}
+    links, done = [], threading.Event()
+
+    def handshakes():
+        while not done.is_set():
+            link = Link(CODECS["json"] if len(links) % 2 else None)
+            links.append(link)
+            with pake_live.socket_lock:
+                pake_live.gui_codec, pake_live.gui_socket = link.codec, link
+
+    swapper = threading.Thread(target=handshakes)
+    swapper.start()
+    try:
+        while not pake_live.gui_socket:
+            time.sleep(0.001)
+        for _ in range(20000):
+            pake_live._write_to_gui(batch)
+    finally:
+        done.set()
+        swapper.join()
+        pake_live.gui_codec = pake_live.gui_socket = None
+
+    corrupted = sum(1 for link in links if not decodes(link))
+    ok = corrupted == 0 and "segments" in batch["data"]["current_batch"]
+    print(f"{'✅' if ok else '❌'} 20000 writes across {len(links)} reconnect handshakes: every link "
+          f"decodes with its own codec ({corrupted} corrupted), "
+          f"framed batches carry ids only, the queued payload keeps its bodies")
+    return ok
+
+
+def verify_loop_never_blocks():
+    pake_live.gui_outbox = Recorder()
+    session = Session("main", "https://example.invalid/live")
+    session.is_running = True
+    held, release = threading.Event(), threading.Event()
+
+    def timer_flush():
+        with session.batch_lock:   # a slow flush on the batch timer thread
+            held.set()
+            release.wait()
+
+    async def results():
+        # What run_deepgram_pipeline_async's on_result does for every result
+        t0 = time.perf_counter()
+        for i in range(500):
+            result_handoff.put(pake_live.process_deepgram_message, session, final(i))
+            await asyncio.sleep(0)
+        return time.perf_counter() - t0
+
+    flusher = threading.Thread(target=timer_flush)
+    flusher.start()
+    held.wait()
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        loop_seconds = asyncio.run(results())
+        stored_while_held = len(session.segments)
+        release.set()
+        flusher.join()
+        drained = result_handoff.drain()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    in_order = [seg["start"] for seg in session.segments.to_list()] == [float(i) for i in range(500)]
+    ok = loop_seconds < 0.2 and stored_while_held == 0 and drained and in_order
+    print(f"{'✅' if ok else '❌'} 500 results while batch_lock is held elsewhere: loop busy "
+          f"{loop_seconds * 1000:.0f} ms, all {len(session.segments)} stored in order after the lock "
+          f"was released: {in_order}")
+    return ok
+
+
+def verify_interims():
+    from gui_outbox import GuiOutbox
+    sent = []
+    outbox = pake_live.gui_outbox = GuiOutbox(sent.append, spool_path=os.devnull)
+    outbox.connected()   # writer not started: everything stays queued
+    session = Session("main", "https://example.invalid/live")
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        for i in range(50):
+            interim = final(0)
+            interim["is_final"] = False
+            interim["channel"]["alternatives"][0]["transcript"] = f"inflation remains {i}"
+            pake_live.process_deepgram_message(session, interim)
+        pake_live.process_deepgram_message(session, final(0))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    queued = [entry[0] for entry in outbox._queue]
+    ok = ([p["type"] for p in queued] == ["interim", "segment"]
+          and queued[0]["data"]["text"] == "inflation remains 49" and outbox.coalesced == 49)
+    print(f"{'✅' if ok else '❌'} 50 interims + 1 final: queued {[p['type'] for p in queued]}, "
+          f"{outbox.coalesced} interims coalesced into the newest")
+    return ok
+
+
+if __name__ == "__main__":
+    ok = verify_concurrent_flush()
+    ok = verify_empty_flush_resets() and ok
+    ok = verify_timer_vs_flushed() and ok
+    ok = verify_codec_swap() and ok
+    ok = verify_loop_never_blocks() and ok
+    ok = verify_interims() and ok
+    sys.exit(0 if ok else 1)
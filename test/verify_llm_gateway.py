@@ -0,0 +1,101 @@
+"""
+Verify the LLM gateway against a local mock OpenRouter: connections are
+reused, transient 503/429 answers are retried, a 400 is not, the
+per-model concurrency limit holds while other models keep flowing, and
+streamed (SSE) answers yield JSON fields before the response is complete.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from llm_gateway import LlmError, LlmGateway
+from llm_stream import JsonFieldStream
+from mock_openrouter import MockOpenRouter
+
+
+def body(model="mock/analysis"):
+    return {"model": model, "messages": [{"role": "user", "content": "hi"}]}
+
+
+def verify_reuse():
+    server = MockOpenRouter().start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url)
+    for _ in range(20):
+        gateway.complete(body())
+    ok = server.requests == 20 and server.connections == 1
+    print(f"{'✅' if ok else '❌'} keep-alive: {server.requests} requests over {server.connections} connection(s)")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_retries():
+    server = MockOpenRouter(failures=[503, 429]).start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url, backoff_base=0.01)
+    result = gateway.complete(body(), label="Test")
+    ok = result["choices"][0]["message"]["content"] and gateway.stats()["retries"] == 2
+
+    server.failures = [400]
+    try:
+        gateway.complete(body(), label="Test")
+        fatal = False
+    except LlmError as e:
+        fatal = e.status == 400
+    ok = ok and fatal and gateway.stats()["retries"] == 2
+    print(f"{'✅' if ok else '❌'} retries: 503+429 recovered, 400 not retried, stats {gateway.stats()}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_concurrency():
+    server = MockOpenRouter(delay=0.05).start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url, concurrency=2)
+    futures = [gateway.submit(body("mock/analysis")) for _ in range(8)]
+    futures += [gateway.submit(body("mock/translate")) for _ in range(4)]
+    wait(futures)
+    errors = [f.exception() for f in futures if f.exception()]
+    ok = not errors and server.peak == {"mock/analysis": 2, "mock/translate": 2}
+    print(f"{'✅' if ok else '❌'} per-model limit 2: peak in-flight {server.peak}, errors {errors}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_streaming():
+    reply = json.dumps({"summary": "เงินเฟ้อยังสูง \"sticky\"", "sentiment": "HAWKISH", "gold": "ลง", "stock": "ลง"},
+                       ensure_ascii=False)
+    server = MockOpenRouter(delay=0.05, token_delay=0.02, reply="```json\n" + reply + "\n```",
+                            failures=[503]).start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url, backoff_base=0.01)
+    fields, seen = JsonFieldStream(), {}
+    t0 = time.perf_counter()
+
+    def on_delta(text):
+        for key in fields.feed(text):
+            seen[key] = time.perf_counter() - t0
+
+    result = gateway.complete(body(), label="Stream", on_delta=on_delta)
+    total = time.perf_counter() - t0
+    content = result["choices"][0]["message"]["content"]
+    ok = (content == server.reply and fields.fields == json.loads(reply) and result["cost"] == 0.0001
+          and seen["sentiment"] + 0.1 < seen["stock"] and gateway.stats()["retries"] == 1)
+    print(f"{'✅' if ok else '❌'} streaming (after one 503): sentiment at {seen['sentiment'] * 1000:.0f} ms, "
+          f"last field at {seen['stock'] * 1000:.0f} ms, returned at {total * 1000:.0f} ms, usage {result['usage']}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+if __name__ == "__main__":
+    ok = verify_reuse()
+    ok = verify_retries() and ok
+    ok = verify_concurrency() and ok
+    ok = verify_streaming() and ok
+    sys.exit(0 if ok else 1)
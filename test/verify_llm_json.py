@@ -0,0 +1,145 @@
+"""
+Verify the shared LLM JSON parser: malformed answers seen from chat models
+(fences, preambles, trailing commas, list wrapping, enum variants, and
+answers cut off by max_tokens) are repaired locally, unusable ones are
+rejected, and AnalysisWorker turns a truncated answer into a card with a
+single API call where the old fence-strip + json.loads path paid for
+retries.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from llm_json import LlmJsonError, parse_object
+from mock_openrouter import MockOpenRouter
+
+ANSWER = {
+    "speaker_identified": "ประธานเฟด",
+    "summary": "ประธานเฟดย้ำว่าเงินเฟ้อยังสูงเกินเป้า 2%",
+    "prediction": "ตลาดคาดว่าจะคงดอกเบี้ยสูงนานขึ้น",
+    "sentiment": "HAWKISH",
+    "signal_strength": "HIGH",
+    "consistency_note": "Fed: เน้น \"higher for longer\"",
+    "gold": "ลง - ดอลลาร์แข็ง",
+    "forex": "USD ขึ้น",
+    "stock": "ลง"
+}
+TEXT = json.dumps(ANSWER, ensure_ascii=False, indent=4)
+
+
+def legacy_parse(content):
+    """The parsing AnalysisWorker did before llm_json"""
+    content = content.strip()
+    if content.startswith("```"):
+        content = "\n".join(content.split("\n")[1:-1])
+    parsed = json.loads(content)
+    if isinstance(parsed, list):
+        parsed = parsed[0] if parsed and isinstance(parsed[0], dict) else {}
+    if not isinstance(parsed, dict):
+        raise ValueError("not a dict")
+    return parsed
+
+
+def verify_corpus():
+    from pake_gui import ANALYSIS_SCHEMA
+    cases = [
+        ("clean", TEXT, "HAWKISH"),
+        ("```json fence", "```json\n" + TEXT + "\n```", "HAWKISH"),
+        ("fence, no newline at end", "```json\n" + TEXT + "```", "HAWKISH"),
+        ("preamble + trailing chatter", "Here is the analysis:\n" + TEXT + "\nLet me know!", "HAWKISH"),
+        ("trailing commas", TEXT.replace('"ลง"\n}', '"ลง",\n}'), "HAWKISH"),
+        ("list-wrapped", "[" + TEXT + "]", "HAWKISH"),
+        ("enum with reason", TEXT.replace('"HAWKISH"', '"Hawkish (เงินเฟ้อสูง)"'), "HAWKISH"),
+        ("enum spelling", TEXT.replace('"HAWKISH"', '"risk off"'), "RISK-OFF"),
+        ("cut by max_tokens", TEXT[:TEXT.index('"gold"') + 14], "HAWKISH"),
+        ("cut inside escape", TEXT[:TEXT.index("higher") + 2], "HAWKISH"),
+    ]
+    rejected = [
+        ("prose only", "ขออภัย ไม่สามารถวิเคราะห์ได้"),
+        ("cut before sentiment", TEXT[:TEXT.index('"sentiment"')]),
+        ("unknown sentiment", TEXT.replace('"HAWKISH"', '"BULLISH"')),
+    ]
+    legacy_ok = new_ok = 0
+    failed = []
+    for name, text, sentiment in cases:
+        try:
+            legacy_parse(text)
+            legacy_ok += 1
+        except Exception:
+            pass
+        try:
+            parsed = parse_object(text, ANALYSIS_SCHEMA, label=name)
+            assert parsed["sentiment"] == sentiment and parsed["summary"] == ANSWER["summary"]
+            new_ok += 1
+        except Exception as e:
+            failed.append((name, e))
+    for name, text in rejected:
+        try:
+            parse_object(text, ANALYSIS_SCHEMA, label=name)
+            failed.append((name, "accepted"))
+        except LlmJsonError:
+            pass
+    ok = not failed
+    print(f"{'✅' if ok else '❌'} malformed answers: {new_ok}/{len(cases)} parsed (legacy parser {legacy_ok}/"
+          f"{len(cases)}), {len(rejected)} unusable ones rejected {failed or ''}")
+    return ok
+
+
+def verify_truncation_sweep():
+    from pake_gui import ANALYSIS_SCHEMA
+    usable = TEXT.index('"sentiment"') + len('"sentiment": "HAWKISH"')
+    parsed = wrong = 0
+    for cut in range(usable, len(TEXT)):
+        try:
+            got = parse_object(TEXT[:cut], ANALYSIS_SCHEMA, label="sweep")
+            parsed += 1
+            # Every field kept must be complete (never a half string)
+            wrong += any(ANSWER[key] != value for key, value in got.items() if key != "signal_strength")
+        except LlmJsonError:
+            pass
+    total = len(TEXT) - usable
+    ok = parsed == total and wrong == 0
+    print(f"{'✅' if ok else '❌'} max_tokens cutoff after 'sentiment': {parsed}/{total} cut points repaired, "
+          f"{wrong} with a partial field")
+    return ok
+
+
+def verify_worker_calls():
+    import pake_gui
+    from config_manager import config
+    config.config.update({"enable_response_cache": False, "enable_prefilter": False, "model_analysis_fallback": ""})
+    server = MockOpenRouter(reply=TEXT[:TEXT.index('"forex"')]).start()   # every answer is cut off
+    pake_gui.llm_gateway.url = server.base_url + "/chat/completions"
+    results = []
+    worker = pake_gui.AnalysisWorker("Inflation remains well above our 2 percent goal.", 1)
+    worker.finished.connect(results.append)
+    worker.run()
+    server.stop()
+    legacy_calls = 3   # legacy: json.loads fails on every attempt (max_retries=2)
+    ok = results and results[0].get("sentiment") == "HAWKISH" and server.requests == 1
+    print(f"{'✅' if ok else '❌'} AnalysisWorker with a truncated answer: card {results[0].get('sentiment') if results else None}"
+          f" after {server.requests} API call(s) (legacy: {legacy_calls} paid calls, then an error card)")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # throwaway data/ for config and cost logs
+    try:
+        ok = verify_corpus()
+        ok = verify_truncation_sweep() and ok
+        ok = verify_worker_calls() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,234 @@
+"""
+Verify the LLM router against a local mock OpenRouter with per-model
+delays: a primary slower than its p90 is hedged to the backup and the
+loser cancelled, a fast primary is never hedged, a failed or invalid
+answer falls through to the backup at once, failures count as errors
+but leave the p90 (and so the hedge delay) alone, an unhealthy route is tried
+last, only one route's stream reaches the UI, cancelling a race (STOP)
+cancels the primary and its hedged copy at once, and AnalysisWorker fills
+its card from the backup when the pinned primary fails.
+
+Timings are seeded into the router and the mock delays differ by 10x, so
+the outcome does not depend on machine speed.
+"""
+
+import concurrent.futures
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from llm_gateway import CancelToken, LlmError, LlmGateway
+from llm_router import LlmRouter, Route
+from mock_openrouter import MockOpenRouter
+
+PRIMARY, BACKUP = Route("mock/primary", "vertex"), Route("mock/backup")
+SLOW, FAST, P90 = 2.0, 0.05, 0.2
+
+
+def reply_by_model(body):
+    return json.dumps({"summary": body["model"]})
+
+
+def make_body(route):
+    return {"messages": [{"role": "user", "content": "hi"}]}
+
+
+def validate(result):
+    return json.loads(result["choices"][0]["message"]["content"])
+
+
+def setup(model_delay, failures=(), reply=reply_by_model, seed=True):
+    server = MockOpenRouter(model_delay=model_delay, failures=failures, reply=reply).start()
+    gateway = LlmGateway(api_key="test", base_url=server.base_url, max_retries=0)
+    router = LlmRouter(gateway, hedge_default=5.0, hedge_min=0.05)
+    if seed:
+        for _ in range(10):
+            router.record(PRIMARY, P90)
+    return server, gateway, router
+
+
+def timed(router, **kwargs):
+    t0 = time.perf_counter()
+    routed = router.complete([PRIMARY, BACKUP], make_body, validate=validate, **kwargs)
+    return routed, time.perf_counter() - t0
+
+
+def verify_hedge():
+    server, gateway, router = setup({PRIMARY.model: SLOW, BACKUP.model: FAST})
+    routed, elapsed = timed(router)
+    stats = router.stats()
+    pinned = [b.get("provider") for b in server.bodies]
+    ok = (routed.route == BACKUP and routed.parsed["summary"] == BACKUP.model and elapsed < SLOW / 2
+          and stats["hedges"] == 1 and stats["cancelled"] == 1 and pinned == [{"order": ["vertex"]}, None])
+    print(f"{'✅' if ok else '❌'} slow primary: hedged after p90 {P90 * 1000:.0f} ms, {routed.route.key} answered in "
+          f"{elapsed * 1000:.0f} ms (primary takes {SLOW * 1000:.0f} ms), loser cancelled: {stats['cancelled']}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_no_hedge():
+    server, gateway, router = setup({PRIMARY.model: FAST, BACKUP.model: FAST})
+    routed, elapsed = timed(router)
+    ok = routed.route == PRIMARY and server.requests == 1 and router.hedges == 0
+    print(f"{'✅' if ok else '❌'} fast primary: {routed.route.key} in {elapsed * 1000:.0f} ms, "
+          f"{server.requests} request(s), no hedge")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_fallback():
+    results = []
+    # HTTP 400 from the primary; no stats yet, so the hedge timer alone would wait 5 s
+    server, gateway, router = setup({}, failures=[400], seed=False)
+    routed, elapsed = timed(router)
+    results.append(("HTTP 400", routed.route == BACKUP and elapsed < 1.0 and router.fallbacks == 1, elapsed))
+    gateway.close()
+    server.stop()
+
+    def invalid_primary(body):
+        return "Sorry, I can't." if body["model"] == PRIMARY.model else reply_by_model(body)
+    server, gateway, router = setup({}, reply=invalid_primary, seed=False)
+    routed, elapsed = timed(router)
+    results.append(("invalid JSON", routed.route == BACKUP and elapsed < 1.0, elapsed))
+    gateway.close()
+    server.stop()
+
+    server, gateway, router = setup({}, failures=[400, 400])
+    try:
+        timed(router)
+        results.append(("both fail", False, 0))
+    except LlmError as e:
+        results.append(("both fail", e.status == 400, 0))
+    gateway.close()
+    server.stop()
+
+    ok = all(passed for _, passed, _ in results)
+    print(f"{'✅' if ok else '❌'} fallback: " + ", ".join(
+        f"{name} -> {'ok' if passed else 'FAILED'}" + (f" ({t * 1000:.0f} ms)" if t else "")
+        for name, passed, t in results))
+    return ok
+
+
+def verify_failure_latency():
+    # Four races in which the primary fails at once (much faster than its p90)
+    def invalid_primary(body):
+        return "Sorry, I can't." if body["model"] == PRIMARY.model else reply_by_model(body)
+    server, gateway, router = setup({}, reply=invalid_primary)
+    routed = [timed(router)[0].route for _ in range(4)]
+    gateway.close()
+    server.stop()
+    fast_failures = router.hedge_delay(PRIMARY)
+    for _ in range(2):
+        router.record(PRIMARY, 60.0, ok=False)   # and two that timed out (would be the p90 of 12 samples)
+    stats = router.stats()["routes"][PRIMARY.key]
+    ok = (routed == [BACKUP] * 4 and fast_failures == P90 and router.hedge_delay(PRIMARY) == P90
+          and stats["samples"] == 10 and stats["error_rate"] == round(6 / 16, 3))
+    print(f"{'✅' if ok else '❌'} failures vs p90: hedge delay {fast_failures * 1000:.0f} ms after 4 fast failures, "
+          f"{router.hedge_delay(PRIMARY) * 1000:.0f} ms after two 60 s timeouts (seeded p90 {P90 * 1000:.0f} ms), "
+          f"error rate {stats['error_rate']}")
+    return ok
+
+
+def verify_health_order():
+    router = LlmRouter(LlmGateway(api_key="test"))
+    for _ in range(6):
+        router.record(PRIMARY, 0.5, ok=False)
+    router.record(PRIMARY, 0.5)
+    order = router.order([PRIMARY, BACKUP])
+    ok = order == [BACKUP, PRIMARY]
+    print(f"{'✅' if ok else '❌'} unhealthy primary (error rate {router.stats()['routes'][PRIMARY.key]['error_rate']}) "
+          f"tried last: {[r.key for r in order]}")
+    return ok
+
+
+def verify_stream():
+    server, gateway, router = setup({PRIMARY.model: SLOW, BACKUP.model: FAST})
+    deltas = []
+    routed, elapsed = timed(router, on_delta=deltas.append)
+    ok = routed.route == BACKUP and "".join(deltas) == reply_by_model({"model": BACKUP.model})
+    print(f"{'✅' if ok else '❌'} streamed hedge: {len(deltas)} deltas, all from {routed.route.key}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_cancel():
+    server, gateway, router = setup({PRIMARY.model: SLOW, BACKUP.model: SLOW})
+    cancel = CancelToken()
+    threading.Timer(0.5, cancel.cancel).start()   # STOP after the hedge fired
+    t0 = time.perf_counter()
+    try:
+        router.complete([PRIMARY, BACKUP], make_body, validate=validate, cancel=cancel)
+        raised = False
+    except concurrent.futures.CancelledError:
+        raised = True
+    elapsed = time.perf_counter() - t0
+    late = CancelToken()
+    late.cancel()
+    try:
+        gateway.complete(make_body(BACKUP), cancel=late)
+        refused = False
+    except concurrent.futures.CancelledError:
+        refused = True
+    time.sleep(0.1)   # the loop finishes cancelling the race
+    s = router.stats()
+    ok = raised and elapsed < 1.0 and s["hedges"] == 1 and s["cancelled"] == 2 and refused
+    print(f"{'✅' if ok else '❌'} cancelled race: returned after {elapsed:.2f}s (routes take {SLOW}s), "
+          f"{s['cancelled']} routes cancelled incl. the hedge, request after cancel refused: {refused}")
+    gateway.close()
+    server.stop()
+    return ok
+
+
+def verify_worker():
+    import pake_gui
+    from config_manager import config
+    config.config.update({"model_analysis": PRIMARY.model, "model_analysis_fallback": BACKUP.model,
+                          "enable_response_cache": False, "enable_prefilter": False})
+    reply = json.dumps({"summary": "ok", "sentiment": "HAWKISH", "gold": "ลง", "forex": "ขึ้น", "stock": "ลง"})
+    server = MockOpenRouter(failures=[503], reply=reply).start()
+    pake_gui.llm_gateway.url = server.base_url + "/chat/completions"
+    pake_gui.llm_gateway.max_retries = 0
+    results = []
+    worker = pake_gui.AnalysisWorker("Inflation remains well above our 2 percent goal.", 1)
+    worker.finished.connect(results.append)
+    worker.run()
+    server.stop()
+    with open(os.path.join("data", "cost_log_detailed.csv"), newline="", encoding="utf-8") as f:
+        logged = [row["Model"] for row in csv.DictReader(f) if row["Type"] == "Analysis"]
+    pinned = server.bodies[0].get("provider") == {"order": [pake_gui.ANALYSIS_PROVIDER]}
+    ok = results and results[0].get("sentiment") == "HAWKISH" and logged == [BACKUP.model] and pinned
+    print(f"{'✅' if ok else '❌'} AnalysisWorker: primary 503 -> card from {logged}, primary pinned to provider: {pinned}")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # throwaway data/ for config and cost logs
+    try:
+        ok = verify_hedge()
+        ok = verify_no_hedge() and ok
+        ok = verify_fallback() and ok
+        ok = verify_failure_latency() and ok
+        ok = verify_health_order() and ok
+        ok = verify_stream() and ok
+        ok = verify_cancel() and ok
+        ok = verify_worker() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,203 @@
+"""
+Verify the keyed diff renderer of EconomicNewsWidget on a week view:
+filter toggles, snipe refreshes and re-fetches reuse the existing cards
+(only events whose fields changed are rebuilt), times are parsed once per
+fetch, and the list shows the same cards in the same order as the old
+rebuild-everything render_list. The clock is frozen at a few times of day
+so the pinned NEXT EVENT card is deterministic (and sometimes absent).
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from PySide6.QtWidgets import QApplication, QLabel
+
+app = QApplication([])
+
+import pake_gui
+
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "AUD", "NZD", "CAD", "CHF"]
+IMPACTS = ["High", "Medium", "Low", "Low", "Non-Econ"]
+CLOCKS = [(0, 1), (12, 0), (23, 59)]   # pinned event early, mid-list, none upcoming
+
+
+def freeze_clock(hour, minute):
+    """Point pake_gui's datetime module at a clock stopped at hour:minute today"""
+    frozen_at = datetime.datetime.combine(datetime.date.today(), datetime.time(hour, minute))
+
+    class Frozen(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.combine(frozen_at.date(), frozen_at.time(), tz)
+
+    clock = types.ModuleType("datetime")
+    clock.__dict__.update(datetime.__dict__)
+    clock.datetime = Frozen
+    pake_gui.datetime = clock
+
+
+def week_data():
+    """~400 events: 5 days with the same recurring titles, times spread over the clock"""
+    data = []
+    for day in range(5):
+        for i in range(80):
+            minutes = (i * 18) % (24 * 60)
+            data.append({
+                "time": "All Day" if i % 40 == 0 else f"{(minutes // 60) % 12 or 12}:{minutes % 60:02d}{'am' if minutes < 720 else 'pm'}",
+                "currency": CURRENCIES[i % len(CURRENCIES)],
+                "impact": IMPACTS[i % len(IMPACTS)],
+                "title": f"Indicator {i} m/m",
+                "actual": "",
+                "forecast": f"0.{i % 9}%",
+                "previous": "0.2%"
+            })
+    return data
+
+
+def legacy_render_list(self):
+    """render_list before the keyed diff: delete every card and rebuild"""
+    while self.list_layout.count() > 1:
+        item = self.list_layout.takeAt(0)
+        if item.widget():
+            item.widget().deleteLater()
+    filtered_items = []
+    for item in self.data:
+        impact = item.get("impact", "Unknown")
+        if impact == "High" and not self.chk_high.isChecked(): continue
+        if impact == "Medium" and not self.chk_med.isChecked(): continue
+        if impact == "Low" and not self.chk_low.isChecked(): continue
+        if (impact == "Non-Econ" or impact == "Unknown") and not self.chk_none.isChecked(): continue
+        filtered_items.append(item)
+    now = pake_gui.datetime.datetime.now()
+    candidates = [(dt, item) for item in filtered_items
+                  for dt in [self.parse_news_time(item.get("time"))] if dt and dt > now]
+    pinned_item = min(candidates, key=lambda x: x[0])[1] if candidates else None
+    idx = 0
+    if pinned_item:
+        self.list_layout.insertWidget(idx, self.create_pinned_card(pinned_item))
+        self.list_layout.insertWidget(idx + 1, QLabel("👇 UPCOMING / PAST"))
+        idx += 2
+    for item in filtered_items:
+        if item is pinned_item:   # only the pinned occurrence; a week repeats equal events
+            continue
+        self.list_layout.insertWidget(idx, self.create_news_card(item))
+        idx += 1
+
+
+def shown(widget):
+    """Label texts of the cards on screen, top to bottom"""
+    rows = []
+    for i in range(widget.list_layout.count()):
+        w = widget.list_layout.itemAt(i).widget()
+        if w is None or not w.isVisibleTo(widget.list_container):
+            continue
+        for card in ([w] if w is not widget.pinned_box else [c for c in w.findChildren(pake_gui.QFrame)
+                                                             if c.parent() is w]):
+            labels = tuple(label.text() for label in card.findChildren(QLabel))
+            if labels:
+                rows.append(labels)
+    return rows
+
+
+class Counting(pake_gui.EconomicNewsWidget):
+    def __init__(self, legacy=False):
+        self.created = 0
+        self.parsed = 0
+        super().__init__()
+        if legacy:
+            self.render_list = lambda *args: legacy_render_list(self)
+            for chk in (self.chk_high, self.chk_med, self.chk_low, self.chk_none):
+                chk.stateChanged.disconnect()
+                chk.stateChanged.connect(self.render_list)
+
+    def create_news_card(self, item):
+        self.created += 1
+        return super().create_news_card(item)
+
+    def parse_news_time(self, time_str):
+        self.parsed += 1
+        return super().parse_news_time(time_str)
+
+
+def scenario(widget):
+    """Fetch, two filter toggles, a snipe refresh with one new actual; ms per step"""
+    widget.resize(380, 800)
+    widget.show()
+    steps = []
+
+    def step(name, action):
+        t0 = time.perf_counter()
+        action()
+        app.processEvents()
+        steps.append((name, (time.perf_counter() - t0) * 1000, widget.created, widget.parsed))
+
+    data = week_data()
+    step("fetch", lambda: (setattr(widget, "data", data), widget.render_list()))
+    step("filter Low off", lambda: widget.chk_low.setChecked(False))
+    step("filter Low on", lambda: widget.chk_low.setChecked(True))
+    refreshed = [dict(item) for item in data]
+    refreshed[7]["actual"] = "0.4%"
+    step("snipe refresh", lambda: (setattr(widget, "data", refreshed), widget.render_list()))
+    return steps
+
+
+def verify(clock):
+    freeze_clock(*clock)
+    old = Counting(legacy=True)
+    old_steps = scenario(old)
+    new = Counting()
+    new_steps = scenario(new)
+    same = shown(new) == shown(old)
+    total = len(week_data())
+    for (name, old_ms, old_created, old_parsed), (_, new_ms, new_created, new_parsed) in zip(old_steps, new_steps):
+        print(f"   {name:15s} legacy {old_ms:7.1f} ms ({old_created:4d} cards built, {old_parsed:5d} parses) | "
+              f"keyed {new_ms:6.1f} ms ({new_created:4d} cards built, {new_parsed:4d} parses)")
+    _, new_ms_fetch, fetch_created, fetch_parsed = new_steps[0]
+    _, _, end_created, end_parsed = new_steps[-1]
+    rebuilt = end_created - fetch_created
+    toggles_ms = new_steps[1][1] + new_steps[2][1]
+    old_toggles_ms = old_steps[1][1] + old_steps[2][1]
+    pinned = new.pinned is not None
+    ok = same and fetch_parsed == total and end_parsed == 2 * total and rebuilt <= 2 and toggles_ms < old_toggles_ms / 3
+    print(f"{'✅' if ok else '❌'} week view ({total} events) at {clock[0]:02d}:{clock[1]:02d}, "
+          f"next event pinned {pinned}: same cards in same order as legacy: {same}, "
+          f"filter toggles {toggles_ms:.0f} ms vs {old_toggles_ms:.0f} ms, "
+          f"{rebuilt} card(s) rebuilt after refresh, {end_parsed} parses for 2 fetches")
+    return ok
+
+
+def verify_empty():
+    widget = Counting()
+    widget.data = week_data()
+    widget.render_list()
+    widget.data = []
+    widget.render_list()
+    app.processEvents()
+    ok = widget.no_data_lbl.isVisibleTo(widget) and not widget.cards and widget.pinned is None
+    print(f"{'✅' if ok else '❌'} empty fetch: 'No Data' shown, all cards removed")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # no data/news_cache.json
+    try:
+        ok = True
+        for clock in CLOCKS:
+            ok = verify(clock) and ok
+        ok = verify_empty() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,86 @@
+"""
+Verify analysis prompt caching: every AnalysisWorker request starts with the
+same system message (rules + answer format), marked with `cache_control` for
+models that need a breakpoint, while memory context and transcript go in the
+user message; cached prompt tokens from the usage payload reach the cost log
+(whose header is upgraded in place for older logs).
+"""
+
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from mock_openrouter import MockOpenRouter
+
+REPLY = json.dumps({"summary": "ok", "sentiment": "HAWKISH", "gold": "ลง", "forex": "ขึ้น", "stock": "ลง"})
+TEXTS = ["Inflation remains well above our 2 percent goal.",
+         "The labor market has come into better balance.",
+         "We are prepared to keep rates higher for longer."]
+
+
+def run_batches(model):
+    import pake_gui
+    from config_manager import config
+    config.config.update({"model_analysis": model, "enable_response_cache": False})
+    server = MockOpenRouter(reply=REPLY).start()
+    pake_gui.llm_gateway.url = server.base_url + "/chat/completions"
+    memory = {"summaries": [], "markets": [], "trend": {"hawkish": 0, "dovish": 0, "neutral": 0}}
+    for n, text in enumerate(TEXTS, 1):
+        worker = pake_gui.AnalysisWorker(text, n, previous_context=TEXTS[n - 2] if n > 1 else "", memory=memory)
+        worker.run()
+        memory["summaries"].append({"batch": n, "summary": f"summary {n}", "sentiment": "HAWKISH"})
+        memory["trend"]["hawkish"] += 1
+    server.stop()
+    return server.bodies
+
+
+def verify_prefix():
+    from pake_gui import DECISION_RULES
+    google = run_batches("google/gemini-3-flash-preview")
+    openai = run_batches("openai/gpt-4o-mini")
+    systems = [json.dumps(body["messages"][0], sort_keys=True) for body in google]
+    users = [body["messages"][1]["content"] for body in google]
+    marked = google[0]["messages"][0]["content"][0].get("cache_control") == {"type": "ephemeral"}
+    plain = all(isinstance(body["messages"][0]["content"], str) for body in openai)
+    prefix, suffix = len(google[0]["messages"][0]["content"][0]["text"]), sum(len(u) for u in users) / len(users)
+    ok = (len(set(systems)) == 1 and marked and plain and all(DECISION_RULES not in u for u in users)
+          and all(text in u for text, u in zip(TEXTS, users)))
+    print(f"{'✅' if ok else '❌'} stable prefix: {prefix} chars identical on {len(systems)} calls "
+          f"(variable suffix ~{suffix:.0f} chars), cache_control for google/: {marked}, plain for openai/: {plain}")
+    return ok
+
+
+def verify_cost_log():
+    with open(os.path.join("data", "cost_log_detailed.csv"), newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    cached = [int(row["CachedTokens"]) for row in rows if row["Type"] == "Analysis"]
+    upgraded = rows[0]["Type"] == "Translate" and rows[0]["CachedTokens"] is None
+    ok = upgraded and cached[0] == 0 and all(c > 200 for c in cached[1:3])
+    print(f"{'✅' if ok else '❌'} cost log: header upgraded (old rows kept: {upgraded}), CachedTokens per call {cached}")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # throwaway data/ for config and cost logs
+    try:
+        os.makedirs("data")
+        with open(os.path.join("data", "cost_log_detailed.csv"), "w", encoding="utf-8") as f:
+            f.write("Timestamp,Type,Model,PromptTokens,CompletionTokens,TotalTokens,Cost,BatchNum\n"
+                    "2026-02-04 00:26:22,Translate,google/gemini-2.5-flash-lite,282,291,573,0.000000,1\n")
+        ok = verify_prefix()
+        ok = verify_cost_log() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
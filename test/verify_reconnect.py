@@ -0,0 +1,124 @@
+"""
+Verify Deepgram reconnect + back-buffer replay against a local stand-in that
+drops the first connection mid-stream. Segments must stay monotonic and cover
+the whole stream with no gaps and no duplicates, in both thread and async mode.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import websockets # pip install websockets
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from audio_ingest import FRAME_BYTES
+from deepgram_transport import ReconnectingTransport
+from live_async import run_stream
+
+TOTAL_FRAMES = 80       # 8s of audio
+DROP_AFTER = 25         # first connection dies after 2.5s
+FRAMES_PER_RESULT = 10  # one 1s final per 10 frames
+
+
+def start_stand_in():
+    ready = threading.Event()
+    state = {"connections": 0}
+
+    async def handler(ws, *args):
+        state["connections"] += 1
+        first = state["connections"] == 1
+        frames = 0
+        async for message in ws:
+            if isinstance(message, str):
+                if "CloseStream" in message:
+                    break
+                continue
+            frames += 1
+            if first and frames == DROP_AFTER:
+                ws.transport.abort()  # Simulated network blip
+                return
+            if frames % FRAMES_PER_RESULT == 0:
+                start = (frames - FRAMES_PER_RESULT) * 0.1
+                await ws.send(json.dumps({
+                    "is_final": True, "start": start, "duration": 1.0,
+                    "channel": {"alternatives": [{
+                        "transcript": "alpha beta",
+                        "words": [
+                            {"word": "alpha", "start": start, "end": start + 0.5, "speaker": 0},
+                            {"word": "beta", "start": start + 0.5, "end": start + 1.0, "speaker": 0},
+                        ]
+                    }]}
+                }))
+        await ws.close()
+
+    async def serve():
+        server = await websockets.serve(handler, "127.0.0.1", 0, max_size=None)
+        state["port"] = list(server.sockets)[0].getsockname()[1]
+        ready.set()
+        await asyncio.Future()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait(10)
+    return f"ws://127.0.0.1:{state['port']}", state
+
+
+def check(name, results):
+    finals = [(r["start"], r["start"] + r["duration"]) for r in results if r.get("is_final")]
+    monotonic = all(b[0] >= a[1] - 1e-6 for a, b in zip(finals, finals[1:]))
+    covered = sum(e - s for s, e in finals)
+    expected = TOTAL_FRAMES * 0.1
+    ok = monotonic and abs(covered - expected) < 1e-6 and finals and abs(finals[-1][1] - expected) < 1e-6
+    print(f"{'✅' if ok else '❌'} [{name}] {len(finals)} finals, covered {covered:.1f}s / {expected:.1f}s, "
+          f"monotonic={monotonic}")
+    return ok
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = frames
+        self.frame_bytes = FRAME_BYTES
+
+    async def start(self):
+        return self
+
+    async def read(self):
+        # Cancellation-safe like StreamReader.readexactly: only consume after the wait
+        await asyncio.sleep(0.002)
+        if self.frames == 0:
+            return None
+        self.frames -= 1
+        return bytes(FRAME_BYTES)
+
+    async def stop(self):
+        pass
+
+
+def verify_thread_mode():
+    url, _ = start_stand_in()
+    results = []
+    transport = ReconnectingTransport(url, {}, results.append, max_backoff=0.5)
+    transport.connect()
+    for _ in range(TOTAL_FRAMES):
+        transport.send(bytes(FRAME_BYTES))
+        threading.Event().wait(0.002)
+    transport.finish()
+    threading.Event().wait(1.0)
+    transport.close()
+    return check("thread", results)
+
+
+def verify_async_mode():
+    url, _ = start_stand_in()
+    results = []
+    asyncio.run(run_stream(FrameSource(TOTAL_FRAMES), results.append, lambda: True, url, max_backoff=0.5))
+    return check("async", results)
+
+
+if __name__ == "__main__":
+    ok = verify_thread_mode()
+    ok = verify_async_mode() and ok
+    sys.exit(0 if ok else 1)
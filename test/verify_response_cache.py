@@ -0,0 +1,108 @@
+"""
+Verify the LLM response cache: exact hits survive case/punctuation noise and a
+reopen, near-duplicates hit only when the quoted numbers match, model and
+prompt version keep entries apart, TTL expires and LRU eviction holds the size.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from response_cache import ResponseCache
+
+BOILERPLATE = ("The Committee decided to maintain the target range for the federal funds rate at 5-1/4 to "
+               "5-1/2 percent. In considering the extent of any additional policy firming that may be "
+               "appropriate, the Committee will take into account the cumulative tightening of monetary policy, "
+               "the lags with which monetary policy affects economic activity and inflation, and economic and "
+               "financial developments. In addition, the Committee will continue reducing its holdings of "
+               "Treasury securities and agency debt and agency mortgage-backed securities, as described in its "
+               "previously announced plans. The Committee is strongly committed to returning inflation to its "
+               "2 percent objective.")
+ANSWER = {"choices": [{"message": {"content": '{"sentiment": "HAWKISH"}'}}], "usage": {"total_tokens": 900},
+          "cost": 0.0042}
+
+
+def verify_tiers(path):
+    cache = ResponseCache(path=path)
+    cache.put("Analysis", "m", "1", BOILERPLATE, ANSWER)
+
+    exact, tier = cache.get("Analysis", "m", "1", "  " + BOILERPLATE.upper().replace(",", " ") + "  ")
+    ok = exact == ANSWER and tier == "exact"
+    # ASR variation of a rebroadcast: one word different
+    variant = BOILERPLATE.replace("cumulative", "accumulated")
+    near_off = cache.get("Analysis", "m", "1", variant)
+    near, near_tier = cache.get("Analysis", "m", "1", variant, near=True)
+    ok = ok and near_off == (None, None) and near == ANSWER and near_tier == "near"
+    # Same wording, different numbers: never a near hit
+    numbers = cache.get("Analysis", "m", "1", BOILERPLATE.replace("5-1/2", "5-3/4"), near=True)
+    other_model = cache.get("Analysis", "other", "1", BOILERPLATE)
+    other_version = cache.get("Analysis", "m", "2", BOILERPLATE, near=True)
+    ok = ok and numbers == other_model == other_version == (None, None)
+    stats = cache.stats()
+    ok = ok and stats["exact_hits"] == 1 and stats["near_hits"] == 1 and abs(stats["saved"] - 0.0084) < 1e-9
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    ok = ok and reopened.get("Analysis", "m", "1", BOILERPLATE)[1] == "exact" and reopened.count == 1
+    reopened.close()
+    print(f"{'✅' if ok else '❌'} exact/near tiers, number guard, scoping, reopen: {stats}")
+    return ok
+
+
+def verify_ttl_and_lru(path):
+    now = [1000.0]
+    cache = ResponseCache(path=path, ttl=60, max_entries=50, clock=lambda: now[0])
+    cache.put("Translate", "m", "1", "old passage", ANSWER)
+    now[0] += 61
+    expired = cache.get("Translate", "m", "1", "old passage")
+    cache.ttl = 3600
+
+    for i in range(120):
+        now[0] += 1
+        cache.put("Translate", "m", "1", f"passage number {i}", ANSWER)
+        if i > 5:
+            cache.get("Translate", "m", "1", "passage number 5") # keep one old entry hot
+    rows = cache.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    bands = cache.db.execute("SELECT COUNT(*) FROM bands").fetchone()[0]
+    hot = cache.get("Translate", "m", "1", "passage number 5")[1]
+    cold = cache.get("Translate", "m", "1", "passage number 6")[1]
+    newest = cache.get("Translate", "m", "1", "passage number 119")[1]
+    ok = (expired == (None, None) and rows <= 50 and rows == cache.count and bands == rows * 16
+          and hot == newest == "exact" and cold is None)
+    print(f"{'✅' if ok else '❌'} TTL expiry + LRU eviction: {rows} entries kept of 121, hot entry kept: {hot}")
+    cache.close()
+    return ok
+
+
+def verify_lookup_cost(path):
+    cache = ResponseCache(path=path)
+    for i in range(2000):
+        cache.put("Analysis", "m", "1", f"{BOILERPLATE} Segment {i} with speaker {i % 7}", ANSWER)
+    t0 = time.perf_counter()
+    for i in range(200):
+        cache.get("Analysis", "m", "1", f"Brand new passage {i} about payrolls and wages", near=True)
+    miss_ms = (time.perf_counter() - t0) / 200 * 1000
+    t0 = time.perf_counter()
+    for i in range(200):
+        cache.get("Analysis", "m", "1", f"{BOILERPLATE} Segment {i} with speaker {i % 7}")
+    hit_ms = (time.perf_counter() - t0) / 200 * 1000
+    ok = miss_ms < 50 and hit_ms < 5
+    print(f"{'✅' if ok else '❌'} 2000 entries: near-tier miss {miss_ms:.2f} ms, exact hit {hit_ms:.3f} ms")
+    cache.close()
+    return ok
+
+
+if __name__ == "__main__":
+    tmpdir = tempfile.mkdtemp()
+    try:
+        ok = verify_tiers(os.path.join(tmpdir, "tiers.sqlite"))
+        ok = verify_ttl_and_lru(os.path.join(tmpdir, "lru.sqlite")) and ok
+        ok = verify_lookup_cost(os.path.join(tmpdir, "cost.sqlite")) and ok
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    sys.exit(0 if ok else 1)
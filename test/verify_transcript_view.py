@@ -0,0 +1,128 @@
+"""
+Verify the virtualized transcript view: append cost stays flat as the
+session grows (against the old QTextEdit.insertHtml path), the row cap
+bounds what is kept, the view follows the end only while the user is at
+the bottom, row heights follow the width, and selected rows copy as text.
+"""
+
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from PySide6.QtCore import QEvent, Qt
+from PySide6.QtGui import QKeyEvent, QTextCursor
+from PySide6.QtWidgets import QApplication, QTextEdit
+
+app = QApplication([])
+
+from gui.transcript_view import Row, TranscriptView
+
+TEXT = ("We remain strongly committed to bringing inflation back to our 2 percent goal, "
+        "and the labor market has come into better balance. ")
+ROWS = 2000
+
+
+def legacy_append(view, i):
+    """_add_segment before the model/view change"""
+    html = f'''<table style="width:100%; margin-bottom:8px; border-collapse:collapse;"><tr>
+<td style="width:100px; vertical-align:top; padding-right:8px;"><span style="font-size:10px; color:#6366f1;
+font-weight:bold;">Speaker {i % 2}</span><br/><span style="font-size:9px; color:#606070;">{i // 60}:{i % 60:02d}</span></td>
+<td style="vertical-align:top; border-left:2px solid #6366f1; padding-left:10px;">
+<span style="font-size:13px; color:#e0e0e0;">{TEXT}{i}</span></td></tr></table>'''
+    cursor = view.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    cursor.insertHtml(html)
+    view.ensureCursorVisible()
+
+
+def new_append(view, i):
+    view.add_segment(f"Speaker {i % 2}", f"{TEXT}{i}", f"{i // 60}:{i % 60:02d}", "#6366f1")
+
+
+def append_costs(view, append):
+    view.resize(500, 700)
+    view.show()
+    times = []
+    for i in range(ROWS):
+        t0 = time.perf_counter()
+        append(view, i)
+        app.processEvents()   # layout + paint, as in the running GUI
+        times.append(time.perf_counter() - t0)
+    return sum(times[:200]) / 200 * 1000, sum(times[-200:]) / 200 * 1000
+
+
+def verify_append_cost():
+    old_first, old_last = append_costs(QTextEdit(), legacy_append)
+    view = TranscriptView(max_rows=0)
+    new_first, new_last = append_costs(view, new_append)
+    ok = new_last < new_first * 2 and new_last < old_last and len(view.model.rows) == ROWS
+    print(f"{'✅' if ok else '❌'} ms per append, rows 1-200 -> {ROWS - 199}-{ROWS}: "
+          f"QTextEdit {old_first:.1f} -> {old_last:.1f}, TranscriptView {new_first:.1f} -> {new_last:.1f}")
+    return ok
+
+
+def verify_cap():
+    view = TranscriptView(max_rows=500)
+    view.resize(500, 700)
+    for i in range(3000):
+        new_append(view, i)
+    rows = view.model.rows
+    consistent = len(view.offsets) == len(rows) + 1 and view.offsets[0] == 0
+    ok = len(rows) <= 500 and rows[-1].text.endswith("2999") and consistent
+    print(f"{'✅' if ok else '❌'} cap 500: kept {len(rows)} rows of 3000 (dropped {view.model.dropped}), "
+          f"positions consistent: {consistent}")
+    return ok
+
+
+def verify_follow():
+    view = TranscriptView(max_rows=0)
+    view.resize(500, 400)
+    view.show()
+    for i in range(100):
+        new_append(view, i)
+    bar = view.verticalScrollBar()
+    followed = bar.value() == bar.maximum() > 0
+    bar.setValue(bar.maximum() // 2)
+    held = bar.value()
+    for i in range(100, 120):
+        new_append(view, i)
+    kept = bar.value() == held and bar.maximum() > held
+    ok = followed and kept
+    print(f"{'✅' if ok else '❌'} follow: at bottom -> scrolled to new rows ({followed}), "
+          f"scrolled up -> position kept ({kept})")
+    return ok
+
+
+def verify_layout_and_copy():
+    view = TranscriptView(max_rows=0)
+    view.resize(600, 400)
+    view.show()
+    view.append_rows([Row("header", "BATCH #1 • 10:00:00"),
+                      Row("segment", TEXT * 3, "Speaker 0", "0:01", "#6366f1"),
+                      Row("marker", "--- SYSTEM PAUSED ---", color="#ef4444"),
+                      Row("html", "<div><b>Topic:</b> Fed holds</div>")])
+    app.processEvents()
+    wide = view.offsets[-1]
+    view.resize(300, 400)
+    app.processEvents()
+    narrow = view.offsets[-1]
+    view.anchor, view.current = 0, 3
+    view.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_C, Qt.ControlModifier))
+    copied = QApplication.clipboard().text().splitlines()
+    ok = narrow > wide and copied[0] == "BATCH #1 • 10:00:00" and copied[1].startswith("[0:01] Speaker 0: We remain") \
+        and copied[-1] == "Topic: Fed holds"
+    print(f"{'✅' if ok else '❌'} wrap: content {wide}px at 600 wide -> {narrow}px at 300, copy: {copied[0]!r} ... "
+          f"{copied[-1]!r}")
+    return ok
+
+
+if __name__ == "__main__":
+    ok = verify_append_cost()
+    ok = verify_cap() and ok
+    ok = verify_follow() and ok
+    ok = verify_layout_and_copy() and ok
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,124 @@
+"""
+Verify the translation memory: numbered replies are mapped back onto their
+segments even when the model drops, merges or renumbers lines, memorized
+segments are never sent again, and a repetitive Q&A replay sends far fewer
+segments (and prompt characters) to the model.
+"""
+
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["TM_PATH"] = os.path.join(TMPDIR, "tm.sqlite")
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+from mock_openrouter import MockOpenRouter
+from translation_memory import TranslationMemory, parse_numbered
+
+LINE = re.compile(r"^(\d+)\. \[([^\]]*)\]: (.*)$")
+
+
+def verify_parsing():
+    cases = [
+        ("1. [Speaker 0]: ก\n2. [Speaker 1]: ข\n3. [Speaker 0]: ค", 3, ["ก", "ข", "ค"]),
+        ("1. [Speaker 0]: ก\n3. [Speaker 0]: ค", 3, ["ก", None, "ค"]),                  # dropped
+        ("1. [Speaker 0]: ก\n2-3. [Speaker 1]: ขค", 3, ["ก", "ขค", None]),               # merged
+        ("[Speaker 0]: ก\n[Speaker 1]: ข", 2, ["ก", "ข"]),                              # unnumbered
+        ("3. [Speaker 0]: ก\n4. [Speaker 1]: ข", 2, ["ก", "ข"]),                        # renumbered
+        ("```\n1) ก\n2) [Speaker 1] ข\n```", 2, ["ก", "ข"]),                            # fenced, ")" style
+        ("ไม่ใช่รูปแบบที่ขอ", 2, [None, None]),
+    ]
+    failed = [(reply, got) for reply, count, want in cases if (got := parse_numbered(reply, count)) != want]
+    print(f"{'✅' if not failed else '❌'} reply alignment: {len(cases) - len(failed)}/{len(cases)} cases {failed or ''}")
+    return not failed
+
+
+def verify_memory():
+    path = os.path.join(TMPDIR, "unit.sqlite")
+    tm = TranslationMemory(path=path, max_entries=100)
+    tm.store("m", "1", [("Thank you, Mr. Chair.", "ขอบคุณครับท่านประธาน"), ("", "x")])
+    found = tm.lookup("m", "1", ["thank you mr chair", "Next question.", "Thank you, Mr. Chair."])
+    other = tm.lookup("other", "1", ["Thank you, Mr. Chair."])
+    tm.store("m", "1", [(f"sentence {i}", f"ประโยค {i}") for i in range(150)])
+    count = tm.db.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+    tm.close()
+    reopened = TranslationMemory(path=path)
+    kept = reopened.lookup("m", "1", ["sentence 149"])
+    reopened.close()
+    ok = (found == ["ขอบคุณครับท่านประธาน", None, "ขอบคุณครับท่านประธาน"] and other == [None]
+          and count <= 100 and kept == ["ประโยค 149"])
+    print(f"{'✅' if ok else '❌'} memory: normalized hits {found}, {count} entries after LRU, persisted {kept}")
+    return ok
+
+
+def fake_translator(sent):
+    def reply(body):
+        lines = [LINE.match(line) for line in body["messages"][0]["content"].split("\n")]
+        lines = [m for m in lines if m and m.group(3) != "คำแปล"]   # not the format example
+        sent.append(sum(len(m.group(3)) for m in lines))
+        sent.append(len(lines))
+        return "\n".join(f"{m.group(1)}. [{m.group(2)}]: TH({m.group(3)})" for m in lines)
+    return reply
+
+
+def qa_session(rng, batches=40):
+    stock = ["Thank you.", "Next question, please.", "Thanks, Chair Powell.", "Good afternoon.",
+             "We remain strongly committed to bringing inflation back to our 2 percent goal.",
+             "We are prepared to adjust the stance of monetary policy as appropriate.",
+             "I'm not going to comment on that.", "We will make decisions meeting by meeting."]
+    for b in range(batches):
+        segments = []
+        for i in range(6):
+            text = rng.choice(stock) if rng.random() < 0.6 else f"Unique remark {b}-{i} about payrolls and wages."
+            segments.append({"speaker": f"Speaker {i % 2}", "text": text})
+        yield b + 1, segments
+
+
+def run_session(enable_memory):
+    import pake_gui
+    from config_manager import config
+    sent = []
+    server = MockOpenRouter(reply=fake_translator(sent)).start()
+    pake_gui.llm_gateway.url = server.base_url + "/chat/completions"
+    config.config["enable_response_cache"] = enable_memory
+    results, wrong = [], 0
+    for batch_num, segments in qa_session(random.Random(7)):
+        worker = pake_gui.TranslateWorker(segments, batch_num)
+        worker.finished.connect(lambda n, segs: results.append(segs))
+        worker.run()
+        got = results[-1]
+        wrong += sum(seg["text"] != f"TH({src['text']})" or seg["speaker"] != src["speaker"]
+                     for seg, src in zip(got, segments)) + abs(len(got) - len(segments))
+    server.stop()
+    return sum(sent[1::2]), sum(sent[0::2]), server.requests, wrong
+
+
+def verify_replay():
+    base_segments, base_chars, base_calls, base_wrong = run_session(False)
+    tm_segments, tm_chars, tm_calls, tm_wrong = run_session(True)
+    ok = base_wrong == tm_wrong == 0 and tm_segments < base_segments * 0.6
+    print(f"{'✅' if ok else '❌'} Q&A replay (40 batches x 6 segments): sent {base_segments} -> {tm_segments} "
+          f"segments, {base_chars} -> {tm_chars} source chars, {base_calls} -> {tm_calls} API calls, "
+          f"misaligned {tm_wrong}")
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # cost/cache CSV logs go to a throwaway data/
+    try:
+        ok = verify_parsing()
+        ok = verify_memory() and ok
+        ok = verify_replay() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,130 @@
+"""
+Verify the GUI update coalescer: a burst of segment messages reaches the
+transcript in a few batched inserts (against one insert per message),
+main-thread time per flush is measured, streamed fields for one card are
+collapsed to the latest, and a final analysis card is never overwritten by
+a streamed partial that was still waiting for its flush.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+TMPDIR = tempfile.mkdtemp()
+os.environ["OPENROUTER_KEY"] = "test"
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+os.environ["PAKE_IPC_ADDRESS"] = "localhost:18791"
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication([])
+
+from gui.transcript_view import Row, TranscriptView
+from gui.update_coalescer import UpdateCoalescer
+
+TEXT = "Rates will stay restrictive until we are confident inflation is moving sustainably down. "
+BURST = 600   # rapid-fire Q&A: a final every ~2 ms
+
+
+def run_burst(append):
+    """Feed the burst the way the IPC reader does (events interleaved), return main-thread seconds"""
+    view = TranscriptView(max_rows=0)
+    view.resize(500, 700)
+    view.show()
+    app.processEvents()
+    busy = 0.0
+    for i in range(BURST):
+        t0 = time.perf_counter()
+        append(view, Row("segment", f"{TEXT}{i}", f"Speaker {i % 2}", f"0:{i % 60:02d}", "#6366f1"))
+        app.processEvents()
+        busy += time.perf_counter() - t0
+        time.sleep(0.002)
+    deadline = time.time() + 1
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        app.processEvents()
+        busy += time.perf_counter() - t0
+        time.sleep(0.005)
+    return view, busy
+
+
+def verify_burst():
+    direct, direct_busy = run_burst(lambda view, row: view.append_rows([row]))
+    inserts = []
+    coalescer = UpdateCoalescer(interval_ms=50)
+    state = {}
+
+    def append(view, row):
+        if "view" not in state:
+            state["view"] = view
+            coalescer.add_channel("transcript", lambda rows: (inserts.append(len(rows)), view.append_rows(rows)))
+        coalescer.post("transcript", row)
+
+    batched, batched_busy = run_burst(append)
+    m = coalescer.metrics()
+    in_order = [row.text for row in batched.model.rows] == [row.text for row in direct.model.rows]
+    ok = len(batched.model.rows) == BURST and in_order and len(inserts) < BURST / 5 and batched_busy < direct_busy
+    print(f"{'✅' if ok else '❌'} burst of {BURST} segments: {len(inserts)} inserts (direct: {BURST}), "
+          f"main thread {batched_busy * 1000:.0f} ms vs {direct_busy * 1000:.0f} ms direct, in order: {in_order}")
+    print(f"   ms per flush p50 {m['flush_ms_p50']} / p95 {m['flush_ms_p95']} / max {m['flush_ms_max']}, "
+          f"largest insert {max(inserts)} rows")
+    return ok
+
+
+def verify_keyed():
+    seen = []
+    coalescer = UpdateCoalescer(interval_ms=30)
+    coalescer.add_channel("partial", lambda pending: seen.append(dict(pending)), keyed=True)
+    coalescer.flush()
+    for n in range(20):   # streamed fields for batches 1 and 2
+        coalescer.post("partial", {"n": n}, key=1 + n % 2)
+    coalescer.flush()
+    coalescer.post("partial", {"n": 99}, key=1)
+    coalescer.discard("partial", 1)   # final card for batch 1 arrived
+    deadline = time.time() + 0.2
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    m = coalescer.metrics()
+    ok = seen == [{1: {"n": 18}, 2: {"n": 19}}] and m["coalesced"] == 18
+    print(f"{'✅' if ok else '❌'} keyed: 20 streamed updates -> {len(seen)} redraw of the latest per card "
+          f"({m['coalesced']} coalesced), discarded partial never shown: {len(seen) == 1}")
+    return ok
+
+
+def verify_final_card():
+    import pake_gui
+    window = pake_gui.PakeAnalyzerWindow()
+    fields = {"batch_num": 7, "summary": "ประธานเฟดย้ำ", "sentiment": "HAWKISH"}
+    window._update_analysis_partial(fields)   # still pending when the final arrives
+    window._update_analysis({**fields, "signal_strength": "HIGH", "prediction": "คงดอกเบี้ย",
+                             "gold": "ลง", "forex": "USD ขึ้น", "stock": "ลง"})
+    window._update_analysis_partial({"batch_num": 8, "summary": "…"})
+    deadline = time.time() + 0.3
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    feed = window.ai_feed.toPlainText()
+    ok = "คงดอกเบี้ย" in feed and feed.count("BATCH #7") == 1 and "BATCH #8" in feed
+    print(f"{'✅' if ok else '❌'} final card #7 kept after its pending partial was due, later card #8 streamed: "
+          f"{'BATCH #8' in feed}")
+    window.close()
+    return ok
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    os.chdir(TMPDIR)   # throwaway data/ for config and cost logs
+    try:
+        ok = verify_burst()
+        ok = verify_keyed() and ok
+        ok = verify_final_card() and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(TMPDIR, ignore_errors=True)
+    sys.exit(0 if ok else 1)
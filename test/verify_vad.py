@@ -0,0 +1,169 @@
+"""
+Verify the VAD gate: long silences are dropped (KeepAlive instead of zeros)
+and Deepgram timestamps still land on the real stream timeline.
+
+Synthetic stream: 2s speech-like bursts separated by 4s of near-silence. The
+local stand-in reports one final per burst at its position in the RECEIVED
+audio; after alignment each final must start where the burst really started.
+The gap map is also hammered from a sender and a receive thread at once.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import numpy as np # pip install numpy
+import websockets # pip install websockets
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from audio_ingest import FRAME_BYTES, SAMPLE_RATE
+from live_async import run_stream
+from vad import AudioStats, VadGate
+
+BURSTS = [(1.0, 3.0), (7.0, 9.0), (13.0, 15.0), (19.0, 21.0)]   # seconds of "speech"
+TOTAL_SECONDS = 24.0
+FRAME_SECONDS = 0.1
+TOLERANCE = FRAME_SECONDS + 1e-6
+
+
+def synth_frames():
+    rng = np.random.default_rng(7)
+    t = np.arange(int(TOTAL_SECONDS * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = rng.normal(0, 20, len(t))                                   # ~ -64 dBFS floor
+    for start, end in BURSTS:
+        m = (t >= start) & (t < end)
+        audio[m] += 6000 * np.sin(2 * np.pi * 180 * t[m]) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[m]))
+    pcm = np.clip(audio, -32768, 32767).astype("<i2").tobytes()
+    return [pcm[i:i + FRAME_BYTES] for i in range(0, len(pcm), FRAME_BYTES)]
+
+
+def start_stand_in():
+    """Emits a final at the received-timeline start of every loud run of frames."""
+    ready = threading.Event()
+    state = {"keepalives": 0}
+
+    async def handler(ws, *args):
+        pos, run_start = 0.0, None
+        async for message in ws:
+            if isinstance(message, str):
+                if "KeepAlive" in message:
+                    state["keepalives"] += 1
+                if "CloseStream" in message:
+                    break
+                continue
+            loud = np.abs(np.frombuffer(message, dtype="<i2")).max() > 1000
+            if loud and run_start is None:
+                run_start = pos
+            elif not loud and run_start is not None:
+                await ws.send(json.dumps({
+                    "is_final": True, "start": run_start, "duration": pos - run_start,
+                    "channel": {"alternatives": [{
+                        "transcript": "speech",
+                        "words": [{"word": "speech", "start": run_start, "end": pos, "speaker": 0}]
+                    }]}
+                }))
+                run_start = None
+            pos += len(message) / (SAMPLE_RATE * 2)
+        await ws.close()
+
+    async def serve():
+        server = await websockets.serve(handler, "127.0.0.1", 0, max_size=None)
+        state["port"] = list(server.sockets)[0].getsockname()[1]
+        ready.set()
+        await asyncio.Future()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait(10)
+    return f"ws://127.0.0.1:{state['port']}", state
+
+
+class FrameSource:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.frame_bytes = FRAME_BYTES
+
+    async def start(self):
+        return self
+
+    async def read(self):
+        await asyncio.sleep(0.001)
+        if not self.frames:
+            return None
+        return self.frames.pop(0)
+
+    async def stop(self):
+        pass
+
+
+def verify(keepalive_interval=0.01):
+    import live_async
+    live_async.KEEPALIVE_INTERVAL = keepalive_interval   # Synthetic audio runs faster than real time
+
+    url, state = start_stand_in()
+    results, stats = [], AudioStats()
+    gate = VadGate(enabled=True, min_silence=0.5)
+    asyncio.run(run_stream(FrameSource(synth_frames()), results.append, lambda: True, url,
+                           gate=gate, stats=stats))
+
+    finals = [r for r in results if r.get("is_final")]
+    starts = [round(r["start"], 2) for r in finals]
+    aligned = len(finals) == len(BURSTS) and all(
+        abs(r["start"] - b[0]) <= TOLERANCE and abs(r["start"] + r["duration"] - b[1]) <= TOLERANCE
+        for r, b in zip(finals, BURSTS)
+    )
+    audio = stats.as_dict()
+    saved = audio["saved_pct"] > 30
+    print(f"{'✅' if aligned else '❌'} finals at {starts} (expected {[b[0] for b in BURSTS]})")
+    print(f"{'✅' if saved else '❌'} read {audio['seconds_read']}s, sent {audio['seconds_sent']}s "
+          f"({audio['saved_pct']}% saved), {state['keepalives']} KeepAlive messages")
+    return aligned and saved
+
+
+def verify_gap_map_threads(gaps=200000):
+    """Sender thread records gaps while the receive thread maps times back"""
+    gate = VadGate(enabled=True)
+    errors, done = [], threading.Event()
+
+    def sender():
+        for _ in range(gaps):
+            gate._sent_pos += 1.0
+            gate._record_gap(0.5)
+        done.set()
+
+    def receiver():
+        last = 0.0
+        while not done.is_set():
+            try:
+                t = gate.to_stream_time(1e12)
+            except Exception as e:
+                errors.append(e)
+                return
+            if t < last:
+                errors.append(ValueError(f"gap map went backwards ({t} < {last})"))
+                return
+            last = t
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # switch threads as often as possible
+    try:
+        threads = [threading.Thread(target=sender), threading.Thread(target=receiver)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch)
+    ok = not errors and gate.to_stream_time(1e12) == 1e12 + gaps * 0.5
+    print(f"{'✅' if ok else '❌'} {gaps} gaps recorded while the receive thread read the map: "
+          f"{repr(errors[0]) if errors else 'no errors'}")
+    return ok
+
+
+if __name__ == "__main__":
+    ok = verify()
+    ok = verify_gap_map_threads() and ok
+    sys.exit(0 if ok else 1)